@@ -1,8 +1,14 @@
 from math import pi, sqrt, cos, sin
 from cmath import polar
+from collections import namedtuple, OrderedDict
+from .clipping import Clipper
+from .transform import AffineTransform
+from .sweepline import SweepLine
 from .tools import timer
 from . import colors
 
+import numpy as np
+
 import itertools
 import random
 import math
@@ -13,9 +19,109 @@ average = mean = lambda x: sum(x) / len(x)
 digits = 2  # Number of digits of precision of the objects when displayed
 
 
+class StyleList(tuple):
+    """List of drawing attributes stored as a tuple so that the styles are
+    hashable, and given back as a list by the properties of the styles. It is
+    never equal to a tuple, so a style made with a list is not shared with a
+    style made with a tuple."""
+
+    __slots__ = ()
+
+    def __eq__(self, other):
+        return type(other) is StyleList and tuple.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((StyleList, tuple(self)))
+
+
+class Style:
+    """Immutable drawing attributes shared by all the objects that are drawn
+    the same way. Styles are interned so that a million white points all point
+    to the same style instead of storing their own attributes. Only the
+    styles used the most recently are kept for sharing, so that the styles
+    of attributes that are not used anymore do not stay in memory."""
+
+    __slots__ = ()
+    styles = OrderedDict()
+    limit = 4096
+
+    @staticmethod
+    def hashable(value):
+        """Return a hashable version of a drawing attribute."""
+        if isinstance(value, list):
+            return StyleList(map(Style.hashable, value))
+        return value
+
+    @staticmethod
+    def unhashable(value):
+        """Return the drawing attribute given to the style."""
+        if isinstance(value, StyleList):
+            return list(map(Style.unhashable, value))
+        return value
+
+    @classmethod
+    def get(cls, *attributes):
+        """Return the shared style with the given attributes."""
+        style = cls(*map(Style.hashable, attributes))
+        key = (cls, style)
+        shared = Style.styles.get(key)
+        if shared is None:
+            shared = Style.styles[key] = style
+            if len(Style.styles) > Style.limit:
+                Style.styles.popitem(last=False)
+        else:
+            Style.styles.move_to_end(key)
+        return shared
+
+    def replace(self, **attributes):
+        """Return the shared style with some attributes replaced."""
+        return self.get(*self._replace(**attributes))
+
+    def __reduce__(self):
+        """Intern the style again when unpickling."""
+        return (type(self).get, tuple(self))
+
+    def __copy__(self):
+        """Styles are immutable, so they are never copied."""
+        return self
+
+    def __deepcopy__(self, memo):
+        """Styles are immutable, so they are never copied."""
+        return self
+
+
+class PointStyle(Style, namedtuple("PointStyle", ["mode", "size", "width", "radius", "fill", "color", "conversion"])):
+    __slots__ = ()
+
+
+class VectorStyle(Style, namedtuple("VectorStyle", ["color", "width", "arrow"])):
+    __slots__ = ()
+
+
+class SegmentStyle(Style, namedtuple("SegmentStyle", ["width", "color", "conversion"])):
+    __slots__ = ()
+
+
+def styleProperty(name):
+    """Return the property of a drawing attribute stored in the shared style.
+    The default style of the class is used until the object has its own, for
+    the subclasses that set attributes before calling the constructor."""
+    def get(self):
+        return Style.unhashable(getattr(getattr(self, "style", self.default_style), name))
+    def set(self, value):
+        self.style = getattr(self, "style", self.default_style).replace(**{name: value})
+    return property(get, set, doc="Shared " + name + " of the style.")
+
+
 class Point:
     """Representation of a point that can be displayed on screen."""
 
+    __slots__ = ("components", "style", "iterator")
+    default_style = PointStyle.get(0, [0.1, 0.1], 1, 0.02, False, colors.WHITE, True)
+
     @classmethod
     def sum(cls, points, **kwargs):
         """Return the points which components are the respectives sums of the
@@ -90,13 +196,15 @@ class Point:
             if type(components[0]) == list:
                 components = components[0]
         self.components = list(components)
-        self.mode = mode
-        self.size = size
-        self.width = width
-        self.radius = radius
-        self.fill = fill
-        self.color = color
-        self.conversion = conversion
+        self.style = PointStyle.get(mode, size, width, radius, fill, color, conversion)
+
+    mode = styleProperty("mode")
+    size = styleProperty("size")
+    width = styleProperty("width")
+    radius = styleProperty("radius")
+    fill = styleProperty("fill")
+    color = styleProperty("color")
+    conversion = styleProperty("conversion")
 
     def __hash__(self):
         """Return a single number using the hash of its attributes."""
@@ -325,12 +433,49 @@ class Point:
                          "Representation of the dimension point which is the length of the components.")
 
 
+class BoundingBox:
+    """Axis-aligned bounding boxes (xmin, ymin, xmax, ymax) of the shapes, used
+    to reject the pairs of shapes that cannot cross before the exact tests.
+    The numbers of pre-tests and of exact tests skipped are counted."""
+
+    tested = 0
+    skipped = 0
+
+    @staticmethod
+    def createFromPositions(positions):
+        """Return the bounding box of the positions."""
+        xs = [p[0] for p in positions]
+        ys = [p[1] for p in positions]
+        return (min(xs), min(ys), max(xs), max(ys))
+
+    @staticmethod
+    def overlap(b1, b2):
+        """Determine if the bounding boxes overlap, which is needed for the
+        shapes to cross."""
+        BoundingBox.tested += 1
+        if b1[2] < b2[0] or b2[2] < b1[0] or b1[3] < b2[1] or b2[3] < b1[1]:
+            BoundingBox.skipped += 1
+            return False
+        return True
+
+    @staticmethod
+    def reset():
+        """Return the numbers of pre-tests and skipped exact tests since the
+        last reset, and set them to 0."""
+        statistics = (BoundingBox.tested, BoundingBox.skipped)
+        BoundingBox.tested = BoundingBox.skipped = 0
+        return statistics
+
+
 class Direction:
     """Base class of lines and segments."""
-    pass
+    __slots__ = ()
 
 
 class Vector:
+    __slots__ = ("components", "style", "iterator")
+    default_style = VectorStyle.get(colors.WHITE, 1, [0.1, 0.5])
+
     @classmethod
     def null(cls, d=2):
         """Return the null vector."""
@@ -438,9 +583,11 @@ class Vector:
             if isinstance(components[0], list):
                 components = components[0]
         self.components = list(components)
-        self.color = color
-        self.width = width
-        self.arrow = arrow
+        self.style = VectorStyle.get(color, width, arrow)
+
+    color = styleProperty("color")
+    width = styleProperty("width")
+    arrow = styleProperty("arrow")
 
     def set(self, v):
         """Set a vector to the values of another without changing its color, with or arrow."""
@@ -588,7 +735,7 @@ class Vector:
 
     def __mul__(self, factor):
         """Multiply a vector by a given factor."""
-        if type(factor) == int or type(factor) == float:
+        if isinstance(factor, (int, float)):
             return Vector([c * factor for c in self.components])
         else:
             raise NotImplementedError
@@ -698,6 +845,9 @@ class Vector:
 
 
 class Segment(Direction):
+    __slots__ = ("points", "style", "iterator")
+    default_style = SegmentStyle.get(1, colors.WHITE, True)
+
     @classmethod
     def null(cls):
         """Return the segment whoose points are both the origin."""
@@ -724,9 +874,11 @@ class Segment(Direction):
         if len(points) == 1: points = points[0]
         if len(points) != 2: raise Exception("A segment must have 2 points.")
         self.points = list(points)
-        self.width = width
-        self.color = color
-        self.conversion = conversion
+        self.style = SegmentStyle.get(width, color, conversion)
+
+    width = styleProperty("width")
+    color = styleProperty("color")
+    conversion = styleProperty("conversion")
 
     def __str__(self):
         """Return the string representation of a segment."""
@@ -913,6 +1065,11 @@ class Segment(Direction):
         """Return the minimum and maximum of x and y components of the 2 end points."""
         return self.minimum.components + self.maximum.components
 
+    def getBBox(self):
+        """Return the bounding box (xmin, ymin, xmax, ymax) of the segment."""
+        (x1, y1), (x2, y2) = self.p1.components[:2], self.p2.components[:2]
+        return (min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+
     def parallel(self, other):
         """Determine if the line is parallel to another object (line or segment)."""
         return other.angle == self.angle
@@ -927,6 +1084,8 @@ class Segment(Direction):
 
     def crossSegment(self, other, e=1e-14):
         """Return the intersection point of the segment with another segment."""
+        if not BoundingBox.overlap(self.getBBox(), other.getBBox()):
+            return None
         sl = self.getLine()
         ol = other.getLine()
         point = sl.crossLine(ol)
@@ -970,6 +1129,7 @@ class Segment(Direction):
     ymin = property(getYmin, doc="ymin")
     xmax = property(getXmax, doc="xmax")
     ymax = property(getYmax, doc="ymax")
+    bbox = property(getBBox, doc="Bounding box of the segment.")
     minimum = property(getMinimum, doc="Point at the right")
     maximum = property(getMaximum, doc="Point at the left")
 
@@ -1314,6 +1474,16 @@ class HalfLine(Line):
         """Set the point of the half line."""
         self.point = point
 
+    def getBBox(self):
+        """Return the bounding box of the half line, which is infinite in the
+        directions it goes to."""
+        x, y = self.point[0], self.point[1]
+        dx, dy = math.cos(self.angle), math.sin(self.angle)
+        inf = float("inf")
+        return (-inf if dx < 0 else x, -inf if dy < 0 else y, inf if dx > 0 else x, inf if dy > 0 else y)
+
+    bbox = property(getBBox, doc="Bounding box of the half line.")
+
     def show(self, context, width=None, color=None):
         """Show the line on the surface."""
         if not color:
@@ -1365,6 +1535,8 @@ class HalfLine(Line):
 
     def crossSegment(self, other):
         """Return the point of intersection of the half line with a segment."""
+        if not BoundingBox.overlap(self.getBBox(), other.getBBox()):
+            return None
         ml = self.getLine(correct=False)
         ol = other.getLine(correct=False)
         point = ml.crossLine(ol)
@@ -1378,6 +1550,10 @@ class HalfLine(Line):
 
 
 class Form:
+    # Number of queries of the derived geometry answered by the cache or computed.
+    cache_hits = 0
+    cache_misses = 0
+
     @classmethod
     def random(cls, n=random.randint(5, 10), d=2, borns=[-1, 1], **kwargs):
         """Create a random form using the number of points 'n', the dimension
@@ -1390,11 +1566,14 @@ class Form:
     def anyCrossing(forms):
         """Determine if any of the forms are crossing."""
         if len(forms) == 1: forms = forms[0]
-        l = len(forms)
-        for i in range(l):
-            for j in range(i + 1, l):
-                if forms[i].crossForm(forms[j]):
-                    return True
+        edges, owners = [], []
+        for (i, form) in enumerate(forms):
+            form_edges = form.edges
+            edges.extend(form_edges)
+            owners.extend([i] * len(form_edges))
+        for point, indices in SweepLine(edges).intersections():
+            if len(set(owners[i] for i in indices)) > 1:
+                return True
         return False
 
     def allCrossing(forms):
@@ -1417,56 +1596,83 @@ class Form:
                 return True
         return
 
+    clipper = Clipper()
+
+    @classmethod
+    def createFromRegion(cls, region, **kwargs):
+        """Create the forms of the loops of a region of the clipper.
+        The holes are the forms turning clockwise."""
+        return [cls.createFromTuples(loop, **kwargs) for loop in region]
+
+    def getLoop(self):
+        """Return the positions of the points turning counter clockwise."""
+        return self.cached("loop", lambda: Clipper.orient(self.vertices.tolist()))
+
+    loop = property(getLoop, doc="Positions of the points turning counter clockwise.")
+
+    @classmethod
+    def createFromLargestLoop(cls, region, **kwargs):
+        """Create the form of the largest loop of a region of the clipper, or
+        return None if the region is empty."""
+        if not region:
+            return None
+        return cls.createFromTuples(max(region, key=Clipper.area), **kwargs)
+
     @classmethod
     def intersectionTwoForms(cls, form1, form2):
-        """Return the form which is the intersection of two forms."""
-        if form1 == None: return form2
-        if form2 == None: return form1
-        if form1 == form2 == None: return None
-        points = form1.crossForm(form2)
-        if not points: return None
-        for point in form1.points:
-            if point in form2:
-                points.append(point)
-        for point in form2.points:
-            if point in form1:
-                points.append(point)
-        form = cls(points)
-        form.makeSparse()
-        return form
+        """Return the form which is the intersection of two forms, or None if
+        they do not overlap. If the intersection has several pieces, only the
+        largest one is returned, all of them are given by
+        'intersectionsTwoForms'."""
+        if form1 is None:
+            return form2
+        if form2 is None:
+            return form1
+        return cls.createFromLargestLoop(Form.clipper.intersection([form1.loop], [form2.loop]))
+
+    @classmethod
+    def intersectionsTwoForms(cls, form1, form2):
+        """Return the list of forms which is the intersection of two forms."""
+        return cls.createFromRegion(Form.clipper.intersection([form1.loop], [form2.loop]))
 
     @classmethod
     def intersection(cls, forms):
-        """Return the form which is the intersection of all the forms."""
-        result = forms[0]
-        for form in forms[1:]:
-            result = cls.intersectionTwoForms(result, form)
-        return result
+        """Return the form which is the intersection of all the forms, or None
+        if they do not all overlap. If the intersection has several pieces,
+        only the largest one is returned, all of them are given by
+        'intersections'."""
+        return cls.createFromLargestLoop(Form.clipper.intersectionAll([[form.loop] for form in forms]))
+
+    @classmethod
+    def intersections(cls, forms):
+        """Return the list of forms which is the intersection of all the forms."""
+        return cls.createFromRegion(Form.clipper.intersectionAll([[form.loop] for form in forms]))
 
     @classmethod
     def unionTwoForms(cls, form1, form2):
         """Return the union of two forms."""
-        intersection_points = set(form1.crossForm(form2))
-        if intersection_points:
-            all_points = set(form1.points + form2.points)
-            points = all_points.intersection(intersection_points)
-            return [cls(points)]
-        else:
-            return [form1, form2]
+        return cls.createFromRegion(Form.clipper.union([form1.loop], [form2.loop]))
 
     @classmethod
-    def union(cls, forms):
-        """Return the union of all forms."""
-        """This function must be recursive."""
-        if len(forms) == 2:
-            return cls.unionTwoForms(forms[0], forms[1])
-        else:
-            pass
+    def unionAll(cls, forms):
+        """Return the list of forms which is the union of all the forms. The
+        forms are merged two by two hierarchically, which only needs log(n)
+        levels of merges, and the merges of disjoint groups are immediate."""
+        return cls.createFromRegion(Form.clipper.unionAll([[form.loop] for form in forms]))
 
-        result = forms[0]
-        for form in forms[1:]:
-            result.extend(cls.union(form, result))
-        return result
+    union = unionAll
+
+    @classmethod
+    def difference(cls, form, forms):
+        """Return the list of forms which is the form without the other forms."""
+        others = Form.clipper.unionAll([[f.loop] for f in forms])
+        return cls.createFromRegion(Form.clipper.difference([form.loop], others))
+
+    @classmethod
+    def xor(cls, forms):
+        """Return the list of forms which covers the parts of the plane that are
+        in an odd number of forms."""
+        return cls.createFromRegion(Form.clipper.reduce([[form.loop] for form in forms], "xor"))
 
     @classmethod
     def createFromTuples(cls, tps, conversion=True, radius=0.01, **kwargs):
@@ -1495,6 +1701,7 @@ class Form:
                  side_show=True,
                  area_show=False):
         """Create the form object using points."""
+        self._version = 0
         self.points = points
 
         self.point_mode = point_mode
@@ -1522,6 +1729,17 @@ class Form:
         """Return the string representation of the form."""
         return "f(" + ",".join([str(p) for p in self.points]) + ")"
 
+    def getPoints(self):
+        """Return the points of the form."""
+        return self._points
+
+    def setPoints(self, points):
+        """Set the points of the form."""
+        self._points = points
+        self.touch()
+
+    points = property(getPoints, setPoints, doc="Points of the form.")
+
     def setFill(self, fill):
         """Set the form to fill its area when shown."""
         self.area_show = fill
@@ -1535,11 +1753,13 @@ class Form:
     def __iadd__(self, point):
         """Add a point to the form."""
         self.points.append(point)
+        self.touch()
         return self
 
     def __isub__(self, point):
         """Remove a point to the form."""
         self.points.remove(point)
+        self.touch()
         return self
 
     def __mul__(self, n):
@@ -1574,15 +1794,21 @@ class Form:
         return sorted(self.points) == sorted(other.points)
 
     def getCenter(self):
-        return Point.average(self.points)
+        """Return the average point of the form."""
+        return Point(*self.cached("center", lambda: Point.average(self.points).components))
 
     def setCenter(self, center):
         """Set the center of the form."""
-        p = center - self.center
-        for i in range(len(self.points)):
-            self.points[i] += p
+        c = self.center
+        self.transform(AffineTransform.createFromTranslation((center[0] - c[0], center[1] - c[1])))
 
     def getCentroid(self):
+        """Return the point of the center."""
+        centroid = self.cached("centroid", self.computeCentroid)
+        if centroid is not None:
+            return Point(*centroid.components)
+
+    def computeCentroid(self):
         """Return the point of the center.
         This only works for 2 dimensional forms obviously."""
         if len(self.points) == 0:
@@ -1615,6 +1841,7 @@ class Form:
         p = center - self.centroid
         for i in range(len(self.points)):
             self.points[i] += p
+        self.touch()
 
     def recenter(self, point=(0, 0)):
         """Recenter a form using the new center point."""
@@ -1622,18 +1849,18 @@ class Form:
 
     def enlarge(self, n=2):
         """Enlarge the form by a factor of n."""
-        c = self.center
-        for i in range(len(self.points)):
-            v = Vector.createFromTwoPoints(c, self.points[i])
-            self.points[i].set((n * v)(c))
+        self.transform(AffineTransform.createFromScale(n, self.center))
 
     def spread(self, n=2):
         """Take away the form by a factor of n."""
-        for point in self.points:
-            point *= n
+        self.transform(AffineTransform.createFromScale(n))
 
     def getSegments(self):
         """"Return the list of the form sides."""
+        return self.cached(("segments", repr(self.side_color), self.side_width), self.computeSegments)
+
+    def computeSegments(self):
+        """"Return a new list of the form sides."""
         l = len(self.points)
         return [Segment(self.points[i % l], self.points[(i + 1) % l], \
                         color=self.side_color, width=self.side_width) for i in range(l)]
@@ -1642,9 +1869,14 @@ class Form:
         """Set the segments of the form by setting its points to new values."""
         for point, segment in zip(self.points, segments):
             point.set(segment.p1)
+        self.touch()
 
     def getVectors(self):
         """Return the list of the form vectors."""
+        return self.cached(("vectors", repr(self.side_color), self.side_width), self.computeVectors)
+
+    def computeVectors(self):
+        """Return a new list of the form vectors."""
         l = len(self.points)
         return [Vector.createFromTwoPoints(self.points[i % l], self.points[(i + 1) % l], \
                         color=self.side_color, width=self.side_width) for i in range(l)]
@@ -1654,6 +1886,7 @@ class Form:
         l = len(self.points)
         for point, vector in zip(self.points, vectors):
             point.set(vector.components)
+        self.touch()
 
     def showAll(self, surface, **kwargs):
         """Show the form using a window."""
@@ -1682,6 +1915,8 @@ class Form:
 
     def show(self, surface):
         """Show the form using the surface and optional objects to show."""
+        if hasattr(surface, "isVisible") and self.points and not surface.isVisible(self.bbox):
+            return
         if self.area_show:
             self.showArea(surface)
         if self.side_show:
@@ -1827,14 +2062,13 @@ class Form:
     __or__ = cross
 
     def crossForm(self, other):
-        """Return the bool: (2 sides are crossing)."""
-        points = []
-        for s1 in self.sides:
-            for s2 in other.sides:
-                point = s1.crossSegment(s2)
-                if point:
-                    points.append(point)
-        return points
+        """Return the points of intersection of the sides of both forms, using
+        a sweep line over the sides of both forms at once."""
+        if not BoundingBox.overlap(self.bbox, other.bbox):
+            return []
+        edges = self.edges
+        n = len(edges)
+        return [Point(*p) for (i, j, p) in SweepLine(edges + other.edges).pairs() if i < n <= j]
 
     def crossDirection(self, other):
         """Return the list of the points of intersection between the form and a segment or a line."""
@@ -1847,6 +2081,8 @@ class Form:
 
     def crossHalfLine(self, other):
         """Return the list of points of intersection in order between the form and a half line."""
+        if not BoundingBox.overlap(self.bbox, other.bbox):
+            return []
         points = []
         for segment in self.segments:
             cross = other.crossSegment(segment)
@@ -1868,6 +2104,8 @@ class Form:
 
     def crossSegment(self, other):
         """Return the list of the points of intersection between the form and a segment."""
+        if not BoundingBox.overlap(self.bbox, other.bbox):
+            return []
         points = []
         for side in self.sides:
             point = side.crossSegment(other)
@@ -1876,32 +2114,102 @@ class Form:
         return points
 
     def crossSelf(self, e=1e-10):
-        """Return the list of the points of intersections between the form and itself."""
+        """Return the list of the points of intersections between the form and itself.
+        The vertices shared by consecutive sides are not intersections."""
+        edges = self.edges
+        l = len(edges)
         results = []
-        l = len(self.segments)
-        for i in range(l):
-            for j in range(i + 1, l):
-                point = self.segments[i].crossSegment(self.segments[j])
-                if point:
-                    if point in self.points:
-                        results.append(point)
+        for (i, j, p) in SweepLine(edges, e).pairs():
+            if j == i + 1 and p == edges[j][:2] or i == 0 and j == l - 1 and p == edges[0][:2]:
+                continue
+            results.append(Point(*p))
         return results
 
+    @staticmethod
+    def convexHull(positions):
+        """Return the positions of the convex hull of the positions in counter
+        clockwise order, using the monotone chain algorithm in O(n log(n))."""
+        positions = sorted(set((p[0], p[1]) for p in positions))
+        if len(positions) < 3:
+            return positions
+
+        def chain(positions):
+            hull = []
+            for p in positions:
+                while len(hull) >= 2:
+                    (ax, ay), (bx, by) = hull[-2], hull[-1]
+                    if (bx - ax) * (p[1] - ay) - (by - ay) * (p[0] - ax) > 0:
+                        break
+                    hull.pop()
+                hull.append(p)
+            return hull[:-1]
+
+        return chain(positions) + chain(reversed(positions))
+
+    def getConvexHull(self, **kwargs):
+        """Return the convex hull of the form."""
+        hull = self.cached("convex_hull", lambda: Form.convexHull(self.vertices.tolist()))
+        return Form([Point(*p) for p in hull], **kwargs)
+
+    convex_hull = property(getConvexHull, doc="Convex hull of the form.")
+
+    def computeConvex(self):
+        """Determine if the form is convex, which means that all its turns are
+        in the same direction and that it only turns around once."""
+        v = [(p[0], p[1]) for p in self.points]
+        l = len(v)
+        if l < 4:
+            return True
+        sign = 0
+        turn = 0
+        for i in range(l):
+            (ax, ay), (bx, by), (cx, cy) = v[i - 2], v[i - 1], v[i]
+            u1, u2 = (bx - ax, by - ay), (cx - bx, cy - by)
+            cross = u1[0] * u2[1] - u1[1] * u2[0]
+            if cross:
+                if sign * cross < 0:
+                    return False
+                sign = cross
+            turn += math.atan2(cross, u1[0] * u2[0] + u1[1] * u2[1])
+        return abs(abs(turn) - 2 * math.pi) < 1e-6
+
     def convex(self):
-        """Return the bool (the form is convex)."""
-        x, y = self.center
-        angles = []
-        l = len(self.points)
-        for i in range(l - 1):
-            A = self.points[(i + l - 1) % l]
-            B = self.points[i % l]
-            C = self.points[(i + 1) % l]
-            u = Vector.createFromTwoPoints(A, B)
-            v = Vector.createFromTwoPoints(C, B)
-            angle = v ^ u
-            if angle > pi:
-                return True
-        return False
+        """Return the bool (the form is convex).
+        The result is cached until the points of the form change."""
+        return self.cached("convex", self.computeConvex)
+
+    @staticmethod
+    def separation(vertices1, vertices2):
+        """Return the minimum translation vector that separates the first convex
+        polygon from the second using the separating axis theorem, or None if
+        they are already separated. The polygons are (n, 2) arrays."""
+        axes = []
+        for v in (vertices1, vertices2):
+            edges = np.roll(v, -1, axis=0) - v
+            axes.append(np.column_stack((-edges[:, 1], edges[:, 0])))
+        axes = np.concatenate(axes)
+        norms = np.hypot(axes[:, 0], axes[:, 1])
+        axes = axes[norms > 0] / norms[norms > 0, None]
+        p1 = vertices1 @ axes.T
+        p2 = vertices2 @ axes.T
+        # Distances to move the first polygon forward or backward along each axis.
+        forward = p2.max(axis=0) - p1.min(axis=0)
+        backward = p1.max(axis=0) - p2.min(axis=0)
+        if len(axes) == 0 or (forward <= 0).any() or (backward <= 0).any():
+            return None
+        overlaps = np.minimum(forward, backward)
+        k = overlaps.argmin()
+        if forward[k] <= backward[k]:
+            return axes[k] * forward[k]
+        return -axes[k] * backward[k]
+
+    def getMinimumTranslationVector(self, other):
+        """Return the smallest vector by which the form must be moved so that it
+        does not overlap the other, or None if they do not overlap.
+        Both forms must be convex."""
+        mtv = Form.separation(self.vertices, other.vertices)
+        if mtv is not None:
+            return Vector(*mtv)
 
     def getSparse(self):  # as opposed to makeSparse which keeps the same form and return nothing
         """Return the form with the most sparse points."""
@@ -1917,36 +2225,145 @@ class Form:
         l = sorted(l, key=lambda x: x[0])
         for i in range(len(l)):
             self.points[i].set(l[i][1])
+        self.touch()
+
+    @staticmethod
+    def toArray(points):
+        """Return the (n, 2) array of the x and y components of the points,
+        which can be given as a list of points or tuples, a point array or an
+        array-like."""
+        if hasattr(points, "buffer"):
+            return points.buffer[:, :2]
+        if isinstance(points, np.ndarray):
+            return points.reshape(-1, 2).astype(float, copy=False)
+        return np.array([(p[0], p[1]) for p in points], dtype=float).reshape(-1, 2)
+
+    @staticmethod
+    def crossings(vertices, positions):
+        """Return the boolean mask (the position is inside the polygon) of the
+        (n, 2) array of positions, using the parity of the number of sides
+        crossed by the horizontal half lines going from the positions to the
+        right. It only loops over the sides, so nothing is allocated per side
+        except the temporary arrays of the vectorized operations."""
+        if len(vertices) < 3:
+            return np.zeros(len(positions), dtype=bool)
+        return Clipper.evenOdd(np.hstack((vertices, np.roll(vertices, -1, axis=0))), positions)
+
+    def touch(self):
+        """Change the version of the form so that its derived geometry is
+        computed again. The methods of the form that modify its points call
+        it, and so must the code that modifies the points of the form in
+        place from outside."""
+        self._version = getattr(self, "_version", 0) + 1
+
+    def getVersion(self):
+        """Return the version of the points of the form."""
+        return getattr(self, "_version", 0)
+
+    version = property(getVersion, doc="Version of the points of the form.")
+
+    def cached(self, name, compute):
+        """Return the derived geometry 'name', which is computed with 'compute'
+        and kept until the version of the form changes. The lists are returned
+        as copies so that the cache can not be modified."""
+        version = self.version
+        cache = self.__dict__.get("_cache")
+        if cache is None or cache[None] != version:
+            cache = self.__dict__["_cache"] = {None: version}
+        if name in cache:
+            Form.cache_hits += 1
+            value = cache[name]
+        else:
+            Form.cache_misses += 1
+            value = cache[name] = compute()
+        if isinstance(value, list):
+            return list(value)
+        return value
+
+    @classmethod
+    def getCacheStatistics(cls):
+        """Return the numbers of hits and misses of the caches of the forms."""
+        return {"hits": Form.cache_hits, "misses": Form.cache_misses}
+
+    @classmethod
+    def resetCacheStatistics(cls):
+        """Set the numbers of hits and misses of the caches to 0."""
+        Form.cache_hits = Form.cache_misses = 0
+
+    def getVertices(self):
+        """Return the read-only (n, 2) array of the components of the points."""
+        return self.cached("vertices", self.computeVertices)
+
+    def computeVertices(self):
+        """Return a new (n, 2) read-only array of the components of the points."""
+        vertices = np.array([(p[0], p[1]) for p in self.points], dtype=float).reshape(-1, 2)
+        vertices.flags.writeable = False
+        return vertices
+
+    def getBBox(self):
+        """Return the bounding box (xmin, ymin, xmax, ymax) of the form."""
+        return self.cached("bbox", lambda: BoundingBox.createFromPositions(self.vertices.tolist()))
+
+    bbox = property(getBBox, doc="Bounding box of the form.")
+
+    def getEdges(self):
+        """Return the sides of the form as 4-tuples (x1, y1, x2, y2)."""
+        return self.cached("edges", self.computeEdges)
+
+    def computeEdges(self):
+        """Return a new list of the sides of the form as 4-tuples."""
+        v = [(p[0], p[1]) for p in self.points]
+        l = len(v)
+        return [v[i] + v[(i + 1) % l] for i in range(l)]
+
+    vertices = property(getVertices, doc="Array of the components of the points.")
+    edges = property(getEdges, doc="Sides of the form as 4-tuples.")
+
+    def containsMany(self, points):
+        """Return the boolean mask (the point is in the form) of the points."""
+        return Form.crossings(self.vertices, Form.toArray(points))
 
     def __contains__(self, point):
         """Return the boolean: (the point is in the form)."""
-        h = HalfLine(point, 0)
-        ps = self.crossHalfLine(h)
-        return len(ps) % 2 == 1
+        return bool(Form.crossings(self.vertices, np.array([(point[0], point[1])], dtype=float))[0])
+
+    def transform(self, transform):
+        """Apply an affine transformation to all the points of the form at
+        once. The points are modified in place, so the points and segments
+        of the form held elsewhere follow it, except for the forms which
+        compute their points, like the rectangles, whose points are set."""
+        points = self.points
+        if not len(points):
+            return
+        positions = transform([(p[0], p[1]) for p in points]).tolist()
+        if type(self).points is not Form.points:
+            self.points = [Point(x, y) for (x, y) in positions]
+            return
+        for (point, (x, y)) in zip(points, positions):
+            point[0] = x
+            point[1] = y
+        self.touch()
 
     def rotate(self, angle, point=None):
         """Rotate the form by rotating its points from the center of rotation.
         Use center of the shape as default center of rotation."""
-        # Actually not working
         if not point:
             point = self.center
-        for i in range(len(self.points)):
-            self.points[i].rotate(angle, point)
+        self.transform(AffineTransform.createFromRotation(angle, point))
 
     def move(self, step):
         """Move the object by moving all its points using step."""
-        for point in self.points:
-            l = min(len(step), len(point.position))
-            for i in range(l):
-                point.position[i] = step[i]
+        self.transform(AffineTransform.createFromTranslation(step))
 
     def addPoint(self, point):
         """Add a point to the form."""
         self.points.append(point)
+        self.touch()
 
     def addPoints(self, points):
         """Add points to the form."""
         self.points.extend(points)
+        self.touch()
 
     append = addPoint
     extend = addPoints
@@ -1954,6 +2371,7 @@ class Form:
     def removePoint(self, point):
         """Remove a point to the form."""
         self.points.remove(point)
+        self.touch()
 
     __remove__ = removePoint
 
@@ -1964,14 +2382,19 @@ class Form:
     def __setitem__(self, index, value):
         """Change the points of a form."""
         self.points[index] = value
+        self.touch()
 
     @property
     def perimeter(self):
         """Return the perimeter of the form."""
-        return sum([s.length for s in self.segments])
+        return self.cached("perimeter", lambda: sum([s.length for s in self.segments]))
 
     @property  # This can only be a getter
     def area(self):
+        """Return the area of the form using its own points."""
+        return self.cached("area", self.computeArea)
+
+    def computeArea(self):
         """Return the area of the form using its own points.
         General case in 2d only for now..."""
         l = len(self.points)
@@ -1993,6 +2416,11 @@ class Form:
 
     @property
     def angles(self):
+        """Return the angles of the turns of the form."""
+        return self.cached("angles", self.computeAngles)
+
+    def computeAngles(self):
+        """Return the angles of the turns of the form."""
         ags = []
         vectors = self.vectors
         ag = (- vectors[-1]).angle
@@ -2004,6 +2432,11 @@ class Form:
 
     @property
     def abs_angles(self):
+        """Return the absolute angles of the turns of the form."""
+        return self.cached("abs_angles", self.computeAbsAngles)
+
+    def computeAbsAngles(self):
+        """Return the absolute angles of the turns of the form."""
         ags = []
         vectors = self.vectors
         ag = (- vectors[-1]).angle
@@ -2023,72 +2456,68 @@ class Form:
         s = max(segments, key=lambda s: s.length)
         return Circle(*s.middle, radius=s.length/2)
 
+    @staticmethod
+    def enclosingCircle(positions, e=1e-12):
+        """Return the center and radius (x, y, r) of the minimum enclosing circle
+        of the positions, using the randomized incremental algorithm of Welzl,
+        which runs in expected O(n)."""
+        positions = list(positions)
+        random.shuffle(positions)
+
+        def contains(c, p):
+            return math.hypot(p[0] - c[0], p[1] - c[1]) <= c[2] + e * max(1, c[2])
+
+        def diameter(a, b):
+            x, y = (a[0] + b[0]) / 2, (a[1] + b[1]) / 2
+            return (x, y, math.hypot(a[0] - x, a[1] - y))
+
+        def circumscribed(a, b, c):
+            bx, by = b[0] - a[0], b[1] - a[1]
+            cx, cy = c[0] - a[0], c[1] - a[1]
+            d = 2 * (bx * cy - by * cx)
+            if d == 0:  # Aligned points, the circle is given by the farthest ones.
+                return max(diameter(a, b), diameter(a, c), diameter(b, c), key=lambda circle: circle[2])
+            x = (cy * (bx * bx + by * by) - by * (cx * cx + cy * cy)) / d
+            y = (bx * (cx * cx + cy * cy) - cx * (bx * bx + by * by)) / d
+            return (x + a[0], y + a[1], math.hypot(x, y))
+
+        if not positions:
+            return None
+        circle = (positions[0][0], positions[0][1], 0)
+        for i, p in enumerate(positions):
+            if contains(circle, p):
+                continue
+            circle = (p[0], p[1], 0)
+            for j in range(i):
+                q = positions[j]
+                if contains(circle, q):
+                    continue
+                circle = diameter(p, q)
+                for k in range(j):
+                    r = positions[k]
+                    if not contains(circle, r):
+                        circle = circumscribed(p, q, r)
+        return circle
+
+    def getMinimumEnclosingCircle(self, **kwargs):
+        """Return the smallest circle containing all the points of the form,
+        or None if the form has no point.
+        The circle is cached until the points of the form change."""
+        circle = self.cached("enclosing_circle", lambda: Form.enclosingCircle(self.vertices.tolist()))
+        if circle is None:
+            return None
+        x, y, r = circle
+        return Circle(x, y, radius=r, **kwargs)
+
     def getBornCircle(self):
-        distances = []
-        for p1 in self.points:
-            distance = sum([Point.distance(p1, p2) for p2 in self.points])
-            distances.append((distance, p1))
-        pt1 = max(distances)[1]
-        pt2 = Point.farthest(pt1, self.points)
-        distances = []
-        for p in self.points:
-            if not p in [pt1, pt2]:
-                distance = max(Point.distance(p, pt1), Point.distance(p, pt2))
-                distances.append((distance, p))
-        pt3 = max(distances)[1]
-        triangle = Form([pt1, pt2, pt3])
-        return triangle.getBornCircleTriangle()
-
-    def getBornCircle2(self):
-        if len(self.points) == 3:
-            return self.getBornCircleTriangle()
-        else:
-            circles = []
-            for (p1, p2, p3) in itertools.combinations(self.points, 3):
-                form = Form([p1, p2, p3])
-                circle = form.getBornCircle2()
-                circles.append(circle)
-            circles.sort(key=lambda circle: circle.radius, reverse=True)
-            return circles[0]
+        """Return the minimum enclosing circle."""
+        return self.getMinimumEnclosingCircle()
+
+    getBornCircle2 = getBornCircleSlow = getBornCircle
 
     def getBornCircle3(self):
-        triangles = self.getSubForms(3)
-        f = max(triangles, key=lambda triangle:triangle.perimeter)
-        # f = max(triangles, key=lambda triangle: triangle.area)
-        if f.obtusangle:
-            return f.getCircleDiameter(), f
-        else:
-            return f.getCircleCircumscribed(), f
-
-    def getBornCircleSlow(self, e=1e-3):
-        for (p1, p2) in self.getSubForms(2):
-            segment = Segment(p1, p2)
-            l = segment.length / 2
-            c = segment.middle
-            condition = True
-            for p in self.points:
-                if Point.distance(p, c) + e > l:
-                    condition = False
-                    break
-            if condition:
-                return Circle(*c, radius=l)
-
-        for triangle in self.getSubForms(3):
-            circle = triangle.getCircleCircumscribed()
-            c = circle.center
-            l = circle.radius
-            condition = True
-            for p in self.points:
-                if Point.distance(p, c) + e > l:
-                    condition = False
-                    break
-            if condition:
-                print(circle)
-                return circle
-
-            print("not found")
-            circle.border_color = colors.YELLOW
-            return circle
+        """Return the minimum enclosing circle along with the form."""
+        return self.getMinimumEnclosingCircle(), self
 
     def getSubForms(self, n):
         return list(map(Form, itertools.combinations(self.points, n)))
@@ -2124,17 +2553,20 @@ class Form:
         return len(self.points)
 
     def __xor__(self, other):
-        """Return the list of forms that are in the union of 2 forms."""
-        if type(other) == Form:
+        """Return the list of forms that are in only one of the forms."""
+        if isinstance(other, Form):
             other = [other]
-        return Form.union([other, self])
+        return Form.xor([self] + list(other))
 
     def __and__(self, other):
-        """Return the list of forms that are in the intersection of 2 forms."""
-        points = self.crossForm(other)
-        points += [point for point in self.points if point in other]
-        points += [point for point in other.points if point in self]
-        if points: return Form(points)
+        """Return the form that is the intersection of 2 forms, or None."""
+        return Form.intersectionTwoForms(self, other)
+
+    def __sub__(self, other):
+        """Return the list of forms that are in the form but not in the other."""
+        if isinstance(other, Form):
+            other = [other]
+        return Form.difference(self, other)
 
     # Color
     def setColor(self, color):
@@ -2335,6 +2767,11 @@ class Circle:
         """Set the center point of the circle by changing the position of the circle."""
         self.position = point.position
 
+    def getBBox(self):
+        """Return the bounding box (xmin, ymin, xmax, ymax) of the circle."""
+        x, y, r = self.position[0], self.position[1], self.radius
+        return (x - r, y - r, x + r, y + r)
+
     def getR(self):
         """Return the radius."""
         return self.radius
@@ -2346,6 +2783,7 @@ class Circle:
     x = property(getX, setX, "Allow the user to manipulate the x component easily.")
     y = property(getY, setY, "Allow the user to manipulate the y component easily.")
     r = property(getR, setR, "Abbreviation of the radius")
+    bbox = property(getBBox, doc="Bounding box of the circle.")
     center = point = property(getPoint, setPoint, "Allow the user to manipulate the point easily.")
 
     def show(self, window, color=None, border_color=None, area_color=None, fill=None):
@@ -0,0 +1,373 @@
+from .abstract import Point, Vector, PointStyle, VectorStyle, styleProperty
+from . import colors
+
+import numpy as np
+import math
+
+
+class PointView(Point):
+    """Point whose components live in a row of a point array.
+    Modifying the view modifies the array and reciprocally."""
+
+    def __init__(self, array, index):
+        """Create a view of the point of index 'index' of the array."""
+        self.array = array
+        self.index = index
+
+    def __getattr__(self, name):
+        """Use the shared style of the array when the point has none of its own."""
+        if name == "style":
+            return self.__dict__["array"].style
+        raise AttributeError(name)
+
+    def getComponents(self):
+        """Return the row of the buffer that holds the components."""
+        return self.array.buffer[self.index]
+
+    def setComponents(self, components):
+        """Write the components in the buffer of the array."""
+        self.array.buffer[self.index] = components
+
+    components = property(getComponents, setComponents, doc="Components stored in the array.")
+
+
+class VectorView(Vector):
+    """Vector whose components live in a row of a vector array.
+    Modifying the view modifies the array and reciprocally."""
+
+    def __init__(self, array, index):
+        """Create a view of the vector of index 'index' of the array."""
+        self.array = array
+        self.index = index
+
+    def __getattr__(self, name):
+        """Use the shared style of the array when the vector has none of its own."""
+        if name == "style":
+            return self.__dict__["array"].style
+        raise AttributeError(name)
+
+    def getComponents(self):
+        """Return the row of the buffer that holds the components."""
+        return self.array.buffer[self.index]
+
+    def setComponents(self, components):
+        """Write the components in the buffer of the array."""
+        self.array.buffer[self.index] = components
+
+    components = property(getComponents, setComponents, doc="Components stored in the array.")
+
+
+class AbstractArray:
+    """Base class of the arrays of abstract objects. The components of the 'n'
+    objects are stored in a single contiguous (n, d) float buffer, and the
+    drawing attributes are shared by all of them."""
+
+    view = None
+
+    @classmethod
+    def random(cls, n=10, d=2, borns=[-1, 1], **kwargs):
+        """Create an array of 'n' random objects of dimension 'd'."""
+        return cls(np.random.uniform(*borns, (n, d)), **kwargs)
+
+    @classmethod
+    def null(cls, n=0, d=2, **kwargs):
+        """Create an array of 'n' null objects of dimension 'd'."""
+        return cls(np.zeros((n, d)), **kwargs)
+
+    zero = origin = null
+
+    def __init__(self, buffer):
+        """Create the array using an array-like of shape (n, d)."""
+        buffer = np.asarray(buffer, dtype=float)
+        if buffer.ndim == 1:
+            buffer = buffer.reshape(-1, 2)
+        self.buffer = buffer
+
+    @classmethod
+    def _components(cls, other):
+        """Return the buffer, the components or the array-like of an operand so
+        that it can be broadcast against a buffer."""
+        if isinstance(other, AbstractArray):
+            return other.buffer
+        if isinstance(other, (Point, Vector)):
+            return np.asarray(list(other.components), dtype=float)
+        return other
+
+    def copy(self, buffer=None):
+        """Return an array of the same type and style with a new buffer."""
+        if buffer is None:
+            buffer = self.buffer.copy()
+        return type(self)(buffer, **self.style._asdict())
+
+    def __len__(self):
+        """Return the number of objects."""
+        return len(self.buffer)
+
+    def __getitem__(self, index):
+        """Return a view of the object of the given index or an array that
+        shares its buffer when slicing."""
+        if isinstance(index, (int, np.integer)):
+            if index < 0:
+                index += len(self.buffer)
+            return self.view(self, index)
+        return self.copy(self.buffer[index])
+
+    def __setitem__(self, index, value):
+        """Set the components of the object(s) of the given index."""
+        self.buffer[index] = self._components(value)
+
+    def __iter__(self):
+        """Iterate the views of the objects."""
+        return (self.view(self, i) for i in range(len(self.buffer)))
+
+    def __str__(self):
+        """Return the string representation of the array."""
+        return type(self).__name__ + "(" + str(self.buffer.round(2).tolist()) + ")"
+
+    def getDimension(self):
+        """Return the dimension of the objects."""
+        return self.buffer.shape[1]
+
+    def getX(self):
+        """Return the column of the x components."""
+        return self.buffer[:, 0]
+
+    def setX(self, x):
+        """Set the column of the x components."""
+        self.buffer[:, 0] = x
+
+    def getY(self):
+        """Return the column of the y components."""
+        return self.buffer[:, 1]
+
+    def setY(self, y):
+        """Set the column of the y components."""
+        self.buffer[:, 1] = y
+
+    dimension = property(getDimension, doc="Dimension of the objects.")
+    x = property(getX, setX, doc="Column of the x components.")
+    y = property(getY, setY, doc="Column of the y components.")
+
+    def __add__(self, other):
+        """Add the components of both objects."""
+        return self.copy(self.buffer + self._components(other))
+
+    def __sub__(self, other):
+        """Substract the components of both objects."""
+        return self.copy(self.buffer - self._components(other))
+
+    def __iadd__(self, other):
+        """Add the components of the other object in place."""
+        self.buffer += self._components(other)
+        return self
+
+    def __isub__(self, other):
+        """Substract the components of the other object in place."""
+        self.buffer -= self._components(other)
+        return self
+
+    __radd__ = __add__
+
+    def __mul__(self, factor):
+        """Multiply the components by a scalar or by an array of n scalars."""
+        return self.copy(self.buffer * np.reshape(factor, (-1, 1)))
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, factor):
+        """Divide the components by a scalar or by an array of n scalars."""
+        return self.copy(self.buffer / np.reshape(factor, (-1, 1)))
+
+    def __neg__(self):
+        """Return the opposite array."""
+        return self.copy(-self.buffer)
+
+
+class PointArray(AbstractArray):
+    """Array of points stored in a single (n, d) buffer."""
+
+    view = PointView
+    default_style = Point.default_style
+
+    @classmethod
+    def createFromPoints(cls, points, **kwargs):
+        """Create a point array from a list of points."""
+        return cls([list(p) for p in points], **kwargs)
+
+    def __init__(self, buffer, mode=0, size=[0.1, 0.1], width=1, radius=0.02, fill=False, color=colors.WHITE,
+                 conversion=True):
+        """Create the point array using its buffer and the shared style of the points."""
+        super().__init__(buffer)
+        self.style = PointStyle.get(mode, size, width, radius, fill, color, conversion)
+
+    mode = styleProperty("mode")
+    size = styleProperty("size")
+    width = styleProperty("width")
+    radius = styleProperty("radius")
+    fill = styleProperty("fill")
+    color = styleProperty("color")
+    conversion = styleProperty("conversion")
+
+    def getPoints(self):
+        """Return independent points with the components of the array."""
+        return [Point(*map(float, row), **self.style._asdict()) for row in self.buffer]
+
+    def getCenter(self):
+        """Return the average point of the array."""
+        return Point(*self.buffer.mean(axis=0))
+
+    points = property(getPoints, doc="Points of the array.")
+    center = property(getCenter, doc="Average point of the array.")
+
+    def distance(self, point):
+        """Return the distances between the points of the array and a point or
+        the respective points of another array."""
+        return np.linalg.norm(self.buffer - self._components(point), axis=1)
+
+    def rotate(self, angle=math.pi, point=None):
+        """Rotate the points using the angle and the center of rotation.
+        Uses the origin for the center of rotation by default."""
+        c = np.zeros(2) if point is None else self._components(point)
+        cos, sin = math.cos(angle), math.sin(angle)
+        x, y = self.buffer[:, 0] - c[0], self.buffer[:, 1] - c[1]
+        self.buffer[:, 0], self.buffer[:, 1] = c[0] + cos * x - sin * y, c[1] + sin * x + cos * y
+
+    def move(self, *step):
+        """Move all the points using the given step."""
+        self.buffer += step
+
+    def show(self, context, color=None, radius=None, fill=None, conversion=None):
+        """Show the points under the form of circles using the context."""
+        if not color: color = self.color
+        if not radius: radius = self.radius
+        if not fill: fill = self.fill
+        if not conversion: conversion = self.conversion
+        for position in self.buffer.tolist():
+            context.draw.circle(context.screen, color, position, radius, fill, conversion)
+
+
+class VectorArray(AbstractArray):
+    """Array of vectors stored in a single (n, d) buffer."""
+
+    view = VectorView
+    default_style = Vector.default_style
+
+    @classmethod
+    def createFromVectors(cls, vectors, **kwargs):
+        """Create a vector array from a list of vectors."""
+        return cls([list(v) for v in vectors], **kwargs)
+
+    @classmethod
+    def createFromTwoPointArrays(cls, points1, points2, **kwargs):
+        """Create the vectors that go from the points of the first array to
+        the respective points of the second."""
+        return cls(points2.buffer - points1.buffer, **kwargs)
+
+    @classmethod
+    def createFromPolar(cls, norms, angles, **kwargs):
+        """Create a vector array using arrays of norms and angles."""
+        return cls(np.column_stack((norms * np.cos(angles), norms * np.sin(angles))), **kwargs)
+
+    def __init__(self, buffer, color=colors.WHITE, width=1, arrow=[0.1, 0.5]):
+        """Create the vector array using its buffer and the shared style of the vectors."""
+        super().__init__(buffer)
+        self.style = VectorStyle.get(color, width, arrow)
+
+    color = styleProperty("color")
+    width = styleProperty("width")
+    arrow = styleProperty("arrow")
+
+    def getVectors(self):
+        """Return independent vectors with the components of the array."""
+        return [Vector(*map(float, row), **self.style._asdict()) for row in self.buffer]
+
+    def getNorm(self):
+        """Return the euclidian norms of the vectors."""
+        return np.linalg.norm(self.buffer, axis=1)
+
+    def setNorm(self, norms):
+        """Change the norms of the vectors without changing their angles."""
+        n = self.getNorm()
+        n[n == 0] = 1
+        self.buffer *= (np.asarray(norms) / n).reshape(-1, 1)
+
+    def getAngle(self):
+        """Return the angles of the vectors in polar coordinates."""
+        return np.arctan2(self.buffer[:, 1], self.buffer[:, 0])
+
+    def setAngle(self, angles):
+        """Change the angles of the vectors without changing their norms."""
+        n = self.getNorm()
+        self.buffer[:, 0] = n * np.cos(angles)
+        self.buffer[:, 1] = n * np.sin(angles)
+
+    vectors = property(getVectors, doc="Vectors of the array.")
+    norm = property(getNorm, setNorm, doc="Norms of the vectors.")
+    angle = property(getAngle, setAngle, doc="Angles of the vectors.")
+
+    def rotate(self, angle):
+        """Rotate all the vectors using the angle of rotation."""
+        cos, sin = math.cos(angle), math.sin(angle)
+        x, y = self.buffer[:, 0].copy(), self.buffer[:, 1].copy()
+        self.buffer[:, 0] = cos * x - sin * y
+        self.buffer[:, 1] = sin * x + cos * y
+
+    def __mod__(self, angle):
+        """Return the rotated vectors using the angle of rotation."""
+        array = self.copy()
+        array.rotate(angle)
+        return array
+
+    def scalar(self, other):
+        """Return the scalar products between the vectors and a vector or the
+        respective vectors of another array."""
+        return np.einsum("ij,ij->i", self.buffer, np.broadcast_to(self._components(other), self.buffer.shape))
+
+    def cross(self, other):
+        """Determine which vectors cross the other ones using dot product."""
+        return self.scalar(other) == 0
+
+    def getUnit(self):
+        """Return the unit vectors."""
+        n = self.getNorm()
+        n[n == 0] = 1
+        return self / n
+
+    unit = property(getUnit, doc="Unit vectors of the array.")
+
+    def __call__(self, points):
+        """Return the point array obtained by applying the vectors to the points."""
+        return points + self
+
+    def show(self, context, points, color=None, width=None):
+        """Show the vectors applied to the respective points of the point array."""
+        for vector, point in zip(self, points):
+            vector.show(context, point, color=color, width=width)
+
+
+if __name__ == "__main__":
+    from .abstract import Segment
+    import time
+    import tracemalloc
+
+    def measure(name, create, n=1000000):
+        """Print the number of bytes used per object created."""
+        tracemalloc.start()
+        objects = create(n)
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(name + ":", round(size / n, 1), "bytes per object")
+        return objects
+
+    points = measure("Point", lambda n: [Point.random() for i in range(n)])
+    measure("Vector", lambda n: [Vector.random() for i in range(n)])
+    measure("Segment", lambda n: [Segment.random() for i in range(n)])
+    array = measure("PointArray", lambda n: PointArray.random(n))
+
+    ti = time.time()
+    for point in points:
+        point.rotate(0.1)
+    print("Point.rotate:", time.time() - ti, "s")
+    ti = time.time()
+    array.rotate(0.1)
+    print("PointArray.rotate:", time.time() - ti, "s")
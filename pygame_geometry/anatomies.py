@@ -1,4 +1,4 @@
-from .abstract import Point, Segment, Form, Circle, Vector, Line, Form
+from .abstract import Point, Segment, Form, Circle, Vector, Line, Form, BoundingBox
 from .curves import Trajectory
 
 import random
@@ -144,15 +144,20 @@ class TrajectoryAnatomy(PointsAnatomy, Trajectory):
 
 
 class FormAnatomy(PointsAnatomy, Form):
+    def enlarge(self, n):
+        """Enlarge the form anatomy and change its version."""
+        super().enlarge(n)
+        self.touch()
+
     def collide(self, other):
         """Determine if the forms are colliding."""
-        for p in self.points:
-            if p in other:
-                return True
-        for p in other.points:
-            if p in self:
-                return True
-        return False
+        if hasattr(other, "bbox") and not BoundingBox.overlap(self.bbox, other.bbox):
+            return False
+        if not isinstance(other, Form):
+            return any(p in other for p in self.points)
+        if self.convex() and other.convex():
+            return Form.separation(self.vertices, other.vertices) is not None
+        return bool(other.containsMany(self.points).any() or self.containsMany(other.points).any())
 
 
 class SegmentAnatomy(PointsAnatomy, Segment):
@@ -0,0 +1,246 @@
+from .sweepline import SweepLine
+
+import numpy as np
+import math
+
+
+class Clipper:
+    """Boolean operations between polygonal regions, in the style of the
+    algorithm of Martinez. A region is a list of loops of positions (x, y)
+    filled with the even-odd rule, so that it can have several parts and holes.
+    The sides of both regions are cut at their intersections with a sweep line,
+    each piece is classified as inside, outside or shared with the other
+    region, and the pieces kept by the operation are linked back into loops
+    which have their interior on their left."""
+
+    operations = ("union", "intersection", "difference", "xor")
+
+    @staticmethod
+    def evenOdd(edges, positions):
+        """Return the boolean mask (the position is inside) of the (n, 2) array
+        of positions, using the parity of the number of edges (x1, y1, x2, y2)
+        crossed by the horizontal half lines going from the positions to the
+        right."""
+        x, y = positions[:, 0], positions[:, 1]
+        inside = np.zeros(len(positions), dtype=bool)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for xi, yi, xj, yj in edges:
+                straddle = (yi > y) != (yj > y)
+                inside ^= straddle & (x < (xj - xi) * (y - yi) / (yj - yi) + xi)
+        return inside
+
+    @staticmethod
+    def area(loop):
+        """Return the signed area of a loop, which is positive when it turns
+        counter clockwise."""
+        return sum(x1 * y2 - x2 * y1 for ((x1, y1), (x2, y2)) in zip(loop, loop[1:] + loop[:1])) / 2
+
+    @staticmethod
+    def orient(loop):
+        """Return the loop turning counter clockwise."""
+        loop = [(float(p[0]), float(p[1])) for p in loop]
+        if Clipper.area(loop) < 0:
+            loop.reverse()
+        return loop
+
+    @staticmethod
+    def edges(region):
+        """Return the list of the edges (x1, y1, x2, y2) of a region."""
+        return [loop[i] + loop[(i + 1) % len(loop)] for loop in region for i in range(len(loop))]
+
+    @staticmethod
+    def bbox(region):
+        """Return the bounding box (xmin, ymin, xmax, ymax) of a region."""
+        xs = [p[0] for loop in region for p in loop]
+        ys = [p[1] for loop in region for p in loop]
+        return (min(xs), min(ys), max(xs), max(ys))
+
+    def __init__(self, e=1e-9):
+        """Create a clipper with a precision 'e'."""
+        self.e = e
+
+    def split(self, edges):
+        """Cut the edges at all their intersections and return the pieces of
+        each edge in order."""
+        cuts = [[] for edge in edges]
+        for (i, j, p) in SweepLine(edges, self.e).pairs():
+            cuts[i].append(p)
+            cuts[j].append(p)
+        pieces = []
+        for (edge, points) in zip(edges, cuts):
+            x1, y1, x2, y2 = edge
+            dx, dy = x2 - x1, y2 - y1
+            points.sort(key=lambda p: (p[0] - x1) * dx + (p[1] - y1) * dy)
+            path = [(x1, y1)] + points + [(x2, y2)]
+            edge_pieces = []
+            for (a, b) in zip(path, path[1:]):
+                if a != b:
+                    edge_pieces.append(a + b)
+            pieces.append(edge_pieces)
+        return pieces
+
+    def classify(self, pieces, region_edges, shared):
+        """Return for each piece 'inside', 'outside', 'same' or 'opposite'
+        depending on its position relative to the other region, 'same' and
+        'opposite' meaning that the other region has the same piece in the
+        same or the opposite direction."""
+        if not pieces:
+            return []
+        middles = np.array([((x1 + x2) / 2, (y1 + y2) / 2) for (x1, y1, x2, y2) in pieces])
+        inside = Clipper.evenOdd(region_edges, middles)
+        classes = []
+        for (piece, flag) in zip(pieces, inside):
+            if piece in shared:
+                classes.append("same")
+            elif piece[2:] + piece[:2] in shared:
+                classes.append("opposite")
+            else:
+                classes.append("inside" if flag else "outside")
+        return classes
+
+    def select(self, subject, clip, operation):
+        """Return the directed pieces of both regions kept by the operation."""
+        subject_edges = Clipper.edges(subject)
+        clip_edges = Clipper.edges(clip)
+        n = len(subject_edges)
+        pieces = self.split(subject_edges + clip_edges)
+        subject_pieces = [p for edge in pieces[:n] for p in edge]
+        clip_pieces = [p for edge in pieces[n:] for p in edge]
+        subject_classes = self.classify(subject_pieces, clip_edges, set(clip_pieces))
+        clip_classes = self.classify(clip_pieces, subject_edges, set(subject_pieces))
+        # Which pieces are kept, and which are reversed, for each operation.
+        rules = {
+            "union": ({"outside", "same"}, {"outside"}, set()),
+            "intersection": ({"inside", "same"}, {"inside"}, set()),
+            "difference": ({"outside", "opposite"}, set(), {"inside"}),
+            "xor": ({"outside"}, {"outside"}, {"inside"}),
+        }
+        keep_subject, keep_clip, reverse = rules[operation]
+        selected = [p for (p, c) in zip(subject_pieces, subject_classes) if c in keep_subject]
+        selected += [p for (p, c) in zip(clip_pieces, clip_classes) if c in keep_clip]
+        selected += [p[2:] + p[:2] for (p, c) in zip(clip_pieces, clip_classes) if c in reverse]
+        if operation == "xor":
+            selected += [p[2:] + p[:2] for (p, c) in zip(subject_pieces, subject_classes) if c == "inside"]
+        return selected
+
+    def link(self, pieces):
+        """Link the directed pieces into loops. At a vertex where several loops
+        meet, the sharpest turn to the left is taken so that the loops do not
+        cross themselves."""
+        outgoing = {}
+        for piece in pieces:
+            outgoing.setdefault(piece[:2], []).append(piece)
+        loops = []
+        for start in list(outgoing):
+            while outgoing.get(start):
+                piece = outgoing[start].pop()
+                loop = [start]
+                while True:
+                    a, b = piece[:2], piece[2:]
+                    if b == start:
+                        break
+                    candidates = outgoing.get(b)
+                    if not candidates:
+                        loop = None
+                        break
+                    back = math.atan2(a[1] - b[1], a[0] - b[0])
+                    k = max(range(len(candidates)), key=lambda k: (math.atan2(
+                        candidates[k][3] - b[1], candidates[k][2] - b[0]) - back) % (2 * math.pi))
+                    loop.append(b)
+                    piece = candidates.pop(k)
+                if loop:
+                    loop = self.simplify(loop)
+                    if len(loop) >= 3:
+                        loops.append(loop)
+        return loops
+
+    def simplify(self, loop):
+        """Remove the vertices of a loop that are aligned with their neighbours."""
+        result = []
+        l = len(loop)
+        for i in range(l):
+            (ax, ay), (bx, by), (cx, cy) = loop[i - 1], loop[i], loop[(i + 1) % l]
+            if abs((bx - ax) * (cy - by) - (by - ay) * (cx - bx)) > self.e * self.e:
+                result.append(loop[i])
+        return result
+
+    def compute(self, subject, clip, operation):
+        """Return the region obtained by applying the operation to the regions."""
+        if operation not in Clipper.operations:
+            raise ValueError("Unknown operation: " + str(operation))
+        if not subject or not clip:
+            return {"union": subject + clip, "intersection": [], "difference": subject,
+                    "xor": subject + clip}[operation]
+        ax1, ay1, ax2, ay2 = Clipper.bbox(subject)
+        bx1, by1, bx2, by2 = Clipper.bbox(clip)
+        if ax2 < bx1 or bx2 < ax1 or ay2 < by1 or by2 < ay1:
+            # The regions are disjoint so the result is known without clipping.
+            return {"union": subject + clip, "intersection": [], "difference": subject,
+                    "xor": subject + clip}[operation]
+        return self.link(self.select(subject, clip, operation))
+
+    def union(self, subject, clip):
+        """Return the union of the regions."""
+        return self.compute(subject, clip, "union")
+
+    def intersection(self, subject, clip):
+        """Return the intersection of the regions."""
+        return self.compute(subject, clip, "intersection")
+
+    def difference(self, subject, clip):
+        """Return the subject region without the clip region."""
+        return self.compute(subject, clip, "difference")
+
+    def xor(self, subject, clip):
+        """Return the parts that are in only one of the regions."""
+        return self.compute(subject, clip, "xor")
+
+    def reduce(self, regions, operation):
+        """Apply the operation to all the regions by merging them two by two,
+        so that only log(n) levels of merges are needed."""
+        regions = [region for region in regions if region] or [[]]
+        while len(regions) > 1:
+            merged = [self.compute(regions[i], regions[i + 1], operation) for i in range(0, len(regions) - 1, 2)]
+            if len(regions) % 2:
+                merged.append(regions[-1])
+            regions = merged
+        return regions[0]
+
+    def unionAll(self, regions):
+        """Return the union of all the regions."""
+        return self.reduce(regions, "union")
+
+    def intersectionAll(self, regions):
+        """Return the intersection of all the regions."""
+        if any(not region for region in regions):
+            return []
+        return self.reduce(regions, "intersection")
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    def polygon(n, x, y, r):
+        """Return a random star shaped polygon."""
+        angles = [2 * math.pi * (i + random.random()) / n for i in range(n)]
+        radiuses = [random.uniform(r / 2, r) for i in range(n)]
+        return [(x + l * math.cos(a), y + l * math.sin(a)) for (a, l) in zip(angles, radiuses)]
+
+    clipper = Clipper()
+    for n in [10, 100, 1000]:
+        # The size of the polygons decreases so that they keep overlapping a bit.
+        r = 10 / math.sqrt(n)
+        regions = [[Clipper.orient(polygon(8, random.uniform(0, 10), random.uniform(0, 10), r))]
+                   for i in range(n)]
+        ti = time.time()
+        union = clipper.unionAll(regions)
+        dt = time.time() - ti
+        # Check the area with random samples.
+        samples = np.random.uniform(-r, 10 + r, (20000, 2))
+        inside = np.zeros(len(samples), dtype=bool)
+        for region in regions:
+            inside |= Clipper.evenOdd(Clipper.edges(region), samples)
+        expected = inside.mean() * (10 + 2 * r) ** 2
+        area = sum(Clipper.area(loop) for loop in union)
+        print("n={}: {} loops in {:.3f}s, area {:.2f} (sampled {:.2f})".format(n, len(union), dt, area, expected))
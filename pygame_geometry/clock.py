@@ -0,0 +1,77 @@
+import time
+
+
+class FixedClock:
+    """Clock of a simulation with a fixed timestep, decoupled from the rate of
+    the frames. The time elapsed between two frames is accumulated and spent
+    by steps of 'dt', so that a slow frame is followed by several steps and a
+    fast frame by none. The number of steps of a frame is limited so that a
+    simulation slower than real time does not fall further and further
+    behind, the time that could not be simulated being dropped instead. The
+    remaining fraction of a step is given by 'alpha', which can be used to
+    interpolate the states shown between the last two steps."""
+
+    def __init__(self, dt=10e-3, max_steps=5, speed=1, timer=time.perf_counter):
+        """Create a clock using the duration of a step, the maximum number of
+        steps of a frame, the speed of the simulation relatively to real time
+        and the function giving the time."""
+        self.dt = dt
+        self.max_steps = max_steps
+        self.speed = speed
+        self.timer = timer
+        self.last = None
+        self.accumulator = 0
+        self.steps = 0
+        self.dropped = 0
+
+    def __str__(self):
+        """Return the string representation of the clock."""
+        return "FixedClock(dt={}, steps={}, alpha={:.2f}, dropped={:.3f})".format(
+            self.dt, self.steps, self.alpha, self.dropped)
+
+    def reset(self):
+        """Forget the time of the last frame and the time accumulated, which is
+        needed after a pause so that it is not simulated at once."""
+        self.last = None
+        self.accumulator = 0
+
+    def tick(self, now=None):
+        """Accumulate the time elapsed since the last frame and return the
+        number of steps to simulate during this frame."""
+        if now is None:
+            now = self.timer()
+        if self.last is not None:
+            self.accumulator += (now - self.last) * self.speed
+        self.last = now
+        steps = int(self.accumulator // self.dt)
+        if steps > self.max_steps:
+            # The simulation can not keep up, the late steps are dropped.
+            self.dropped += (steps - self.max_steps) * self.dt
+            steps = self.max_steps
+            self.accumulator %= self.dt
+        else:
+            self.accumulator -= steps * self.dt
+        self.steps = steps
+        return steps
+
+    def getAlpha(self):
+        """Return the fraction of a step accumulated but not simulated yet."""
+        return min(self.accumulator / self.dt, 1)
+
+    def interpolate(self, previous, current):
+        """Return the state between the previous and the current states of the
+        last two steps that corresponds to the time of the frame."""
+        return previous + (current - previous) * self.alpha
+
+    alpha = property(getAlpha, doc="Fraction of a step not simulated yet.")
+
+
+if __name__ == "__main__":
+    # Simulated frames of 1/60s with steps of 1/120s, then slow frames.
+    clock = FixedClock(dt=1 / 120, max_steps=4)
+    t = 0
+    for (duration, frames) in [(1 / 60, 3), (1 / 25, 3), (1, 1), (1 / 144, 4)]:
+        for i in range(frames):
+            t += duration
+            clock.tick(t)
+            print("frame of {:.4f}s: {}".format(duration, clock))
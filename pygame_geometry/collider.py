@@ -1,10 +1,14 @@
-from .abstract import Segment, Vector, Line
-from .anatomies import CircleAnato, FormAnatomy
+from .abstract import Segment, Vector, Line, Form
+from .anatomies import CircleAnatomy, FormAnatomy
 from .manager import Manager
 from .motion import Motion, Moment
 from .entity import Entity
+from .entitygroup import EntityGroup
 from .rectangle import Square
 from .group import Group
+from .spatialhash import SpatialHash
+from .contactsolver import ContactSolver
+from .narrowphase import ParallelNarrowPhase, CONVEX, POLYGON
 
 import math
 
@@ -82,30 +86,170 @@ import math
 
 
 class Collider:
-    def __init__(self, elasticity=1e-5):
+    broadphases = (None, "grid")
+
+    def __init__(self, elasticity=1e-5, broadphase=None, solver=None, narrowphase=None):
+        """Create a collider using the elasticity of the collisions, the
+        broad phase that selects the pairs to test, which is either None to
+        test all the pairs or "grid" to only test the pairs of entities that
+        share a cell of a spatial hash, the contact solver used by
+        'soloSolve' and 'multiSolve', and an optional parallel narrow phase
+        that tests the pairs of polygons in other processes."""
+        if broadphase not in Collider.broadphases:
+            raise ValueError("Unknown broad phase: " + str(broadphase))
         self.elasticity = elasticity
-
-    def soloChocs(self, g, **kwargs):
+        self.broadphase = broadphase
+        self.solver = solver if solver is not None else ContactSolver()
+        self.narrowphase = narrowphase
+        # Numbers of pairs tested and of collisions since the last reset
+        self.candidates = 0
+        self.collisions = 0
+
+    def reset(self):
+        """Return the numbers of pairs tested and of collisions since the last
+        reset, and set them to 0."""
+        counts = (self.candidates, self.collisions)
+        self.candidates = self.collisions = 0
+        return counts
+
+    def gridPairs(self, groups):
+        """Return the pairs of entities of the groups that share a cell of a
+        spatial hash which cells are as large as the biggest entity. If there
+        are 2 groups, only the pairs made of one entity of each are returned,
+        in the order of the groups since the cells keep the order of insertion."""
+        entities = [e for group in groups for e in group]
+        grid = SpatialHash.createFromRadiuses([e.anatomy.born for e in entities])
+        for (g, group) in enumerate(groups):
+            for e in group:
+                grid.insertCircle(e.x, e.y, e.anatomy.born, g)
+        return [(entities[a], entities[b]) for (a, b) in grid.pairs(crossed=len(groups) > 1)]
+
+    @staticmethod
+    def asleep(e1, e2):
+        """Determine if both entities are asleep, in which case they are not
+        tested."""
+        return isinstance(e1, Entity) and isinstance(e2, Entity) and e1.asleep and e2.asleep
+
+    def getSoloPairs(self, g):
+        """Return the pairs of entities of the group to test."""
         l = g.flattened()
-        for (i, e1) in enumerate(l):
-            for e2 in l[i+1:]:
-                if self.collide(e1, e2):
-                    self.bump(e1, e2, **kwargs)
-
-    def multiChocs(self, g1, g2, **kwargs):
-        for (i, e1) in enumerate(g1.flattened()):
-            for e2 in g2.flattened():
-                if self.collide(e1, e2):
-                    self.bump(e1, e2, **kwargs)
+        if self.broadphase == "grid":
+            return self.gridPairs([l])
+        return ((e1, e2) for (i, e1) in enumerate(l) for e2 in l[i+1:])
+
+    def getMultiPairs(self, g1, g2):
+        """Return the pairs of entities of both groups to test."""
+        l1, l2 = g1.flattened(), g2.flattened()
+        if self.broadphase == "grid":
+            return self.gridPairs([l1, l2])
+        return ((e1, e2) for e1 in l1 for e2 in l2)
+
+    def getCollisions(self, pairs):
+        """Return the pairs of entities that collide among the pairs, the
+        pairs of sleeping entities being skipped."""
+        if self.narrowphase is not None:
+            return self.getParallelCollisions(pairs)
+        collisions = []
+        for (e1, e2) in pairs:
+            if not Collider.asleep(e1, e2) and self.collide(e1, e2):
+                self.touch(e1, e2)
+                collisions.append((e1, e2))
+        return collisions
+
+    def getParallelCollisions(self, pairs):
+        """Return the pairs of entities that collide among the pairs like
+        'getCollisions', the pairs of polygons which borns overlap being
+        tested together by the parallel narrow phase."""
+        close = []
+        for (e1, e2) in pairs:
+            if not Collider.asleep(e1, e2):
+                self.candidates += 1
+                if math.hypot(e1.x - e2.x, e1.y - e2.y) < e1.anatomy.born + e2.anatomy.born:
+                    close.append((e1, e2))
+        results = [None] * len(close)
+        forms, indices, jobs, kinds, ranks = {}, {}, [], [], []
+        for (k, (e1, e2)) in enumerate(close):
+            kind = ParallelNarrowPhase.getKind(e1, e2)
+            if isinstance(e1.anatomy, CircleAnatomy) and isinstance(e2.anatomy, CircleAnatomy):
+                results[k] = True
+            elif kind is None:
+                results[k] = e1.collide(e2)
+            else:
+                for e in (e1, e2):
+                    if id(e) not in indices:
+                        indices[id(e)] = len(indices)
+                        forms[id(e)] = e.form
+                f1, f2 = forms[id(e1)], forms[id(e2)]
+                if kind == POLYGON and f1.convex() and f2.convex():
+                    kind = CONVEX
+                jobs.append((indices[id(e1)], indices[id(e2)]))
+                kinds.append(kind)
+                ranks.append(k)
+        if jobs:
+            polygons = [None] * len(indices)
+            for (i, index) in indices.items():
+                form = forms[i]
+                polygons[index] = form.vertices if isinstance(form, Form) else [tuple(p) for p in form.points]
+            for (k, collided) in zip(ranks, self.narrowphase.collide(polygons, jobs, kinds)):
+                results[k] = bool(collided)
+        collisions = []
+        for ((e1, e2), collided) in zip(close, results):
+            if collided:
+                self.collisions += 1
+                self.touch(e1, e2)
+                collisions.append((e1, e2))
+        return collisions
+
+    def soloChocs(self, g, dt=10e-3, **kwargs):
+        """Bump the colliding entities of the group, using the duration 'dt'
+        of a step for the contact solver."""
+        self.chocs(self.getCollisions(self.getSoloPairs(g)), dt, **kwargs)
+
+    def multiChocs(self, g1, g2, dt=10e-3, **kwargs):
+        """Bump the colliding entities of both groups, using the duration 'dt'
+        of a step for the contact solver."""
+        self.chocs(self.getCollisions(self.getMultiPairs(g1, g2)), dt, **kwargs)
+
+    def chocs(self, collisions, dt=10e-3,
+              bouncing=False, bouncing1=False, bouncing2=False,
+              overlapping=False, overlapping1=False, overlapping2=False, **kwargs):
+        """Bump the entities of the collisions. The entities that bounce or
+        which overlaps are corrected are resolved all together by the contact
+        solver, which gives impulses to both entities of each pair and pushes
+        them apart during the next updates."""
+        if bouncing or bouncing1 or bouncing2 or overlapping or overlapping1 or overlapping2:
+            self.solver.solve(collisions, dt)
+        for (e1, e2) in collisions:
+            self.bump(e1, e2, **kwargs)
+
+    def soloSolve(self, g, dt):
+        """Resolve the collisions of the entities of the group with the
+        contact solver, using the duration 'dt' of a step."""
+        return self.solver.solve(self.getCollisions(self.getSoloPairs(g)), dt)
+
+    def multiSolve(self, g1, g2, dt):
+        """Resolve the collisions of the entities of both groups with the
+        contact solver, using the duration 'dt' of a step."""
+        return self.solver.solve(self.getCollisions(self.getMultiPairs(g1, g2)), dt)
+
+    def touch(self, e1, e2):
+        """Record the contact of the entities, so that a sleeping entity
+        touched by an awake one is woken with its island."""
+        if isinstance(e1, Entity) and isinstance(e2, Entity):
+            e1.touch(e2)
 
     __call__ = multiChocs
 
     def collide(self, e1, e2):
         """Determine if their is a collision or not."""
-        vector = e1.position - e2.position
+        self.candidates += 1
         radius = e1.anatomy.born + e2.anatomy.born
-        if vector.norm < radius:
-            return e1.collide(e2)
+        if math.hypot(e1.x - e2.x, e1.y - e2.y) >= radius:
+            return False
+        # The borns of circles are the circles, so they already collide.
+        if (isinstance(e1.anatomy, CircleAnatomy) and isinstance(e2.anatomy, CircleAnatomy)) or e1.collide(e2):
+            self.collisions += 1
+            return True
         return False
 
     def cross(self, e1, e2):
@@ -118,18 +262,6 @@ class Collider:
         pts2 = l.projectPoints(e2.points)
         pass
 
-    def correctOverlapping(self, e1, e2):
-        # We correct the overlapping
-        tangent = math.atan2(e2.y - e1.y, e2.x - e1.x)
-        vector = e1.position - e2.position
-        radius = e1.anatomy.born + e2.anatomy.born
-        r = (vector.norm - radius) / 2
-        angle = 0.5 * math.pi + tangent
-        e1.x += r * math.sin(angle)
-        e1.y -= r * math.cos(angle)
-        e2.x -= r * math.sin(angle)
-        e2.y += r * math.cos(angle)
-
     def applyElasticity(self, e):
         """Apply some elasticity on the collision."""
         e.velocity.norm *= self.elasticity
@@ -140,7 +272,12 @@ class Collider:
              bouncing=False, bouncing1=False, bouncing2=False,
              overlapping=False, overlapping1=False, overlapping2=False,
              elastic=False, elastic1=False, elastic2=False,
-             ):
+             dt=10e-3):
+        """Apply the effects of the collision of the entities. A single pair
+        that bounces or overlaps is resolved by the contact solver, but the
+        pairs of a step should rather be resolved together with 'chocs'."""
+        if bouncing or bouncing1 or bouncing2 or overlapping or overlapping1 or overlapping2:
+            self.solver.solve([(e1, e2)], dt)
         if hitting1 or hitting:
             e1.hit(e2)
         if hitting2 or hitting:
@@ -149,29 +286,11 @@ class Collider:
             e1.die()
         if killing2 or killing:
             e2.die()
-        if bouncing1 or bouncing:
-            self.bounce(e1, e2)
-        if bouncing2 or bouncing:
-            self.bounce(e2, e1)
-        if overlapping1 or overlapping:
-            self.correctOverlapping(e1, e2)
-        if overlapping2 or overlapping:
-            self.correctOverlapping(e2, e1)
         if elastic1 or elastic:
             self.applyElasticity(e1)
         if elastic2 or elastic:
             self.applyElasticity(e2)
 
-    def bounce(self, e1, e2):
-        """Make e1 and e2 bounce one upon another."""
-        v1 = (e1.mass - e2.mass) / (e1.mass + e2.mass) * e1.velocity + \
-             (2 * e2.mass) / (e1.mass + e2.mass) * e2.velocity
-        # v2 = (e2.mass - e1.mass) / (e1.mass + e2.mass) * e2.velocity + \
-        #      (2 * e1.mass) / (e1.mass + e2.mass) * e1.velocity
-        e1.velocity.set(v1)
-        # e2.velocity.set(v2)
-
-
 
 class ColliderTester(Manager):
     def __init__(self, n=10, s=5, g=10, radius_borns=[1, 10], **kwargs):
@@ -180,10 +299,12 @@ class ColliderTester(Manager):
         #             [Motion(s * Vector.random(), 10 * Vector.random(), Vector(0, -g)),
         #              Moment(Vector.random(), 5*Vector.random())], friction=0)
         #             for i in range(n)]
-        self.group = Group(*[Entity(CircleAnatomy.random(radius_borns=radius_borns), \
-                            [Motion(s*Vector.random(), Vector(0,0), Vector(0, -g))], friction=0.1) \
-                            for i in range(n)])
-        self.collider = Collider(elasticity=0.9)
+        self.group = EntityGroup(*[Entity(CircleAnatomy.random(radius_borns=radius_borns), \
+                                  [Motion(s*Vector.random(), Vector(0,0), Vector(0, -g))], friction=0.1) \
+                                  for i in range(n)], sleeping=True)
+        self.collider = Collider(elasticity=0.9, broadphase="grid")
+        self.collider_counts = (0, 0)
+        self.sleep_counts = (n, 0)
         self.born = s
         self.born_elasticity = 0.5
         self.square = Square(0, 0, 2 * self.born)
@@ -195,9 +316,10 @@ class ColliderTester(Manager):
 
     def update(self):
         super().update()
-        for e in self.group:
-            e.update(self.dt)
-        self.collider.soloChocs(self.group, bouncing=True, overlapping=True, elastic=True)
+        self.group.update(self.dt)
+        self.collider.soloSolve(self.group, self.dt)
+        self.collider_counts = self.collider.reset()
+        self.sleep_counts = self.group.sleep_counts
         for e in self.group:
             self.limit(e)
 
@@ -1,4 +1,5 @@
 from .abstract import Form,Point,Segment
+from .sweepline import SweepLine
 from . import colors
 
 import numpy as np
@@ -70,12 +71,7 @@ class ComplexForm(Form):
 
     def crossSelf(self,e=10e-10):
         """Return the list of the points of intersections between the form and itself."""
-        results=[]
-        for i in range(len(self.segments)):
-            for j in range(i):
-                point=self.segments[i].crossSegment(self.segments[j])
-                if point: results.append(point)
-        return results
+        return [Point(*p) for (i,j,p) in SweepLine(self.segments,e).pairs()]
 
 
     def split(self):
@@ -0,0 +1,392 @@
+from .abstract import Form
+from .anatomies import CircleAnatomy, FormAnatomy
+
+import numpy as np
+import math
+
+
+class Contact:
+    """Point of contact between two entities, with the normal going from the
+    first entity to the second, the depth of the penetration and the impulses
+    accumulated along the normal and the tangent."""
+
+    __slots__ = ("x", "y", "nx", "ny", "depth", "r1x", "r1y", "r2x", "r2y",
+                 "normal_mass", "tangent_mass", "bias", "pn", "pt")
+
+    def __init__(self, x, y, nx, ny, depth):
+        """Create a contact using its point, its normal and its depth."""
+        self.x, self.y = x, y
+        self.nx, self.ny = nx, ny
+        self.depth = depth
+        self.pn = self.pt = 0
+
+    def __str__(self):
+        """Return the string representation of the contact."""
+        return "Contact(({:.3f}, {:.3f}), n=({:.3f}, {:.3f}), depth={:.3f}, pn={:.3f})".format(
+            self.x, self.y, self.nx, self.ny, self.depth, self.pn)
+
+
+class ContactSolver:
+    """Solver of the contacts of entities by sequential impulses. The contacts
+    of each pair of entities that collide form a manifold, and the impulses
+    along the normals and the tangents of all the contacts are applied one
+    after the other during a number of iterations, each impulse being clamped
+    so that the accumulated one only pushes and the friction stays in its
+    cone. The penetrations are corrected by a velocity bias proportional to
+    their depths, and the impulses of a frame are reused to start the next one
+    from a persistent cache of the manifolds keyed by the pair of entities, so
+    that stacks are stable with few iterations. The entities turn if their
+    second motion is a moment with a velocity."""
+
+    @staticmethod
+    def getInverseMass(entity):
+        """Return the inverse of the mass of the entity, null if it is infinite."""
+        return 1 / entity.mass if 0 < entity.mass < math.inf else 0
+
+    @staticmethod
+    def getInverseInertia(entity):
+        """Return the inverse of the moment of inertia of the entity, null if it
+        can not turn. The inertia of a form is the one of its polygon of
+        uniform density around its center."""
+        if len(entity.motions) < 2 or len(entity.motions[1].vectors) < 2:
+            return 0
+        anatomy, mass = entity.anatomy, entity.mass
+        if isinstance(anatomy, CircleAnatomy):
+            inertia = mass * anatomy.radius ** 2 / 2
+        elif isinstance(anatomy, FormAnatomy) and len(anatomy.points) >= 3:
+            cx, cy = anatomy.center
+            points = [(p[0] - cx, p[1] - cy) for p in anatomy.points]
+            numerator = denominator = 0
+            for ((x1, y1), (x2, y2)) in zip(points, points[1:] + points[:1]):
+                cross = abs(x1 * y2 - x2 * y1)
+                numerator += cross * (x1 * x1 + x1 * x2 + x2 * x2 + y1 * y1 + y1 * y2 + y2 * y2)
+                denominator += cross
+            inertia = mass * numerator / (6 * denominator) if denominator else 0
+        else:
+            inertia = mass * anatomy.born ** 2 / 2
+        return 1 / inertia if 0 < inertia < math.inf else 0
+
+    def __init__(self, iterations=10, restitution=0.2, friction=0.3, baumgarte=0.2, slop=1e-2,
+                 threshold=1, warm=True):
+        """Create a contact solver using the number of iterations, the
+        restitution and the coefficient of friction of the contacts, the
+        fraction of the depths corrected at each step, the depth allowed
+        without correction, the normal velocity under which the contacts do
+        not bounce and whether the impulses are warm started."""
+        self.iterations = iterations
+        self.restitution = restitution
+        self.friction = friction
+        self.baumgarte = baumgarte
+        self.slop = slop
+        self.threshold = threshold
+        self.warm = warm
+        self.cache = {}
+        # Largest change of a normal impulse at each iteration of the last solve
+        self.residuals = []
+
+    def getManifold(self, e1, e2):
+        """Return the contacts of the entities, which are empty if they do
+        not overlap. Circles touch at one point; convex forms are separated by
+        their minimum translation vector and touch at the points of each one
+        that are inside the other; a circle touches a convex form at the
+        closest point of its sides; other anatomies are treated as circles of
+        their born."""
+        x1, y1 = map(float, e1.position.components[:2])
+        x2, y2 = map(float, e2.position.components[:2])
+        a1, a2 = e1.anatomy, e2.anatomy
+        if isinstance(a1, FormAnatomy) and isinstance(a2, FormAnatomy):
+            f1, f2 = e1.form, e2.form
+            if f1.convex() and f2.convex():
+                return self.getFormManifold(f1, f2)
+        elif isinstance(a1, CircleAnatomy) and isinstance(a2, FormAnatomy):
+            f2 = e2.form
+            if f2.convex():
+                return self.getCircleFormManifold(x1, y1, a1.radius, f2)
+        elif isinstance(a1, FormAnatomy) and isinstance(a2, CircleAnatomy):
+            f1 = e1.form
+            if f1.convex():
+                manifold = self.getCircleFormManifold(x2, y2, a2.radius, f1)
+                for contact in manifold:
+                    contact.nx, contact.ny = -contact.nx, -contact.ny
+                return manifold
+        dx, dy = x2 - x1, y2 - y1
+        distance = math.hypot(dx, dy)
+        depth = a1.born + a2.born - distance
+        if depth <= 0:
+            return []
+        nx, ny = (dx / distance, dy / distance) if distance else (0, 1)
+        r = a1.born - depth / 2
+        return [Contact(x1 + nx * r, y1 + ny * r, nx, ny, depth)]
+
+    def getFormManifold(self, f1, f2):
+        """Return the contacts of two convex forms, at most two of them."""
+        mtv = Form.separation(f1.vertices, f2.vertices)
+        if mtv is None:
+            return []
+        depth = math.hypot(mtv[0], mtv[1])
+        if not depth:
+            return []
+        nx, ny = -mtv[0] / depth, -mtv[1] / depth
+        points = f2.vertices[f1.containsMany(f2.vertices)].tolist()
+        points += f1.vertices[f2.containsMany(f1.vertices)].tolist()
+        if not points:
+            # The edges cross without any vertex inside, the contact is at
+            # the middle of the overlap of the forms along the normal.
+            (x1, y1), (x2, y2) = f1.center, f2.center
+            points = [((x1 + x2) / 2, (y1 + y2) / 2)]
+        elif len(points) > 2:
+            # The extreme points along the tangent span the contact.
+            points.sort(key=lambda p: p[1] * nx - p[0] * ny)
+            points = [points[0], points[-1]]
+        return [Contact(x, y, nx, ny, depth) for (x, y) in points]
+
+    def getCircleFormManifold(self, x, y, radius, form):
+        """Return the contact of a circle and a convex form, with the normal
+        going from the circle to the form."""
+        vertices = form.vertices
+        a = vertices
+        b = np.roll(vertices, -1, axis=0)
+        edges = b - a
+        lengths = (edges * edges).sum(axis=1)
+        t = ((x - a[:, 0]) * edges[:, 0] + (y - a[:, 1]) * edges[:, 1]) / np.where(lengths > 0, lengths, 1)
+        closest = a + np.clip(t, 0, 1)[:, np.newaxis] * edges
+        distances = np.hypot(closest[:, 0] - x, closest[:, 1] - y)
+        k = int(distances.argmin())
+        (qx, qy), distance = closest[k], float(distances[k])
+        inside = bool(form.containsMany(np.array([[x, y]]))[0])
+        if not inside and distance >= radius:
+            return []
+        if distance > 0:
+            nx, ny = (qx - x) / distance, (qy - y) / distance
+        else:
+            # The center is on a side, the normal is the one of the side.
+            length = math.sqrt(lengths[k]) or 1
+            nx, ny = edges[k, 1] / length, -edges[k, 0] / length
+        if inside:
+            nx, ny = -nx, -ny
+            depth = radius + distance
+        else:
+            depth = radius - distance
+        return [Contact(float(qx), float(qy), nx, ny, depth)]
+
+    def getKey(self, e1, e2):
+        """Return the key of the pair of entities in the cache. The key holds
+        the entities themselves, so that the manifold of an entity that was
+        removed is never given to a new entity that got its id."""
+        return (e1, e2)
+
+    def warmStart(self, key, manifold, e1, e2):
+        """Give the contacts of the manifold the impulses of the nearest
+        contacts of the same pair at the previous solve."""
+        previous = self.cache.get(key)
+        if not previous:
+            return
+        tolerance = (0.25 * (e1.born + e2.born)) ** 2
+        for contact in manifold:
+            nearest = min(previous, key=lambda c: (c.x - contact.x) ** 2 + (c.y - contact.y) ** 2)
+            if (nearest.x - contact.x) ** 2 + (nearest.y - contact.y) ** 2 < tolerance:
+                contact.pn, contact.pt = nearest.pn, nearest.pt
+
+    def solve(self, pairs, dt):
+        """Resolve the contacts of the pairs of entities by changing their
+        velocities, using the duration 'dt' of a step. The accelerations are
+        added to the velocities during the next update before the positions,
+        so the velocities solved are the ones of the next step, which is what
+        keeps a resting body from sinking under gravity. The cache only keeps
+        the pairs that touched at the last solve, so all the pairs of a step
+        must be solved together. Return the number of contacts."""
+        states = {}  # [vx, vy, angular velocity, inverse mass, inverse inertia, x, y, ax, ay]
+        manifolds = []
+        cache = {}
+        for (e1, e2) in pairs:
+            manifold = self.getManifold(e1, e2)
+            if not manifold:
+                continue
+            key = self.getKey(e1, e2)
+            if self.warm:
+                self.warmStart(key, manifold, e1, e2)
+            cache[key] = manifold
+            for e in (e1, e2):
+                if id(e) not in states:
+                    vx, vy = map(float, e.velocity.components[:2])
+                    ax = ay = 0
+                    if len(e.motion.vectors) >= 3:
+                        ax, ay = (float(c) * dt for c in e.acceleration.components[:2])
+                    ii = self.getInverseInertia(e)
+                    w = float(e.motions[1].velocity.components[0]) if ii else 0
+                    x, y = map(float, e.position.components[:2])
+                    states[id(e)] = [vx + ax, vy + ay, w, self.getInverseMass(e), ii, x, y, ax, ay]
+            manifolds.append((states[id(e1)], states[id(e2)], manifold))
+        self.cache = cache
+
+        # Preparation of the contacts.
+        contacts = []
+        for (s1, s2, manifold) in manifolds:
+            im1, ii1, im2, ii2 = s1[3], s1[4], s2[3], s2[4]
+            if not im1 + im2:
+                continue
+            for c in manifold:
+                c.r1x, c.r1y = c.x - s1[5], c.y - s1[6]
+                c.r2x, c.r2y = c.x - s2[5], c.y - s2[6]
+                rn1 = c.r1x * c.ny - c.r1y * c.nx
+                rn2 = c.r2x * c.ny - c.r2y * c.nx
+                c.normal_mass = 1 / (im1 + im2 + ii1 * rn1 * rn1 + ii2 * rn2 * rn2)
+                rt1 = -c.r1x * c.nx - c.r1y * c.ny
+                rt2 = -c.r2x * c.nx - c.r2y * c.ny
+                c.tangent_mass = 1 / (im1 + im2 + ii1 * rt1 * rt1 + ii2 * rt2 * rt2)
+                # Relative normal velocity before solving, which gives the bounce.
+                dvx = s2[0] - s2[2] * c.r2y - s1[0] + s1[2] * c.r1y
+                dvy = s2[1] + s2[2] * c.r2x - s1[1] - s1[2] * c.r1x
+                vn = dvx * c.nx + dvy * c.ny
+                bounce = -self.restitution * vn if vn < -self.threshold else 0
+                c.bias = max(bounce, self.baumgarte / dt * max(c.depth - self.slop, 0))
+                contacts.append((s1, s2, c))
+        # The impulses of the previous solve are applied once all the bounces
+        # are known, since they are given by the velocities before any impulse.
+        for (s1, s2, c) in contacts:
+            if c.pn or c.pt:
+                self.applyImpulse(s1, s2, c, c.pn * c.nx - c.pt * c.ny, c.pn * c.ny + c.pt * c.nx)
+
+        self.residuals = []
+        friction = self.friction
+        for iteration in range(self.iterations):
+            residual = 0
+            for (s1, s2, c) in contacts:
+                nx, ny = c.nx, c.ny
+                r1x, r1y, r2x, r2y = c.r1x, c.r1y, c.r2x, c.r2y
+                im1, ii1, im2, ii2 = s1[3], s1[4], s2[3], s2[4]
+                # Normal impulse
+                dvx = s2[0] - s2[2] * r2y - s1[0] + s1[2] * r1y
+                dvy = s2[1] + s2[2] * r2x - s1[1] - s1[2] * r1x
+                dpn = c.normal_mass * (c.bias - dvx * nx - dvy * ny)
+                pn = c.pn + dpn
+                if pn < 0:
+                    pn = 0
+                dpn, c.pn = pn - c.pn, pn
+                px, py = dpn * nx, dpn * ny
+                s1[0] -= im1 * px
+                s1[1] -= im1 * py
+                s2[0] += im2 * px
+                s2[1] += im2 * py
+                if ii1 or ii2:
+                    s1[2] -= ii1 * (r1x * py - r1y * px)
+                    s2[2] += ii2 * (r2x * py - r2y * px)
+                if dpn > residual or -dpn > residual:
+                    residual = abs(dpn)
+                # Tangent impulse, limited by the cone of friction
+                dvx = s2[0] - s2[2] * r2y - s1[0] + s1[2] * r1y
+                dvy = s2[1] + s2[2] * r2x - s1[1] - s1[2] * r1x
+                limit = friction * pn
+                pt = c.pt - c.tangent_mass * (dvy * nx - dvx * ny)
+                pt = -limit if pt < -limit else limit if pt > limit else pt
+                dpt, c.pt = pt - c.pt, pt
+                px, py = -dpt * ny, dpt * nx
+                s1[0] -= im1 * px
+                s1[1] -= im1 * py
+                s2[0] += im2 * px
+                s2[1] += im2 * py
+                if ii1 or ii2:
+                    s1[2] -= ii1 * (r1x * py - r1y * px)
+                    s2[2] += ii2 * (r2x * py - r2y * px)
+            self.residuals.append(residual)
+
+        for (e1, e2) in pairs:
+            for e in (e1, e2):
+                state = states.pop(id(e), None)
+                if state is not None:
+                    e.velocity.components[0] = state[0] - state[7]
+                    e.velocity.components[1] = state[1] - state[8]
+                    if state[4]:
+                        e.motions[1].velocity.components[0] = state[2]
+        return len(contacts)
+
+    @staticmethod
+    def applyImpulse(s1, s2, c, px, py):
+        """Apply the impulse on the second state and its opposite on the first one."""
+        s1[0] -= s1[3] * px
+        s1[1] -= s1[3] * py
+        s1[2] -= s1[4] * (c.r1x * py - c.r1y * px)
+        s2[0] += s2[3] * px
+        s2[1] += s2[3] * py
+        s2[2] += s2[4] * (c.r2x * py - c.r2y * px)
+
+
+if __name__ == "__main__":
+    from .abstract import Vector
+    from .collider import Collider
+    from .entity import Entity
+    from .entitygroup import EntityGroup
+    from .motion import Motion
+    import random
+    import time
+
+    width, radius = 60, 0.5
+
+    def pile(n=1000):
+        """Return a group of n circles dropped in rows into the box."""
+        random.seed(0)
+        columns = int(width / (2.2 * radius))
+        entities = []
+        for i in range(n):
+            x = -width / 2 + (i % columns + 0.5) * 2.2 * radius + random.uniform(-0.05, 0.05)
+            y = (i // columns) * 2.2 * radius + radius
+            entity = Entity(CircleAnatomy(0, 0, radius=radius),
+                            [Motion(Vector(x, y), Vector(0, 0), Vector(0, -10))], friction=0)
+            entity.mass = math.pi * radius ** 2
+            entities.append(entity)
+        return EntityGroup(*entities)
+
+    def wall(x, y, w, h):
+        """Return a static rectangle of center (x, y) and of half sizes w and h."""
+        anatomy = FormAnatomy.createFromTuples([(-w, -h), (w, -h), (w, h), (-w, h)])
+        entity = Entity(anatomy, [Motion(Vector(x, y), Vector(0, 0), Vector(0, 0))])
+        entity.mass = math.inf
+        return entity
+
+    floor, left, right = wall(0, -1, width / 2 + 2, 1), wall(-width / 2 - 1, 20, 1, 20), wall(width / 2 + 1, 20, 1, 20)
+
+    def wallPairs(group):
+        """Return the pairs of the circles and the walls they touch."""
+        pairs = []
+        for e in group:
+            if e.y < radius:
+                pairs.append((e, floor))
+            if e.x < -width / 2 + radius:
+                pairs.append((e, left))
+            if e.x > width / 2 - radius:
+                pairs.append((e, right))
+        return pairs
+
+    def measure(group, collider):
+        """Return the mean speed of the next step and the mean and largest
+        overlaps of the pile."""
+        speeds = [math.hypot(e.vx + e.ax * dt, e.vy + e.ay * dt) for e in group]
+        depths = [c.depth for (e1, e2) in collider.getSoloPairs(group)
+                  for c in ContactSolver().getManifold(e1, e2)] or [0]
+        return (sum(speeds) / len(speeds), sum(depths) / len(depths), max(depths))
+
+    dt, frames = 1 / 60, 180
+    configurations = [("solver, {} iterations{}".format(i, "" if warm else ", cold"), ContactSolver(i, warm=warm))
+                       for (i, warm) in [(4, False), (4, True), (10, True), (20, True)]]
+    print("1000 circles dropped in a box during {} frames of {:.3f}s:".format(frames, dt))
+    for (name, solver) in configurations:
+        group = pile()
+        collider = Collider(elasticity=0.9, broadphase="grid", solver=solver)
+        ti = time.time()
+        for frame in range(frames):
+            tf = time.time()
+            group.update(dt)
+            pairs = collider.getCollisions(collider.getSoloPairs(group)) + wallPairs(group)
+            solver.solve(pairs, dt)
+            if time.time() - tf > 2:
+                # The pile collapsed, its bodies overlap so much that every
+                # frame tests more pairs.
+                break
+        duration = (time.time() - ti) / (frame + 1)
+        speed, mean, largest = measure(group, collider)
+        line = "{}: {:.3f}s per frame, mean speed {:.3f}, overlap mean {:.4f} max {:.3f}".format(
+            name, duration, speed, mean, largest)
+        line += ", residual {:.2e} -> {:.2e}".format(solver.residuals[0], solver.residuals[-1])
+        if frame + 1 < frames:
+            line += ", stopped after {} frames".format(frame + 1)
+        print(line)
@@ -398,7 +398,7 @@ class Context(Rect):
         self.console = console
         self.camera = camera
         self.clear = self.draw.clear
-        self.flip = self.draw.window.flip
+        self.flip = self.draw.flip
         self.press = self.draw.window.press
         self.build = self.draw.window.build
         self.click = self.draw.window.click
@@ -526,6 +526,21 @@ class Context(Rect):
         the window in parameter."""
         return self.draw.plane.getToScreen(position, self.draw.window)
 
+    def isVisible(self, bbox):
+        """Determine if the bounding box can be seen, the shapes which can not
+        being culled."""
+        return self.draw.isVisible(bbox)
+
+    def getArrayFromScreen(self, positions):
+        """Behave like the get array from screen of the plan without having to
+        put the window in parameter."""
+        return self.draw.plane.getArrayFromScreen(positions, self.draw.window)
+
+    def getArrayToScreen(self, positions):
+        """Behave like the get array to screen of the plan without having to
+        put the window in parameter."""
+        return self.draw.plane.getArrayToScreen(positions, self.draw.window)
+
     def blit(self, surface, position):
         """Blit a given surface to a given position."""
         size = surface.get_size()
@@ -0,0 +1,310 @@
+from .sweepandprune import SweepAndPrune
+
+import heapq
+import math
+
+
+class ContinuousCollider:
+    """Event driven continuous collision detection for material points and
+    material forms. During a step every point moves in a straight line, so the
+    instant at which a point hits a side of another form, or at which two
+    material points come within the radius of each other, is the root of a
+    quadratic equation. The predicted collisions are kept in a priority queue
+    sorted by instant: the objects are advanced to the first one, the
+    velocities of both objects are changed, and only the pairs involving these
+    two objects are predicted again. The objects can not go through each other
+    however fast they move and however large the step is."""
+
+    @staticmethod
+    def getPoints(object):
+        """Return the material points of a material form or of a material point."""
+        if hasattr(object, "points"):
+            return object.points
+        return [object]
+
+    @staticmethod
+    def getEdges(n):
+        """Return the pairs of indices of the sides of a form of n points."""
+        if n < 2:
+            return []
+        if n == 2:
+            return [(0, 1)]
+        return [(i, (i + 1) % n) for i in range(n)]
+
+    @staticmethod
+    def getDerivatives(point, dt=1):
+        """Return the lists of the components of the vectors of the motion of
+        a material point after its update, except its position which stays
+        the same. The velocity is updated first like in the update of the
+        motion, so that without collisions the point ends where the update
+        would have put it."""
+        vectors = [list(vector.components) for vector in point.motion.vectors]
+        for i in range(1, len(vectors) - 1):
+            vectors[-i - 1] = [c + d * dt for (c, d) in zip(vectors[-i - 1], vectors[-i])]
+        if len(vectors) < 2:
+            vectors.append([0, 0])
+        return vectors
+
+    @staticmethod
+    def solve(a, b, c):
+        """Return the sorted real roots of a*t**2+b*t+c, using the formula that
+        does not lose precision when a is small."""
+        if a == 0:
+            if b == 0:
+                return []
+            return [-c / b]
+        d = b * b - 4 * a * c
+        if d < 0:
+            return []
+        q = -(b + math.copysign(math.sqrt(d), b)) / 2
+        if q == 0:
+            return [0]
+        return sorted((q / a, c / q))
+
+    @staticmethod
+    def pointPointInstant(p, vp, q, vq, r, e=1e-9):
+        """Return the first instant greater than 'e' at which the moving points
+        are at the distance 'r' and getting closer, or None."""
+        dx, dy = p[0] - q[0], p[1] - q[1]
+        wx, wy = vp[0] - vq[0], vp[1] - vq[1]
+        a = wx * wx + wy * wy
+        b = 2 * (dx * wx + dy * wy)
+        if a == 0 or b >= 0:
+            return None
+        for t in ContinuousCollider.solve(a, b, dx * dx + dy * dy - r * r):
+            if t > e:
+                return t
+        return None
+
+    @staticmethod
+    def pointSegmentInstant(p, vp, a, va, b, vb, e=1e-9):
+        """Return the first instant greater than 'e' at which the moving point
+        is on the moving segment [a, b], along with the position of the point
+        on the segment between 0 and 1, or None. The point is on the line of
+        the segment when the cross product of the segment and of the vector
+        from its first end to the point, which is quadratic in time, is null."""
+        ex, ey = b[0] - a[0], b[1] - a[1]
+        evx, evy = vb[0] - va[0], vb[1] - va[1]
+        fx, fy = p[0] - a[0], p[1] - a[1]
+        fvx, fvy = vp[0] - va[0], vp[1] - va[1]
+        roots = ContinuousCollider.solve(evx * fvy - evy * fvx,
+                                         ex * fvy - ey * fvx + evx * fy - evy * fx,
+                                         ex * fy - ey * fx)
+        for t in roots:
+            if t <= e:
+                continue
+            sx, sy = ex + evx * t, ey + evy * t
+            l = sx * sx + sy * sy
+            if l == 0:
+                continue
+            s = ((fx + fvx * t) * sx + (fy + fvy * t) * sy) / l
+            if -e <= s <= 1 + e:
+                return (t, min(max(s, 0), 1))
+        return None
+
+    def __init__(self, elasticity=1, radius=0, e=1e-9, limit=1000):
+        """Create a continuous collider using the elasticity of the collisions,
+        the radius of the material points, a precision 'e' and the maximum
+        number of collisions in a single step."""
+        self.elasticity = elasticity
+        self.radius = radius
+        self.e = e
+        self.limit = limit
+        self.sweep = SweepAndPrune()
+        self.predictions = 0
+        self.collisions = 0
+
+    def reset(self):
+        """Return the numbers of predictions and collisions and set them to zero."""
+        counts = (self.predictions, self.collisions)
+        self.predictions = self.collisions = 0
+        return counts
+
+    def getStates(self, objects, dt=1):
+        """Return the positions and velocities of the points of the objects
+        during the step."""
+        positions, velocities = [], []
+        for object in objects:
+            derivatives = [ContinuousCollider.getDerivatives(point, dt)
+                           for point in ContinuousCollider.getPoints(object)]
+            positions.append([vectors[0][:2] for vectors in derivatives])
+            velocities.append([vectors[1][:2] for vectors in derivatives])
+        return (positions, velocities)
+
+    def getBox(self, positions, velocities, t):
+        """Return the bounding box of the points moving during the time 't'."""
+        xs = [p[0] for p in positions] + [p[0] + v[0] * t for (p, v) in zip(positions, velocities)]
+        ys = [p[1] for p in positions] + [p[1] + v[1] * t for (p, v) in zip(positions, velocities)]
+        r = self.radius
+        return (min(xs) - r, min(ys) - r, max(xs) + r, max(ys) + r)
+
+    def predict(self, positions, velocities, k, l, h):
+        """Return the first collision of the objects of indices 'k' and 'l'
+        within the time 'h' as a tuple (instant, vertex owner, vertex index,
+        edge owner, edge indices, position on the edge), or None."""
+        self.predictions += 1
+        e = self.e
+        best = None
+        pk, vk, pl, vl = positions[k], velocities[k], positions[l], velocities[l]
+        if len(pk) == 1 and len(pl) == 1:
+            t = ContinuousCollider.pointPointInstant(pk[0], vk[0], pl[0], vl[0], 2 * self.radius, e)
+            if t is not None and t <= h:
+                best = (t, k, 0, l, (0,), 0)
+            return best
+        for (m, n, pm, vm, pn, vn) in [(k, l, pk, vk, pl, vl), (l, k, pl, vl, pk, vk)]:
+            for (i, j) in ContinuousCollider.getEdges(len(pn)):
+                for v in range(len(pm)):
+                    result = ContinuousCollider.pointSegmentInstant(pm[v], vm[v], pn[i], vn[i], pn[j], vn[j], e)
+                    if result is not None and result[0] <= h and (best is None or result[0] < best[0]):
+                        best = (result[0], m, v, n, (i, j), result[1])
+        return best
+
+    def move(self, positions, velocities, times, k, t):
+        """Move the points of the object of index 'k' to the instant 't'."""
+        h = t - times[k]
+        for (p, v) in zip(positions[k], velocities[k]):
+            p[0] += v[0] * h
+            p[1] += v[1] * h
+        times[k] = t
+
+    def resolve(self, positions, velocities, masses, m, v, n, edge, s):
+        """Change the velocities of both objects with an impulse along the
+        normal of the contact, if the point is getting closer to the edge."""
+        p, vp = positions[m][v], velocities[m][v]
+        if len(edge) == 1:
+            q, vq = positions[n][edge[0]], velocities[n][edge[0]]
+            nx, ny = p[0] - q[0], p[1] - q[1]
+        else:
+            (a, b), (va, vb) = [positions[n][i] for i in edge], [velocities[n][i] for i in edge]
+            nx, ny = a[1] - b[1], b[0] - a[0]
+            vq = [(1 - s) * va[0] + s * vb[0], (1 - s) * va[1] + s * vb[1]]
+        norm = math.hypot(nx, ny)
+        if norm == 0:
+            return False
+        nx, ny = nx / norm, ny / norm
+        vn = (vp[0] - vq[0]) * nx + (vp[1] - vq[1]) * ny
+        if len(edge) > 1 and vn > 0:
+            # The normal of a side is oriented against the point.
+            nx, ny, vn = -nx, -ny, -vn
+        if vn >= 0:
+            return False
+        j = -(1 + self.elasticity) * vn / (1 / masses[m] + 1 / masses[n])
+        for (o, sign) in [(m, 1), (n, -1)]:
+            dvx, dvy = sign * j / masses[o] * nx, sign * j / masses[o] * ny
+            for velocity in velocities[o]:
+                velocity[0] += dvx
+                velocity[1] += dvy
+        return True
+
+    def getCollisionInstant(self, objects, dt=1):
+        """Return the instant of the first collision between the objects within
+        the time 'dt', or 'dt' if there are none."""
+        positions, velocities = self.getStates(objects, dt)
+        boxes = {k: self.getBox(positions[k], velocities[k], dt) for k in range(len(objects))}
+        instants = [self.predict(positions, velocities, k, l, dt) for (k, l) in self.sweep.pairs(boxes)]
+        return min([event[0] for event in instants if event is not None] + [dt])
+
+    def advance(self, objects, dt=1):
+        """Update the objects during the time 'dt' by jumping from a collision
+        to the next one, and return the list of the collisions as tuples
+        (instant, index of the first object, index of the second object)."""
+        positions, velocities = self.getStates(objects, dt)
+        masses = [sum(getattr(point, "mass", 1) for point in ContinuousCollider.getPoints(object))
+                  for object in objects]
+        times = [0] * len(objects)
+        versions = [0] * len(objects)
+        boxes = {k: self.getBox(positions[k], velocities[k], dt) for k in range(len(objects))}
+        events = []
+        counter = 0
+
+        def schedule(k, l, now):
+            nonlocal counter
+            self.move(positions, velocities, times, k, now)
+            self.move(positions, velocities, times, l, now)
+            event = self.predict(positions, velocities, k, l, dt - now)
+            if event is not None:
+                counter += 1
+                heapq.heappush(events, (now + event[0], counter, k, l, versions[k], versions[l], event[1:]))
+
+        for (k, l) in self.sweep.pairs(boxes):
+            schedule(k, l, 0)
+        collisions = []
+        while events and len(collisions) < self.limit:
+            (t, c, k, l, vk, vl, contact) = heapq.heappop(events)
+            if vk != versions[k] or vl != versions[l]:
+                # One of the objects collided since this event was predicted.
+                continue
+            self.move(positions, velocities, times, k, t)
+            self.move(positions, velocities, times, l, t)
+            if not self.resolve(positions, velocities, masses, *contact):
+                continue
+            collisions.append((t, k, l))
+            for o in (k, l):
+                versions[o] += 1
+                boxes[o] = self.getBox(positions[o], velocities[o], dt - t)
+            # Only the pairs involving one of the two objects are predicted again.
+            for o in (k, l):
+                xmin1, ymin1, xmax1, ymax1 = boxes[o]
+                for other in range(len(objects)):
+                    if other == o or (o == l and other == k):
+                        continue
+                    # The box of the other object still covers the rest of its motion.
+                    xmin2, ymin2, xmax2, ymax2 = boxes[other]
+                    if xmin2 > xmax1 or xmin1 > xmax2 or ymin2 > ymax1 or ymin1 > ymax2:
+                        continue
+                    schedule(o, other, t)
+        self.collisions += len(collisions)
+        for (k, object) in enumerate(objects):
+            self.move(positions, velocities, times, k, dt)
+            for (point, p, v) in zip(ContinuousCollider.getPoints(object), positions[k], velocities[k]):
+                vectors = point.motion.vectors
+                derivatives = ContinuousCollider.getDerivatives(point, dt)
+                derivatives[0][:2] = p
+                derivatives[1][:2] = v
+                for (vector, components) in zip(vectors, derivatives):
+                    vector.components = components
+            if hasattr(object, "touch"):
+                object.touch()
+        return collisions
+
+
+if __name__ == "__main__":
+    from .materialpoint import MaterialPoint
+    from .materialform import MaterialForm
+    from .motion import Motion
+    from .abstract import Vector
+    import random
+    import time
+
+    def point(x, y, vx=0, vy=0):
+        """Return a material point with a constant velocity."""
+        return MaterialPoint(Motion(Vector(x, y), Vector(vx, vy), Vector(0, 0)))
+
+    # A fast point does not go through a thin wall even with a large step.
+    wall = MaterialForm([point(5, -1), point(5.01, -1), point(5.01, 1), point(5, 1)])
+    bullet = point(0, 0, 100, 0)
+    ContinuousCollider().advance([bullet, wall], 1)
+    print("bullet after the step:", bullet, "wall after the step:", wall)
+
+    for n in [100, 300, 1000]:
+        radius = 0.5
+        side = math.sqrt(n) * 4 * radius
+        positions = []
+        while len(positions) < n:
+            x, y = random.uniform(0, side), random.uniform(0, side)
+            if all(math.hypot(x - p[0], y - p[1]) > 2 * radius for p in positions):
+                positions.append((x, y))
+        points = [point(x, y, random.uniform(-5, 5), random.uniform(-5, 5)) for (x, y) in positions]
+        collider = ContinuousCollider(radius=radius)
+        frames = 10
+        ti = time.time()
+        for frame in range(frames):
+            collider.advance(points, 0.5)
+        dt = time.time() - ti
+        positions = [p.motion.position.components for p in points]
+        overlaps = sum(1 for i in range(n) for j in range(i + 1, n)
+                       if math.hypot(positions[i][0] - positions[j][0], positions[i][1] - positions[j][1])
+                       < 2 * radius - 1e-6)
+        predictions, collisions = collider.reset()
+        print("n={}: {:.4f}s per frame, {} collisions, {} predictions, {} overlaps".format(
+            n, dt / frames, collisions, predictions, overlaps))
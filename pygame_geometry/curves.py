@@ -1,4 +1,4 @@
-from .abstract import Point,Segment,Form,Line
+from .abstract import Point,Segment,Form,Line,BoundingBox
 from . import colors
 
 import random
@@ -67,6 +67,10 @@ class Trajectory:
         """Return the length of the trajectory."""
         return sum([segment.length for segment in self.segments])
 
+    def getBBox(self):
+        """Return the bounding box (xmin, ymin, xmax, ymax) of the trajectory."""
+        return BoundingBox.createFromPositions(self.points)
+
     def sample(self,n,include=True):
         """Sample n points of the trajectory at equal distance.
         It is also possible to include the last one if wanted."""
@@ -113,6 +117,7 @@ class Trajectory:
 
     segments=property(getSegments)
     length=property(getLength)
+    bbox=property(getBBox)
     center=property(getCenter)
 
 class BezierCurve:
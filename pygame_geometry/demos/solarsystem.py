@@ -1,13 +1,15 @@
-from myabstract import Circle, Vector, Point
-from mymotion import Motion
-from mymaterial import Material
-from myforce import Force
-from mymanager import Manager
+from pygame_geometry.abstract import Circle, Vector, Point
+from pygame_geometry.motion import Motion
+from pygame_geometry.material import Material
+from pygame_geometry.force import Force
+from pygame_geometry.manager import Manager
+from pygame_geometry.gravity import BarnesHut
+from pygame_geometry import colors
 
 from pygame.locals import K_f
 # from playsound import playsound # Doesn't work on macos
 
-import mycolors
+import numpy as np
 import random
 import math
 
@@ -36,7 +38,7 @@ class System:
         """Return the force of attraction of the astre2 on the astre1."""
         norm = G * astre1.mass * astre2.mass / cls.distance(astre1, astre2)**2
         angle = (astre2.position - astre1.position).angle
-        return Force.createFromPolarCoordonnates(norm, angle) / astre1.mass
+        return Force.createFromPolar(norm, angle) / astre1.mass
 
     def random(n=10):
         """Create a random system."""
@@ -44,9 +46,11 @@ class System:
             [Astre.random() for i in range(n)]
         return System(astres)
 
-    def __init__(self, astres):
-        """Create the astes."""
+    def __init__(self, astres, theta=0.5):
+        """Create the astes, which attract each other with a Barnes Hut engine
+        of opening angle 'theta'."""
         self.astres = astres
+        self.gravity = BarnesHut(theta, constant=G)
 
     def show(self, context):
         """Show all the astres."""
@@ -68,9 +72,12 @@ class System:
             astre.update(dt)
 
     def updateAstresMotions(self):
-        """Update the motions of the astres."""
-        for i in range(len(self.astres)):
-            self.updateAstreMotion(i)
+        """Update the motions of the astres with the accelerations of their
+        attractions, computed all together by the Barnes Hut engine."""
+        positions = np.array([list(astre.position) for astre in self.astres], dtype=float)
+        masses = np.array([astre.mass for astre in self.astres], dtype=float)
+        for (astre, acceleration) in zip(self.astres, self.gravity(positions, masses)):
+            astre.acceleration = acceleration.tolist()
 
     def updateAstreMotion(self, n):
         """Update the motion of the n-th astre."""
@@ -78,7 +85,7 @@ class System:
         for i in range(len(self.astres)):
             if i != n:
                 f += System.attraction(self.astres[n], self.astres[i])
-        self.astres[n].acceleration = Vector(*f)
+        self.astres[n].acceleration = f.components
 
 
 class Astre(Material):
@@ -98,10 +105,10 @@ class Astre(Material):
         velocity.angle = (position.angle + math.pi / 2) % (2 * math.pi)
         acceleration = Vector.null()
         motion = Motion(position, velocity, acceleration)
-        color = mycolors.random()
+        color = colors.random()
         return cls(name, radius, mass, motion, color)
 
-    def __init__(self, name="Unnamed", radius=1, mass=1, motion=Motion(), color=mycolors.WHITE):
+    def __init__(self, name="Unnamed", radius=1, mass=1, motion=Motion.null(), color=colors.WHITE):
         """"Create an astre using its name, radius, mass, motion and colors."""
         self.name = name
         self.mass = mass
@@ -159,10 +166,10 @@ class Planet(Astre):
         """Find the motion of a planet with its distance and its mass."""
         angle = random.uniform(0, 2 * math.pi)
         norm = self.distance
-        position = Vector.createFromPolarCoordonnates(norm, angle)
+        position = Vector.createFromPolar(norm, angle)
         angle = (angle + math.pi / 2) % (2 * math.pi)
         norm = self.speed  # in m/s-1
-        velocity = Vector.createFromPolarCoordonnates(norm, angle)
+        velocity = Vector.createFromPolar(norm, angle)
         acceleration = Vector.null()
         return Motion(position, velocity, acceleration)
 
@@ -179,8 +186,8 @@ class Sun(Star):
         self.name = "Sun"
         self.mass = 1.989 * 1e30 * um
         self.radius = 695510 * 1e3 * ud
-        self.motion = Motion()
-        self.color = mycolors.YELLOW
+        self.motion = Motion.null()
+        self.color = colors.YELLOW
 
 
 class Mercury(Planet):
@@ -192,7 +199,7 @@ class Mercury(Planet):
         self.distance = 57.91 * 1e9 * ud
         self.speed = 175936 * 1e3 / 3600 * ud
         self.motion = self.computeMotion()
-        self.color = mycolors.GREY
+        self.color = colors.GREY
 
 
 class Venus(Planet):
@@ -204,7 +211,7 @@ class Venus(Planet):
         self.distance = 108.2 * 1e9 * ud
         self.speed = 126062 * 1e3 / 3600 * ud
         self.motion = self.computeMotion()
-        self.color = mycolors.mix(mycolors.YELLOW, mycolors.LIGHTGREY)
+        self.color = colors.mix(colors.YELLOW, colors.LIGHTGREY)
 
 
 class Earth(Planet):
@@ -216,7 +223,7 @@ class Earth(Planet):
         self.distance = 149.6 * 1e9 * ud
         self.speed = 107243 * 1e3 / 3600 * ud
         self.motion = self.computeMotion()
-        self.color = mycolors.GREEN
+        self.color = colors.GREEN
 
 
 class Mars(Planet):
@@ -228,7 +235,7 @@ class Mars(Planet):
         self.distance = 227.9 * 1e9 * ud
         self.speed = 87226 * 1e3 / 3600 * ud
         self.motion = self.computeMotion()
-        self.color = mycolors.RED
+        self.color = colors.RED
 
 
 class Jupiter(Planet):
@@ -240,7 +247,7 @@ class Jupiter(Planet):
         self.distance = 778.5 * 1e9 * ud
         self.speed = 47196 * 1e3 / 3600 * ud
         self.motion = self.computeMotion()
-        self.color = mycolors.ORANGE
+        self.color = colors.ORANGE
 
 
 class Saturn(Planet):
@@ -252,7 +259,7 @@ class Saturn(Planet):
         self.distance = 1.434 * 1e12 * ud
         self.speed = 34962 * 1e3 / 3600 * ud
         self.motion = self.computeMotion()
-        self.color = mycolors.mix(mycolors.YELLOW, mycolors.BROWN)
+        self.color = colors.mix(colors.YELLOW, colors.BROWN)
 
 
 class Uranus(Planet):
@@ -264,7 +271,7 @@ class Uranus(Planet):
         self.distance = 2.871 * 1e12 * ud
         self.speed = 24459 * 1e3 / 3600 * ud
         self.motion = self.computeMotion()
-        self.color = mycolors.lighten(mycolors.BLUE, 1)
+        self.color = colors.lighten(colors.BLUE, 1)
 
 
 class Neptune(Planet):
@@ -276,7 +283,7 @@ class Neptune(Planet):
         self.distance = 4.495 * 1e12 * ud
         self.speed = 19566 * 1e3 / 3600 * ud
         self.motion = self.computeMotion()
-        self.color = mycolors.BLUE
+        self.color = colors.BLUE
 
 
 class SystemManager(Manager):
@@ -3,6 +3,8 @@ from .window import Window
 from . import colors
 
 from math import sqrt
+import numpy as np
+import pygame
 
 """
 Structure:
@@ -21,6 +23,19 @@ Draw:
 -draw.line(color,start_position,end_position,width)
 -draw.lines(color,connected,positions,width)
 
+The positions, start and end positions of circles, lines and polygons can also
+be (n,2) arrays which are converted to the screen at once.
+
+In batching mode the circles and lines are not drawn when they are called but
+collected by style until the frame is flipped (or flushed), converted at once
+and drawn in bulk above what was drawn directly: the lines which follow each
+other as polylines and the circles of a pixel by writing into the pixels of
+the screen.
+
+The shapes which bounding box is out of the visible rectangle of the plane
+(with a margin of a few pixels) are culled and counted, and the lines are
+clipped to it.
+
 
 Client:
 -map.draw.rect(color,position,fill)
@@ -29,17 +44,177 @@ Client:
 
 
 class Draw:
-    def __init__(self, plane=Plane(), window=None, **kwargs):
-        if window:
-            self.window = window
-        else:
+    def __init__(self, plane=Plane(), window=None, batching=False, culling=True, margin=2, **kwargs):
+        if window is None:
             window = Window(**kwargs)
         self.plane = plane
         self.window = window
         self.window.text_size = 30
+        self.batching = batching
+        self.batches = {}  # style -> primitives waiting for the flush
+        self.draw_calls = 0  # calls to pygame during the current frame
+        self.primitives = 0  # primitives drawn during the current frame
+        self.culling = culling
+        self.margin = margin  # pixels around the screen in which shapes are not culled
+        self.corners = None  # visible rectangle of the plane
+        self.corners_key = None
+        self.culled = 0  # shapes culled during the current frame
+        self.counters = (0, 0, 0)  # draw calls, primitives and culled shapes of the last frame
+        self.clear_key = None  # view of the plane at the last clear
+
+    def record(self, draw_calls, primitives):
+        """Count the draw calls and the primitives of the frame."""
+        self.draw_calls += draw_calls
+        self.primitives += primitives
+
+    def getCorners(self):
+        """Return the rectangle (xmin, ymin, xmax, ymax) of the plane which is
+        visible, with the margin, computed again only when the view changed."""
+        self.plane.getView(self.window)
+        if self.corners_key != self.plane.view_key:
+            self.corners_key = self.plane.view_key
+            xmin, ymin, xmax, ymax = self.plane.getCorners(self.window)
+            ux, uy = self.plane.units
+            mx, my = self.margin / ux, self.margin / uy
+            self.corners = (xmin - mx, ymin - my, xmax + mx, ymax + my)
+        return self.corners
+
+    def isVisible(self, bbox):
+        """Determine if the bounding box (xmin, ymin, xmax, ymax) intersects
+        the visible rectangle, counting the shapes culled."""
+        if not self.culling:
+            return True
+        xmin, ymin, xmax, ymax = self.getCorners()
+        if bbox[2] < xmin or bbox[0] > xmax or bbox[3] < ymin or bbox[1] > ymax:
+            self.culled += 1
+            return False
+        return True
+
+    def clip(self, start_position, end_position):
+        """Return the part of the line which is in the visible rectangle, or
+        None, using the algorithm of Liang-Barsky."""
+        xmin, ymin, xmax, ymax = self.getCorners()
+        x1, y1 = start_position
+        x2, y2 = end_position
+        dx, dy = x2 - x1, y2 - y1
+        t0, t1 = 0, 1
+        for (p, q) in ((-dx, x1 - xmin), (dx, xmax - x1), (-dy, y1 - ymin), (dy, ymax - y1)):
+            if p == 0:
+                if q < 0:
+                    return None
+            elif p < 0:
+                t0 = max(t0, q / p)
+            else:
+                t1 = min(t1, q / p)
+        if t0 > t1:
+            return None
+        return ([x1 + t0 * dx, y1 + t0 * dy], [x1 + t1 * dx, y1 + t1 * dy])
+
+    def clipArrays(self, start_positions, end_positions):
+        """Return the parts of the lines of the (n,2) arrays of start and end
+        positions which are in the visible rectangle, without the lines which
+        are not."""
+        xmin, ymin, xmax, ymax = self.getCorners()
+        d = end_positions - start_positions
+        t0 = np.zeros(len(d))
+        t1 = np.ones(len(d))
+        keep = np.ones(len(d), dtype=bool)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for (p, q) in ((-d[:, 0], start_positions[:, 0] - xmin), (d[:, 0], xmax - start_positions[:, 0]),
+                           (-d[:, 1], start_positions[:, 1] - ymin), (d[:, 1], ymax - start_positions[:, 1])):
+                t = q / p
+                keep &= (p != 0) | (q >= 0)
+                t0 = np.where(p < 0, np.maximum(t0, t), t0)
+                t1 = np.where(p > 0, np.minimum(t1, t), t1)
+        keep &= t0 <= t1
+        self.culled += int(len(d) - keep.sum())
+        start_positions, d, t0, t1 = start_positions[keep], d[keep], t0[keep, np.newaxis], t1[keep, np.newaxis]
+        return (start_positions + t0 * d, start_positions + t1 * d)
+
+    def mark(self, screen, rect):
+        """Record the rectangle drawn if the screen is the one of the window."""
+        if screen is self.window.screen:
+            self.window.mark(rect)
+
+    def getBatch(self, style):
+        """Return the lists of the primitives of the style, the positions and
+        their second values (end positions or radiuses)."""
+        batch = self.batches.get(style)
+        if batch is None:
+            batch = self.batches[style] = ([], [])
+        return batch
+
+    def flush(self):
+        """Draw the primitives collected by style and forget them."""
+        batches, self.batches = self.batches, {}
+        for ((kind, screen, color, value, conversion), (positions, values)) in batches.items():
+            if kind == "line":
+                positions = np.concatenate([np.asarray(positions, dtype=float).reshape(-1, 2),
+                                            np.asarray(values, dtype=float).reshape(-1, 2)])
+                if conversion:
+                    positions = self.plane.getArrayToScreen(positions, self.window)
+                self.flushLines(screen, color, positions.astype(np.int64), value)
+            else:
+                self.flushCircles(screen, color, positions, values, value, conversion)
+
+    def flushLines(self, screen, color, positions, width):
+        """Draw the lines of the (2n,2) array of their start positions followed
+        by their end positions, one polyline for each run of lines that begin
+        where the previous one ends."""
+        n = len(positions) // 2
+        starts, ends = positions[:n], positions[n:]
+        breaks = np.flatnonzero((starts[1:] != ends[:-1]).any(axis=1)) + 1
+        bounds = [0] + breaks.tolist() + [n]
+        for (a, b) in zip(bounds[:-1], bounds[1:]):
+            polyline = np.concatenate([starts[a:a + 1], ends[a:b]]).tolist()
+            self.mark(screen, self.window.draw.lines(screen, color, False, polyline, width))
+        self.record(len(bounds) - 1, n)
+
+    def flushCircles(self, screen, color, positions, radiuses, fill, conversion):
+        """Draw the circles of the positions and radiuses, writing the ones of
+        a pixel directly into the pixels of the screen."""
+        positions = self.plane.getArrayToScreen(positions, self.window)
+        radiuses = np.asarray(radiuses, dtype=float)
+        if conversion:
+            ux, uy = self.plane.units
+            radiuses = radiuses * ((ux + uy) / 2)
+        radiuses = np.maximum(radiuses.astype(np.int64), 1)
+        small = radiuses == 1
+        if small.any():
+            try:
+                pixels = pygame.surfarray.pixels2d(screen)
+            except (ValueError, pygame.error):
+                small[:] = False
+            else:
+                # A circle of radius 1 covers the 2x2 pixels up and left of its center.
+                blocks = (positions[small, np.newaxis] - [[[0, 0], [1, 0], [0, 1], [1, 1]]]).reshape(-1, 2)
+                w, h = pixels.shape
+                blocks = blocks[(blocks[:, 0] >= 0) & (blocks[:, 0] < w) & (blocks[:, 1] >= 0) & (blocks[:, 1] < h)]
+                pixels[blocks[:, 0], blocks[:, 1]] = screen.map_rgb(color)
+                del pixels
+                if len(blocks):
+                    (xmin, ymin), (xmax, ymax) = blocks.min(axis=0), blocks.max(axis=0)
+                    self.mark(screen, pygame.Rect(int(xmin), int(ymin), int(xmax - xmin) + 1, int(ymax - ymin) + 1))
+                self.record(1, int(small.sum()))
+        for (position, radius) in zip(positions[~small].tolist(), radiuses[~small].tolist()):
+            self.mark(screen, self.window.draw.circle(screen, color, position, radius, not (fill)))
+        self.record(int((~small).sum()), int((~small).sum()))
+
+    def flip(self):
+        """Draw the primitives collected, flip the window and start counting
+        the next frame."""
+        self.flush()
+        self.window.flip()
+        self.counters = (self.draw_calls, self.primitives, self.culled)
+        self.draw_calls = 0
+        self.primitives = 0
+        self.culled = 0
 
     def rect(self, screen, color, rect, fill=False, conversion=True):
         if conversion:
+            x, y, sx, sy = rect
+            if not self.isVisible((x, y - sy, x + sx, y)):
+                return
             position = rect[:2]
             size = rect[2:]
             sx, sy = size
@@ -47,7 +222,8 @@ class Draw:
             ux, uy = self.plane.units
             size = [sx * ux + 1, sy * uy + 1]
             rect = position + size
-        self.window.draw.rect(screen, color, rect, not (fill))
+        self.mark(screen, self.window.draw.rect(screen, color, rect, not (fill)))
+        self.record(1, 1)
 
     def ellipse(self, screen, color, rect, fill=False):
         coordonnates = Plane.getCoordonnatesFromRect(rect)
@@ -56,7 +232,7 @@ class Draw:
         psx, psy = self.plane.getToScreen((sx, sy), self.window)
         pmx, pmy, pMx, pMy = Plane.getRectFromCoordonnates([px, py, psx, psy])
         rect = [pmx, pmy, pMx, pMy]
-        self.window.draw.ellipse(screen, color, rect, fill)
+        self.mark(screen, self.window.draw.ellipse(screen, color, rect, fill))
 
     def circle(self, screen, color, position, radius, fill=False, conversion=True):
         # self.ellipse(screen,color,position+[radius,radius],fill)
@@ -67,6 +243,19 @@ class Draw:
         # Need to implement ellipses
         # r=int(radius/self.plane.units[0])
         # r,ry=self.plane.getToScreen([radius,radius],self.window)
+        if np.ndim(position) == 2:
+            return self.circles(screen, color, position, radius, fill, conversion)
+        if self.culling:
+            x, y = position
+            r = radius if conversion else radius / min(self.plane.units)
+            if not self.isVisible((x - r, y - r, x + r, y + r)):
+                return
+        if self.batching:
+            x, y = position
+            positions, radiuses = self.getBatch(("circle", screen, tuple(color), bool(fill), conversion))
+            positions.append((x, y))
+            radiuses.append(radius)
+            return
         position = self.plane.getToScreen(position, self.window)
         x, y = position
         if conversion:
@@ -74,33 +263,105 @@ class Draw:
             radius = int((rx + ry) / 2)
         if radius < 1: radius = 1
         # r=0.1
-        self.window.draw.circle(screen, color, position, radius, not (fill))
+        self.mark(screen, self.window.draw.circle(screen, color, position, radius, not (fill)))
+        self.record(1, 1)
+
+    def circles(self, screen, color, positions, radius, fill=False, conversion=True):
+        """Draw circles of the same color at the (n,2) array of positions with
+        a radius or an array of radiuses, converting them at once."""
+        positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+        radiuses = np.broadcast_to(np.asarray(radius, dtype=float), (len(positions),))
+        if self.culling:
+            xmin, ymin, xmax, ymax = self.getCorners()
+            r = radiuses if conversion else radiuses / min(self.plane.units)
+            x, y = positions[:, 0], positions[:, 1]
+            visible = (x + r >= xmin) & (x - r <= xmax) & (y + r >= ymin) & (y - r <= ymax)
+            self.culled += int(len(positions) - visible.sum())
+            positions, radiuses = positions[visible], radiuses[visible]
+        if self.batching:
+            batch = self.getBatch(("circle", screen, tuple(color), bool(fill), conversion))
+            batch[0].extend(positions.tolist())
+            batch[1].extend(radiuses.tolist())
+            return
+        positions = self.plane.getArrayToScreen(positions, self.window).tolist()
+        if conversion:
+            ux, uy = self.plane.units
+            radiuses = radiuses * ((ux + uy) / 2)
+        radiuses = np.maximum(radiuses.astype(np.int64), 1).tolist()
+        for (position, radius) in zip(positions, radiuses):
+            self.mark(screen, self.window.draw.circle(screen, color, position, radius, not (fill)))
+        self.record(len(positions), len(positions))
 
     def square(self, screen, color, position, side_size, fill=False):
         position = self.plane.getToScreen(position, self.window)
         size = self.plane.getToScreen([side_size, side_size], self.window)
-        self.window.draw.rect(screen, color, position + size, not fill)
+        self.mark(screen, self.window.draw.rect(screen, color, position + size, not fill))
 
     def polygon(self, screen, color, positions, fill=False):  # No clue of what i'm doing to do here.
+        positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+        if self.culling and len(positions) and not self.isVisible(positions.min(axis=0).tolist() + positions.max(axis=0).tolist()):
+            return
         screen_positions = self.plane.getAllToScreen(positions, self.window)
-        self.window.draw.polygon(screen, color, screen_positions, fill)
+        self.mark(screen, self.window.draw.polygon(screen, color, screen_positions, fill))
+        self.record(1, 1)
 
     def line(self, screen, color, start_position, end_position, width=1, conversion=True):
+        if np.ndim(start_position) == 2:
+            return self.segments(screen, color, start_position, end_position, width, conversion)
+        if conversion and self.culling:
+            clipped = self.clip(start_position, end_position)
+            if clipped is None:
+                self.culled += 1
+                return
+            start_position, end_position = clipped
+        if self.batching:
+            (x1, y1), (x2, y2) = start_position, end_position
+            starts, ends = self.getBatch(("line", screen, tuple(color), width, conversion))
+            starts.append((x1, y1))
+            ends.append((x2, y2))
+            return
         if conversion:
             start_position = self.plane.getToScreen(start_position, self.window)
             end_position = self.plane.getToScreen(end_position, self.window)
-        self.window.draw.line(screen, color, start_position, end_position, width)
+        self.mark(screen, self.window.draw.line(screen, color, start_position, end_position, width))
+        self.record(1, 1)
+
+    def segments(self, screen, color, start_positions, end_positions, width=1, conversion=True):
+        """Draw the lines of the same color between the (n,2) arrays of start
+        and end positions, converting them at once."""
+        start_positions = np.asarray(start_positions, dtype=float).reshape(-1, 2)
+        end_positions = np.asarray(end_positions, dtype=float).reshape(-1, 2)
+        if conversion and self.culling:
+            start_positions, end_positions = self.clipArrays(start_positions, end_positions)
+        if self.batching:
+            batch = self.getBatch(("line", screen, tuple(color), width, conversion))
+            batch[0].extend(start_positions.tolist())
+            batch[1].extend(end_positions.tolist())
+            return
+        positions = np.concatenate([start_positions, end_positions])
+        if conversion:
+            positions = self.plane.getArrayToScreen(positions, self.window)
+        positions = positions.tolist()
+        n = len(positions) // 2
+        for (start_position, end_position) in zip(positions[:n], positions[n:]):
+            self.mark(screen, self.window.draw.line(screen, color, start_position, end_position, width))
+        self.record(n, n)
 
     def lines(self, screen, color, positions, connected=True, width=1, conversion=True):
+        if conversion and self.culling and len(positions):
+            array = np.asarray(positions, dtype=float).reshape(-1, 2)
+            if not self.isVisible(array.min(axis=0).tolist() + array.max(axis=0).tolist()):
+                return
         if conversion: positions = self.plane.getAllToScreen(positions, self.window)
-        self.window.draw.lines(screen, color, connected, positions, width)
+        self.mark(screen, self.window.draw.lines(screen, color, connected, positions, width))
+        self.record(1, len(positions))
 
     def arc(self, screen, color, rect, start_angle, stop_angle, width=1):
         position = rect[:2]
         size = rect[2:]
         position = self.plane.getToScreen(position, self.window)
         size = self.plane.getToScreen(size, self.window)
-        self.window.draw.arc(screen, color, rect, start_angle, stop_angle, width)
+        self.mark(screen, self.window.draw.arc(screen, color, rect, start_angle, stop_angle, width))
 
     def point(self, screen, color, position, radius=1, **kwargs):
         self.circle(screen, color, position, radius, **kwargs)
@@ -130,7 +391,7 @@ class Draw:
             rsx = int(sx * ux);
             rsy = int(sy * uy)
             image = self.window.scale(image, (rsx, rsy))
-        self.window.screen.blit(image, (rx, ry))
+        self.mark(self.window.screen, self.window.screen.blit(image, (rx, ry)))
 
     def print(self, text, position=None, size=None, color=colors.WHITE, font=None, conversion=True):
         """Print a text the window's screen using text and position and optional
@@ -159,9 +420,14 @@ class Draw:
 
     def show(self):
         self.plane.showGrid(self.window)
-        self.window.flip()
+        self.flip()
 
     def clear(self, **kwargs):
+        # In the dirty mode of the window, everything must be redrawn when the view changed.
+        self.plane.getView(self.window)
+        if self.clear_key != self.plane.view_key:
+            self.clear_key = self.plane.view_key
+            self.window.invalidate()
         self.plane.clear(self.window, **kwargs)
 
     def check(self):
@@ -23,6 +23,12 @@ class Entity(Body):
                 self.life = 0
         self.active = active
         self.friction = friction
+        # Sleeping state: the time spent at rest, the entities that sleep and
+        # wake together and the entities touched since the last update.
+        self.asleep = False
+        self.calm = 0
+        self.island = [self]
+        self.contacts = []
 
     def getAlive(self):
         return self.life > 0
@@ -61,10 +67,34 @@ class Entity(Body):
         self.alive = False
 
     def update(self, dt):
-        """Update the spaceship."""
+        """Update the spaceship, unless it is asleep."""
+        if self.asleep:
+            return
         super().update(dt)
         self.updateFriction()
 
+    def sleep(self, island=None):
+        """Put the entity to sleep with the entities of its island, which
+        will be woken together."""
+        self.asleep = True
+        self.island = island or [self]
+        self.velocity.setNull()
+
+    def wake(self):
+        """Wake the entity and the other entities of its island."""
+        for entity in self.island:
+            entity.asleep = False
+            entity.calm = 0
+            entity.island = [entity]
+
+    def touch(self, other):
+        """Record the contact with another entity, which wakes the sleeping
+        one if only one of them is asleep."""
+        if self.asleep != other.asleep:
+            (self if self.asleep else other).wake()
+        self.contacts.append(other)
+        other.contacts.append(self)
+
     def updateFriction(self):
         """Add some friction."""
         self.velocity.norm *= (1 - self.friction)
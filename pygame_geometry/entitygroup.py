@@ -2,34 +2,48 @@ from .manager import Manager
 from .entity import Entity
 from .motion import Motion
 from .group import Group
-import numpy as np
+from .sweepandprune import SweepAndPrune
+from .motionbatch import PhysicsBatch
 
+import numpy as np
 import random
+import math
 
 
 class EntityGroup(Group):
     """An entity group is a group of entities. Entity specific features are added."""
 
-    @staticmethod
+    def getCandidates(group1, group2):
+        """Return the pairs of entities of both groups which born squares
+        overlap, using the sweep and prune of the first group, which keeps the
+        order of the entities from one call to the next."""
+        sweep = getattr(group1, "sweep", None)
+        if sweep is None:
+            sweep = SweepAndPrune()
+        entities = {}
+        for (side, group) in enumerate((group1, group2)):
+            for entity in group:
+                entities[(side, id(entity))] = entity
+        boxes = {key: (e.x - e.born, e.y - e.born, e.x + e.born, e.y + e.born) for (key, e) in entities.items()}
+        groups = {key: key[0] for key in boxes}
+        return [(entities[k1], entities[k2]) if k1[0] == 0 else (entities[k2], entities[k1])
+                for (k1, k2) in sweep.pairs(boxes, groups)]
+
     def getCollided(group1, group2):
         """Determine the collisions between 2 groups."""
         collisions = []
-        for e1 in group1:
-            for e2 in group2:
-                if (e1.position - e2.position).norm < e1.born + e2.born:
-                    if e1.cross(e2):
-                        collisions.append((e1, e2))
+        for (e1, e2) in EntityGroup.getCandidates(group1, group2):
+            if (e1.position - e2.position).norm < e1.born + e2.born:
+                if e1.cross(e2):
+                    collisions.append((e1, e2))
         return collisions
 
     @staticmethod
     def killOnCollision(group1, group2):
         """We suppose the entities of group1 and group2 alives."""
-        for e1 in group1:
-            for e2 in group2:
-                if (e1.position - e2.position).norm < e1.born + e2.born:
-                    if e1.cross(e2):
-                        e1.die()
-                        e2.die()
+        for (e1, e2) in EntityGroup.getCollided(group1, group2):
+            e1.die()
+            e2.die()
 
     @classmethod
     def randomOfType(cls, etype, n=0, **kwargs):
@@ -50,6 +64,33 @@ class EntityGroup(Group):
         entities = [Entity.random() for i in range(n)]
         return cls(*entities, **kwargs)
 
+    @staticmethod
+    def getIslands(entities):
+        """Return the islands of the entities, which are the lists of
+        entities connected by their contacts. The entities touched that are
+        not given are part of the islands too."""
+        parents = {}
+        objects = {}
+
+        def find(entity):
+            root = id(entity)
+            while parents[root] != root:
+                root = parents[root]
+            parents[id(entity)] = root
+            return root
+
+        for entity in entities:
+            for e in [entity] + entity.contacts:
+                if id(e) not in parents:
+                    parents[id(e)] = id(e)
+                    objects[id(e)] = e
+            for other in entity.contacts:
+                parents[find(other)] = find(entity)
+        islands = {}
+        for (i, e) in objects.items():
+            islands.setdefault(find(e), []).append(e)
+        return list(islands.values())
+
     @classmethod
     def randomWithSizeSparse(self, n, size, sparse, **kwargs):
         """Create a random group using the size and sparse parameters."""
@@ -58,16 +99,27 @@ class EntityGroup(Group):
         g.spread(sparse)
         return g
 
-    def __init__(self, *entities, alive=False, active=False, activate=False):
-        """Create a entity group."""
+    def __init__(self, *entities, alive=False, active=False, activate=False,
+                 sleeping=False, sleep_velocity=1e-2, sleep_acceleration=1e-1, sleep_time=0.5):
+        """Create a entity group. If 'sleeping' is true, the islands of
+        entities which velocity and acceleration stay under the thresholds
+        during the sleep time are put to sleep."""
         super().__init__(*entities)
         self.active = active
         self.alive = alive
+        self.batch = PhysicsBatch()
+        self.sweep = SweepAndPrune()
+        self.sleeping = sleeping
+        self.sleep_velocity = sleep_velocity
+        self.sleep_acceleration = sleep_acceleration
+        self.sleep_time = sleep_time
+        self.last_velocities = {}
         if activate:
             self.activate()
 
     # Binding the entities to the elements
     entities = property(Group.getElements, Group.setElements, Group.delElements)
+    sleep_counts = property(lambda self: self.getSleepCounts(), doc="Numbers of entities awake and asleep.")
 
     def randomEntity(self):
         """Return a random entity of the group."""
@@ -108,18 +160,24 @@ class EntityGroup(Group):
         """Make each entity react to the key down event."""
         for entity in self:
             if entity.active:
+                if isinstance(entity, Entity):
+                    entity.wake()
                 entity.reactKeyDown(key)
 
     def reactMouseMotion(self, position):
         """Make each entity react to a mouse motion event."""
         for entity in self:
             if entity.active:
+                if isinstance(entity, Entity):
+                    entity.wake()
                 entity.reactMouseMotion(position)
 
     def reactMouseButtonDown(self, button, position):
         """Make all entities react to a mouse button down event."""
         for entity in self:
             if entity.active:
+                if isinstance(entity, Entity):
+                    entity.wake()
                 entity.reactMouseButtonDown(button, position)
 
     def respawn(self):
@@ -154,10 +212,70 @@ class EntityGroup(Group):
         return super().__str__(name)
 
     def update(self, dt):
-        """Update all entities."""
-        for entity in self:
+        """Update all entities. The motions of the entities which update is
+        the one of the entity are integrated together in batches, with their
+        frictions, and the others are updated individually. The entities
+        asleep are not updated."""
+        if self.sleeping:
+            self.updateSleep(dt)
+        else:
+            self.clearContacts()
+        awake = [entity for entity in self if not (isinstance(entity, Entity) and entity.asleep)]
+        entities = [entity for entity in awake if type(entity).update is Entity.update]
+        rest = self.batch.update(entities, dt, friction=True)
+        for entity in awake:
+            if type(entity).update is not Entity.update:
+                entity.update(dt)
+        for entity in rest:
             entity.update(dt)
 
+    def updateSleep(self, dt):
+        """Update the time spent at rest by the entities, using their
+        velocities and the changes of their velocities since the last update,
+        which include the collisions. The islands which entities all rested
+        long enough are put to sleep, and the sleeping entities which velocity
+        was changed from outside are woken."""
+        entities = [entity for entity in self if isinstance(entity, Entity)]
+        velocities = {}
+        for entity in entities:
+            vx, vy = entity.velocity.components[:2]
+            if not entity.asleep and len(entity.motion.vectors) >= 3:
+                # The velocity of the next step, which a contact solver sets
+                # so that it is null for a body at rest under a constant force.
+                ax, ay = entity.acceleration.components[:2]
+                vx, vy = vx + ax * dt, vy + ay * dt
+            lx, ly = self.last_velocities.get(id(entity), (vx, vy))
+            speed = math.hypot(vx, vy)
+            acceleration = math.hypot(vx - lx, vy - ly) / dt
+            if entity.asleep:
+                if speed > self.sleep_velocity:
+                    entity.wake()
+            elif speed < self.sleep_velocity and acceleration < self.sleep_acceleration:
+                entity.calm += dt
+            else:
+                entity.calm = 0
+            velocities[id(entity)] = (vx, vy)
+        self.last_velocities = velocities
+        awake = [entity for entity in entities if not entity.asleep]
+        for island in EntityGroup.getIslands(awake):
+            if all(isinstance(e, Entity) and e.calm >= self.sleep_time for e in island):
+                for entity in island:
+                    entity.sleep(island)
+        self.clearContacts()
+
+    def clearContacts(self):
+        """Forget the contacts recorded since the last update, which are only
+        needed to make the islands of the sleeping entities."""
+        for entity in self:
+            if isinstance(entity, Entity):
+                entity.contacts.clear()
+
+    def getSleepCounts(self):
+        """Return the numbers of entities awake and asleep."""
+        entities = [e for e in self.flattened() if isinstance(e, Entity)]
+        asleep = sum(1 for entity in entities if entity.asleep)
+        return (len(entities) - asleep, asleep)
+
     def setFriction(self, friction):
         """Set the friction of the entities to a given friction."""
         for entity in self:
@@ -195,6 +313,7 @@ class AliveEntityGroup:
     def __init__(self, entities):
         """Create a body group using the dictionary of entities."""
         self.entities = entities
+        self.sweep = SweepAndPrune()
         self.updateAlives()
         self.updateMaxBorn()
 
@@ -241,24 +360,24 @@ class AliveEntityGroup:
         for entity in self.deads.values():
             entity.respawn()
 
+    def getCandidates(self):
+        """Return the pairs of ids of alive entities which born squares
+        overlap. The sweep and prune keeps the order of the entities of the
+        previous frame, which is nearly sorted when they do not move much."""
+        boxes = {id: (e.x - e.born, e.y - e.born, e.x + e.born, e.y + e.born) for (id, e) in self.alives.items()}
+        return self.sweep.pairs(boxes)
+
     def getCollisions(self):
         """Return the list of couples of collisions detected between alive entities."""
         collisions = []
-        keys = list(self.alives.keys())
-        n = len(keys)
-        for i in range(n):
-            for j in range(i + 1, n):
-                id1 = keys[i]
-                id2 = keys[j]
-                e1 = self.alives[id1]
-                e2 = self.alives[id2]
-                if e1.cross(e2):
-                    collisions.append((id1, id2))
+        for (id1, id2) in self.getCandidates():
+            if self.alives[id1].cross(self.alives[id2]):
+                collisions.append((id1, id2))
         return collisions
 
     def getCollided(self, collisions):
         """Return the ids of collided entities."""
-        ids = list(set(np.reshape(collisions, 2 * len(collisions))))
+        ids = set(id for collision in collisions for id in collision)
         return dict([(id, self.entities[id]) for id in ids])
 
     def killEach(self, collided):
@@ -287,17 +406,12 @@ class AliveEntityGroup:
     def getCollisionsWithCircles(self):
         """Return all circle collisions."""
         collisions = []
-        keys = list(self.alives.keys())
-        n = len(keys)
-        for i in range(n):
-            for j in range(i + 1, n):
-                id1 = keys[i]
-                id2 = keys[j]
-                e1 = self.alives[id1]
-                e2 = self.alives[id2]
-                if (e1.position - e2.position).norm < e1.born + e2.born:
-                    if e1.cross(e2):
-                        collisions.append((id1, id2))
+        for (id1, id2) in self.getCandidates():
+            e1 = self.alives[id1]
+            e2 = self.alives[id2]
+            if (e1.position - e2.position).norm < e1.born + e2.born:
+                if e1.cross(e2):
+                    collisions.append((id1, id2))
         return collisions
 
     @property
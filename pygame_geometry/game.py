@@ -1,5 +1,6 @@
 from .entitygroup import EntityGroup
 from .manager import Manager # Just to solve the deprecated complex manager class
+from .clock import FixedClock
 
 import time
 
@@ -60,6 +61,7 @@ class Game:
         self.stage = stage
         self.speed = speed
         self.t = time.time()
+        self.clock = FixedClock(speed)
 
     def getLevel(self):
         return self.levels[self.stage]
@@ -92,14 +94,17 @@ class Game:
             self.stage += 1
 
     def fixedUpdate(self):
-        """Update the current level if the time is right, so that the game speed
+        """Update the current level once every 'speed' seconds of real time,
+        catching up the late updates with a fixed clock, so that the game speed
         does not depend on the efficiency of the computer."""
         if self.level.on:
-            if time.time() - self.t > self.speed:
+            self.clock.dt = self.speed
+            for step in range(self.clock.tick()):
                 self.level.update()
-                self.t = time.time()
+            self.t = time.time()
         else:
             self.stage += 1
+            self.clock.reset()
 
     def show(self, context):
         """Show the current level of the game."""
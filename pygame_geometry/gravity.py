@@ -0,0 +1,219 @@
+import numpy as np
+
+
+class BarnesHut:
+    """Gravitational accelerations of n bodies computed in O(n.log(n)) with the
+    algorithm of Barnes and Hut. The bodies are stored in a quadtree which
+    nodes aggregate the mass and the center of mass of their bodies, and a
+    node which is seen from a body under an angle smaller than 'theta' (its
+    size divided by its distance) acts on the body as a single body. With
+    'theta' null every body is reached and the result is the direct sum.
+    The quadtree is built level by level from the morton codes of the bodies
+    and all the bodies walk down the tree together, so that every operation
+    is done on numpy arrays."""
+
+    @staticmethod
+    def spread(i):
+        """Return the integers with a zero bit inserted before each of their
+        bits, which interleaved give the morton codes."""
+        i = i.astype(np.int64) & 0xFFFFFFFF
+        i = (i | (i << 16)) & 0x0000FFFF0000FFFF
+        i = (i | (i << 8)) & 0x00FF00FF00FF00FF
+        i = (i | (i << 4)) & 0x0F0F0F0F0F0F0F0F
+        i = (i | (i << 2)) & 0x3333333333333333
+        i = (i | (i << 1)) & 0x5555555555555555
+        return i
+
+    @staticmethod
+    def direct(positions, masses, constant=1, softening=0, chunk=1024):
+        """Return the (n, 2) array of the accelerations of the bodies by
+        summing the attractions of all the other bodies, by chunks of bodies
+        so that the memory stays linear."""
+        positions = np.asarray(positions, dtype=float)
+        masses = np.asarray(masses, dtype=float)
+        accelerations = np.zeros_like(positions)
+        for start in range(0, len(positions), chunk):
+            d = positions[np.newaxis, :, :] - positions[start:start + chunk, np.newaxis, :]
+            r2 = (d * d).sum(axis=2) + softening * softening
+            with np.errstate(divide="ignore", invalid="ignore"):
+                f = np.where(r2 > 0, masses / (r2 * np.sqrt(r2)), 0)
+            accelerations[start:start + chunk] = constant * (f[:, :, np.newaxis] * d).sum(axis=1)
+        return accelerations
+
+    def __init__(self, theta=0.5, constant=1, softening=0, depth=20):
+        """Create a Barnes Hut engine using the opening angle 'theta', the
+        gravitational constant, the softening length which avoids infinite
+        accelerations between close bodies and the maximum depth of the tree."""
+        self.theta = theta
+        self.constant = constant
+        self.softening = softening
+        self.depth = depth
+        self.interactions = 0
+
+    def __call__(self, positions, masses):
+        """Return the accelerations of the bodies."""
+        return self.accelerations(positions, masses)
+
+    def getField(self, masses):
+        """Return the field of accelerations of bodies of the given masses,
+        as a function of their positions and velocities that can be given to a
+        motion batch."""
+        masses = np.asarray(masses, dtype=float)
+        return lambda positions, velocities: self.accelerations(positions, masses)
+
+    def build(self, positions, masses):
+        """Build the quadtree of the bodies. Each node stores the mass, the
+        center of mass, the center and half size of its square, the range of
+        its bodies in the order of the morton codes and the range of its
+        children, which are contiguous."""
+        n = len(positions)
+        depth = self.depth
+        low = positions.min(axis=0)
+        size = float((positions.max(axis=0) - low).max()) or 1
+        # The integer coordinates of the bodies in the grid of the deepest level.
+        cells = np.minimum((positions - low) / size * 2 ** depth, 2 ** depth - 1).astype(np.int64)
+        codes = BarnesHut.spread(cells[:, 0]) | (BarnesHut.spread(cells[:, 1]) << 1)
+        order = np.argsort(codes, kind="stable")
+        self.order = order
+        self.ranks = np.empty(n, dtype=np.int64)
+        self.ranks[order] = np.arange(n)
+        codes, cells = codes[order], cells[order]
+        sorted_masses = masses[order]
+        weighted = positions[order] * sorted_masses[:, np.newaxis]
+
+        levels = []
+        active = np.arange(n)  # sorted indices of the bodies of the nodes to split
+        parents = np.full(n, -1)  # node of the previous level of each active body
+        count = 0
+        for level in range(depth + 1):
+            keys = codes[active] >> (2 * (depth - level))
+            starts = np.flatnonzero(np.diff(keys)) + 1 if len(keys) > 1 else np.array([], dtype=np.int64)
+            starts = np.concatenate(([0], starts))
+            ends = np.append(starts[1:], len(active))
+            mass = np.add.reduceat(sorted_masses[active], starts)
+            com = np.add.reduceat(weighted[active], starts) / np.where(mass > 0, mass, 1)[:, np.newaxis]
+            half = size / 2 ** (level + 1)
+            center = low + (cells[active[starts]] >> (depth - level)) * (2 * half) + half
+            first, last = active[starts], active[ends - 1] + 1
+            leaf = (ends - starts == 1) | (level == depth)
+            ids = count + np.arange(len(starts))
+            levels.append((mass, com, center, np.full(len(starts), half), first, last, leaf, parents[active[starts]]))
+            count += len(starts)
+            # Only the bodies of the nodes that are not leaves go down.
+            lengths = ends - starts
+            node_of_body = np.repeat(ids, lengths)
+            keep = np.repeat(~leaf, lengths)
+            active = active[keep]
+            parents = np.full(n, -1)
+            parents[active] = node_of_body[keep]
+            if not len(active):
+                break
+
+        self.mass = np.concatenate([l[0] for l in levels])
+        self.com = np.concatenate([l[1] for l in levels])
+        self.center = np.concatenate([l[2] for l in levels])
+        self.half = np.concatenate([l[3] for l in levels])
+        self.first = np.concatenate([l[4] for l in levels])
+        self.last = np.concatenate([l[5] for l in levels])
+        self.leaf = np.concatenate([l[6] for l in levels])
+        self.offset = np.linalg.norm(self.com - self.center, axis=1)
+        parent = np.concatenate([l[7] for l in levels])
+        self.children = np.zeros(count, dtype=np.int64)
+        self.child_counts = np.zeros(count, dtype=np.int64)
+        nodes = np.arange(count)[parent >= 0]
+        parent = parent[parent >= 0]
+        if len(parent):
+            unique, index, counts = np.unique(parent, return_index=True, return_counts=True)
+            self.children[unique] = nodes[index]
+            self.child_counts[unique] = counts
+        return count
+
+    def accelerations(self, positions, masses):
+        """Return the (n, 2) array of the accelerations of the bodies."""
+        positions = np.asarray(positions, dtype=float)
+        masses = np.asarray(masses, dtype=float)
+        n = len(positions)
+        accelerations = np.zeros((n, 2))
+        if n < 2:
+            return accelerations
+        self.build(positions, masses)
+        theta2 = self.theta * self.theta
+        softening2 = self.softening * self.softening
+        bodies = np.arange(n)
+        nodes = np.zeros(n, dtype=np.int64)
+        self.interactions = 0
+        while len(bodies):
+            ranks = self.ranks[bodies]
+            member = (self.first[nodes] <= ranks) & (ranks < self.last[nodes])
+            p = positions[bodies]
+            d = self.com[nodes] - p
+            r2 = (d * d).sum(axis=1)
+            # The distance is reduced by the offset of the center of mass so
+            # that a body close to the side of a square is not badly approximated.
+            r = np.maximum(np.sqrt(r2) - self.offset[nodes], 0)
+            accepted = self.leaf[nodes] | (~member & (4 * self.half[nodes] ** 2 < theta2 * r * r))
+            # A body does not attract itself, so it is removed from its leaf.
+            m = self.mass[nodes[accepted]]
+            d = d[accepted]
+            own = member[accepted]
+            if own.any():
+                mb = masses[bodies[accepted][own]]
+                mo = m[own] - mb
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    com = (self.com[nodes[accepted][own]] * m[own][:, np.newaxis]
+                           - p[accepted][own] * mb[:, np.newaxis]) / mo[:, np.newaxis]
+                d[own] = np.where(mo[:, np.newaxis] > 0, com - p[accepted][own], 0)
+                m[own] = np.maximum(mo, 0)
+            r2 = (d * d).sum(axis=1) + softening2
+            with np.errstate(divide="ignore", invalid="ignore"):
+                f = np.where(r2 > 0, self.constant * m / (r2 * np.sqrt(r2)), 0)
+            targets = bodies[accepted]
+            accelerations[:, 0] += np.bincount(targets, weights=f * d[:, 0], minlength=n)
+            accelerations[:, 1] += np.bincount(targets, weights=f * d[:, 1], minlength=n)
+            self.interactions += len(targets)
+            # The other nodes are opened.
+            bodies, nodes = bodies[~accepted], nodes[~accepted]
+            counts = self.child_counts[nodes]
+            starts = np.repeat(self.children[nodes], counts)
+            offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            bodies, nodes = np.repeat(bodies, counts), starts + offsets
+        return accelerations
+
+
+if __name__ == "__main__":
+    import time
+
+    def bodies(n):
+        """Return the positions and masses of a random disk of bodies."""
+        radiuses = np.sqrt(np.random.uniform(0, 1, n))
+        angles = np.random.uniform(0, 2 * np.pi, n)
+        positions = np.column_stack((radiuses * np.cos(angles), radiuses * np.sin(angles)))
+        return (positions, np.random.uniform(0.5, 1.5, n))
+
+    positions, masses = bodies(2000)
+    exact = BarnesHut.direct(positions, masses, softening=1e-3)
+    print("n=2000, accuracy against the direct sum:")
+    for theta in [0, 0.3, 0.5, 0.7, 1, 1.5]:
+        engine = BarnesHut(theta, softening=1e-3)
+        ti = time.time()
+        approximation = engine(positions, masses)
+        dt = time.time() - ti
+        errors = np.linalg.norm(approximation - exact, axis=1)
+        norms = np.linalg.norm(exact, axis=1)
+        # The largest error is given relatively to the mean acceleration, since
+        # some bodies are barely accelerated.
+        print("theta={}: median error {:.2e}, max error {:.2e}, {} interactions, {:.3f}s".format(
+            theta, np.median(errors / norms), errors.max() / norms.mean(), engine.interactions, dt))
+
+    print("timing with theta=0.5:")
+    for n in [10 ** 3, 10 ** 4, 10 ** 5]:
+        positions, masses = bodies(n)
+        engine = BarnesHut(0.5, softening=1e-3)
+        ti = time.time()
+        engine(positions, masses)
+        line = "n={}: barnes hut {:.3f}s".format(n, time.time() - ti)
+        if n <= 10 ** 4:
+            ti = time.time()
+            BarnesHut.direct(positions, masses, softening=1e-3)
+            line += ", direct sum {:.3f}s".format(time.time() - ti)
+        print(line)
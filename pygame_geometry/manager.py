@@ -1,4 +1,9 @@
 from .context import Context
+from .abstract import BoundingBox
+from .motionbatch import PhysicsBatch
+from .physics import Physics
+from .body import Body
+from .clock import FixedClock
 from pygame.locals import *
 import pygame
 
@@ -126,12 +131,20 @@ class oldManager:  # This manager is deprecated
 
 
 class Manager:
-    def __init__(self, name="Manager", dt=10e-3, **kwargs):
-        """Create a manager using a context, this methods it to be overloaded."""
+    def __init__(self, name="Manager", dt=10e-3, fixed=False, max_steps=5, fps=None, **kwargs):
+        """Create a manager using a context, this methods it to be overloaded.
+        If 'fixed' is true, the manager is updated by steps of 'dt' seconds of
+        real time whatever the rate of the frames, with at most 'max_steps'
+        steps by frame, otherwise it is updated once by frame. The frames can
+        be limited to 'fps' frames per second."""
         self.context = Context(name=name, **kwargs)
         self.count = self.context.count
         self.pause = False
         self.dt = dt
+        self.clock = FixedClock(dt, max_steps) if fixed else None
+        self.fps = fps
+        # Numbers of bounding box pre-tests and skipped exact tests of the last frame
+        self.bounding_box_statistics = (0, 0)
         # Typing stuff
         self.typing = False
         self.alphabet = "abcdefghijklmnopqrstuvwxyz"
@@ -166,6 +179,9 @@ class Manager:
         self.eventsLoop()
         self.updateLoop()
         self.showLoop()
+        self.bounding_box_statistics = BoundingBox.reset()
+        if self.fps:
+            self.context.draw.window.clock.tick(self.fps)
 
     def eventsLoop(self):
         """Deal with the events in the loop."""
@@ -401,12 +417,34 @@ class Manager:
         pass
 
     def updateLoop(self):
-        """Update the manager while in the loop."""
-        if not self.pause:
+        """Update the manager while in the loop, once or as many times as the
+        fixed clock requires."""
+        if self.pause:
+            if self.clock:
+                self.clock.reset()
+        elif self.clock:
+            self.clock.dt = self.dt
+            for step in range(self.clock.tick()):
+                self.update()
+                self.count()
+        else:
             self.update()
             self.count()
         self.context.camera.write()  # Write on the camera writers if they are on
 
+    def getAlpha(self):
+        """Return the fraction of a step between the last update and the time
+        of the frame, which is 1 when the manager is updated once by frame."""
+        if self.clock:
+            return self.clock.alpha
+        return 1
+
+    def interpolate(self, previous, current):
+        """Return the state to show between the states of the last two updates."""
+        return previous + (current - previous) * self.alpha
+
+    alpha = property(getAlpha, doc="Fraction of a step not simulated at the time of the frame.")
+
     def update(self):
         """Update the components of the manager of the loop. This method is to be
         overloaded."""
@@ -464,6 +502,7 @@ class BodyManager(Manager):
         super().__init__(**kwargs)
         self.bodies = bodies
         self.following = following
+        self.batch = PhysicsBatch()
 
     def update(self):
         """Update the bodies."""
@@ -479,8 +518,14 @@ class BodyManager(Manager):
                 body.follow(p)
 
     def updateBodies(self):
-        """Update the bodies individually."""
+        """Update the motions of the bodies together in a batch, and the
+        bodies which update does more than that individually."""
+        bodies = [body for body in self.bodies if type(body).update in (Body.update, Physics.update)]
+        rest = self.batch.update(bodies, self.dt)
         for body in self.bodies:
+            if type(body).update not in (Body.update, Physics.update):
+                body.update(self.dt)
+        for body in rest:
             body.update(self.dt)
 
     def show(self):
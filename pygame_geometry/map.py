@@ -5,6 +5,7 @@ from .rect import Rect
 from . import colors
 
 import numpy as np
+import math
 import random
 import noise
 import os
@@ -87,8 +88,13 @@ class Map(Rectangle):
     def show(self, context):
         """Show the simple map on the context."""
         w, h = self.size
-        for y in range(h):
-            for x in range(w):
+        # Only the cases in the visible rectangle are shown.
+        xmin, ymin, xmax, ymax = context.draw.getCorners()
+        xs = range(max(0, math.floor(xmin)), min(w, math.ceil(xmax)))
+        ys = range(max(0, math.floor(ymin)), min(h, math.ceil(ymax)))
+        context.draw.culled += w * h - len(xs) * len(ys)
+        for y in ys:
+            for x in xs:
                 color = self.cases[int(self.grid[y][x])]
                 context.draw.rect(context.screen, color, (x, y+1) + (1, 1), 1)
         super().show(context)
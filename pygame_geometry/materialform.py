@@ -3,6 +3,7 @@ from .abstract import Form,Point,Vector
 from .material import Material
 from .motion import Motion
 from .force import Force
+from .transform import AffineTransform
 
 from . import materialpoint
 from . import force
@@ -142,11 +143,11 @@ class MaterialForm(Material,Form):
         """Update the form by updating all its points."""
         for point in self.points:
             point.update(t)
+        self.touch()
 
     def rotate(self,angle=math.pi,center=Point.origin()):
-        """Rotate the form by rotating its points."""
-        for point in self.points:
-            point.rotate(angle,center)
+        """Rotate the form by rotating all its points at once."""
+        self.transform(AffineTransform.createFromRotation(angle,center))
 
     def getMass(self):
         """Calculate the mass of the form using its area and the mass of the material_points that define it."""
@@ -162,6 +163,7 @@ class MaterialForm(Material,Form):
     def __setitem__(self,index,point):
         """Return the material point of number 'index'."""
         self.points[index]=point
+        self.touch()
 
     def getCollisionInstant(self,other,dt=1):
         """Return the instant of the collision the material form with the other object."""
@@ -197,6 +199,7 @@ class MaterialForm(Material,Form):
         v=Vector.createFromTwoPoints(nc,ac)
         for point in self.points:
             point+=v
+        self.touch()
 
     def delCenter(self):
         """Set the center to the origin."""
@@ -2,6 +2,7 @@ from .materialform import MaterialForm
 from .materialpoint import MaterialPoint
 from .abstract import Vector,Segment,Line
 from .motion import Motion
+from .continuouscollision import ContinuousCollider
 from . import colors
 
 import itertools
@@ -11,7 +12,7 @@ class MaterialCollider:
     """Class made especially to deal with one to one collisions."""
     def __init__(self):
         """Create a collider."""
-        pass
+        self.continuous=ContinuousCollider()
 
     def set(self,object1,object2):
         """Set the objects of the collider."""
@@ -22,15 +23,10 @@ class MaterialCollider:
         """Deal with the collisions of two objects."""
 
 
-    def getCollisionInstant(self):
-        """Return the instant of the collision of two objects."""
-        bt=1
-        #steps=itertools.combinations(itertoolself.object1.steps,self.object2.steps)
-        allsteps=[(s1,s2) for s1 in self.object1.steps for s2 in self.object2.steps]
-        points=[self.isColliding(steps) for steps in allsteps]
-        allsteps=itertools.compress(allsteps,points)
-        instants=list(map(self.getInstant,allsteps))
-        return min(instants+[1])
+    def getCollisionInstant(self,dt=1):
+        """Return the instant of the collision of two objects, computed from
+        their motions instead of crossing all the steps of their points."""
+        return self.continuous.getCollisionInstant([self.object1,self.object2],dt)
 
     def isColliding(self,steps):
         """Determine is the steps are colliding."""
@@ -68,10 +64,12 @@ class MaterialCollider:
 
 class MaterialGroup:
     """Class used to manipulate groups of material objects together."""
-    def __init__(self,*objects,collider=MaterialCollider()):
-        """Create a material group with the list of objects."""
+    def __init__(self,*objects,collider=MaterialCollider(),scheduler=None):
+        """Create a material group with the list of objects, and the continuous
+        collider that schedules their collisions."""
         self.objects=objects
         self.collider=collider
+        self.scheduler=scheduler or ContinuousCollider()
 
     def show(self,context):
         """Show all the objects on screen."""
@@ -116,21 +114,13 @@ class MaterialGroup:
 
 
     def update(self,dt=1):
-        """Update all the objects together accounting for their collisions."""
-        for object in self.objects:
-            object.update(dt)
+        """Update all the objects together accounting for their collisions, by
+        advancing them from one collision to the next one."""
+        return self.scheduler.advance(self.objects,dt)
 
     def getCollisionInstant(self,dt=1):
         """Return precisely the time of the first collision between all objects."""
-        bt=1
-        l=len(self.objects)
-        for i in range(l):
-            for j in range(1,l):
-                self.collider.set(self.objects[i],self.objects[j])
-                t=self.collider.getCollisionInstant()
-                if t<bt:
-                    bt=t
-        return t
+        return self.scheduler.getCollisionInstant(self.objects,dt)
 
     def directUpdate(self,dt=1):
         """Update all the objects without accounting for their collisions."""
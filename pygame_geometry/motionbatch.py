@@ -0,0 +1,249 @@
+import numpy as np
+
+
+class MotionBatch:
+    """Motions of the same shape packed in a (n, k, d) array, n being the
+    number of motions, k their number of vectors and d the dimension, so that
+    they are all integrated in a single call. The components of the vectors
+    are packed before each update and given back as lists after it, so the
+    vectors and motions can be modified or replaced freely between updates.
+    The schemes of integration are:
+    - 'euler': explicit euler, every vector is increased by the previous value
+      of the next one,
+    - 'semi-implicit': semi implicit euler, the vectors are increased from the
+      last one to the first one, which is what 'Motion.update' does,
+    - 'verlet': velocity verlet, exact for constant accelerations,
+    - 'rk4': runge kutta of order 4.
+    An optional field, which is a function of the (n, d) arrays of the
+    positions and velocities, gives the accelerations, otherwise the last
+    vector of the motions is constant. Optional damping factors multiply the
+    velocities after each update."""
+
+    schemes = ("euler", "semi-implicit", "verlet", "rk4")
+
+    @staticmethod
+    def getShape(motion):
+        """Return the number of vectors of the motion and their dimension, or
+        None if its vectors do not all have the same dimension."""
+        dimensions = {len(vector.components) for vector in motion.vectors}
+        if len(dimensions) != 1:
+            return None
+        return (len(motion.vectors), dimensions.pop())
+
+    def __init__(self, motions, scheme="semi-implicit", field=None, damping=None):
+        """Create a motion batch using the motions, the scheme of integration,
+        an optional field of accelerations and optional damping factors."""
+        if scheme not in MotionBatch.schemes:
+            raise ValueError("Unknown scheme: " + str(scheme))
+        self.motions = list(motions)
+        self.scheme = scheme
+        self.field = field
+        self.damping = damping
+        shapes = {MotionBatch.getShape(motion) for motion in self.motions}
+        if len(shapes) > 1 or None in shapes:
+            raise ValueError("The motions of a batch must have the same number of vectors of the same dimension.")
+        self.shape = shapes.pop() if shapes else (1, 2)
+        self.load()
+
+    def __len__(self):
+        """Return the number of motions."""
+        return len(self.motions)
+
+    def load(self):
+        """Pack the components of the vectors of the motions in the array."""
+        k, d = self.shape
+        self.array = np.array([[vector.components for vector in motion.vectors] for motion in self.motions],
+                              dtype=float).reshape(len(self.motions), k, d)
+
+    def store(self):
+        """Give back the components of the array to the vectors of the
+        motions, as new lists like the operations of the vectors do."""
+        for (motion, rows) in zip(self.motions, self.array.tolist()):
+            for (vector, row) in zip(motion.vectors, rows):
+                vector.components = row
+
+    def getPositions(self):
+        """Return the (n, d) array of the positions."""
+        return self.array[:, 0]
+
+    def getVelocities(self):
+        """Return the (n, d) array of the velocities."""
+        return self.array[:, 1]
+
+    def getAccelerations(self):
+        """Return the (n, d) array of the accelerations."""
+        return self.array[:, 2]
+
+    def derivative(self, array):
+        """Return the derivative of the array of the motions: each vector
+        changes by the next one and the last one is constant, unless the field
+        gives the accelerations."""
+        derivative = np.zeros_like(array)
+        derivative[:, :-1] = array[:, 1:]
+        if self.field is not None and array.shape[1] >= 3:
+            derivative[:, 1] = self.field(array[:, 0], array[:, 1])
+            derivative[:, 2:] = 0
+        return derivative
+
+    def applyField(self):
+        """Set the accelerations to the ones of the field."""
+        if self.field is not None and self.array.shape[1] >= 3:
+            self.array[:, 2] = self.field(self.array[:, 0], self.array[:, 1])
+
+    def update(self, dt=1):
+        """Integrate all the motions during the time 'dt'."""
+        if not len(self.motions):
+            return
+        self.load()
+        self.integrate(dt)
+        if self.damping is not None and self.array.shape[1] >= 2:
+            self.array[:, 1] *= np.asarray(self.damping, dtype=float)[:, np.newaxis]
+        self.store()
+
+    def integrate(self, dt=1):
+        """Integrate the array of the motions during the time 'dt'."""
+        array = self.array
+        k = array.shape[1]
+        if self.scheme == "euler":
+            self.applyField()
+            array[:, :-1] += array[:, 1:] * dt
+        elif self.scheme == "semi-implicit":
+            self.applyField()
+            for i in range(1, k):
+                array[:, -i - 1] += array[:, -i] * dt
+        elif self.scheme == "verlet" and k >= 3:
+            self.applyField()
+            acceleration = array[:, 2].copy()
+            array[:, 0] += array[:, 1] * dt + acceleration * (dt * dt / 2)
+            if self.field is not None:
+                array[:, 2] = self.field(array[:, 0], array[:, 1] + acceleration * dt)
+            else:
+                for i in range(1, k - 2):
+                    array[:, -i - 1] += array[:, -i] * dt
+            array[:, 1] += (acceleration + array[:, 2]) * (dt / 2)
+        elif self.scheme == "verlet":
+            # Without acceleration the motion is uniform and euler is exact.
+            array[:, :-1] += array[:, 1:] * dt
+        else:
+            k1 = self.derivative(array)
+            k2 = self.derivative(array + k1 * (dt / 2))
+            k3 = self.derivative(array + k2 * (dt / 2))
+            k4 = self.derivative(array + k3 * dt)
+            array += (k1 + 2 * k2 + 2 * k3 + k4) * (dt / 6)
+            self.applyField()
+
+    positions = property(getPositions, doc="Positions of the motions.")
+    velocities = property(getVelocities, doc="Velocities of the motions.")
+    accelerations = property(getAccelerations, doc="Accelerations of the motions.")
+
+
+class PhysicsBatch:
+    """Motion batches of the physical objects of a group. The objects are
+    grouped by the shapes of their motions, and each group has a batch for
+    each index of their motions. The groups are kept as long as the objects
+    of the group and their motions are the same."""
+
+    def __init__(self, scheme="semi-implicit", field=None):
+        """Create a physics batch using the scheme of integration and an
+        optional field of accelerations for the first motions."""
+        self.scheme = scheme
+        self.field = field
+        self.key = []
+        self.groups = []
+        self.rest = []
+
+    @staticmethod
+    def getSignature(object):
+        """Return the shapes of the motions of the object, or None if one of
+        them can not be batched."""
+        shapes = tuple(map(MotionBatch.getShape, object.motions))
+        if not shapes or None in shapes:
+            return None
+        return shapes
+
+    def getGroups(self, objects):
+        """Return the groups of the objects which motions have the same
+        shapes, with their motion batches, as a list of (objects, batches),
+        which are made again only if the objects, their motions or the shapes
+        of their motions changed. The batches keep the motions, so their ids
+        can not be reused while they are compared."""
+        key = [(id(object), PhysicsBatch.getSignature(object)) + tuple(map(id, object.motions))
+               for object in objects]
+        if key != self.key:
+            self.key = key
+            signatures = {}
+            self.rest = []
+            for object in objects:
+                signature = PhysicsBatch.getSignature(object)
+                if signature is None:
+                    self.rest.append(object)
+                else:
+                    signatures.setdefault(signature, []).append(object)
+            self.groups = []
+            for members in signatures.values():
+                batches = [MotionBatch([object.motions[index] for object in members], self.scheme)
+                           for index in range(len(members[0].motions))]
+                self.groups.append((members, batches))
+        return self.groups
+
+    def getRest(self, objects):
+        """Return the objects which motions can not be batched."""
+        self.getGroups(objects)
+        return self.rest
+
+    def update(self, objects, dt=1, friction=False):
+        """Update the motions of the objects during the time 'dt', and return
+        the objects which do not fit in a batch so that they are updated
+        individually. The field is given the positions of the objects of a
+        single batch, so it is only used if all the objects fit in the same
+        group. With the friction, the velocities of the first motions are
+        slowed down by the frictions of the objects."""
+        groups = self.getGroups(objects)
+        for (members, batches) in groups:
+            if batches:
+                single = len(groups) == 1 and not self.rest
+                batches[0].field = self.field if single else None
+                if friction:
+                    batches[0].damping = [1 - object.friction for object in members]
+                else:
+                    batches[0].damping = None
+            for batch in batches:
+                batch.update(dt)
+        return list(self.rest)
+
+
+if __name__ == "__main__":
+    from .particles import Particle
+    import time
+
+    for n in [10 ** 3, 10 ** 4, 10 ** 5]:
+        particles = [Particle.random() for i in range(n)]
+        frames = 10
+        if n <= 10 ** 4:
+            ti = time.time()
+            for frame in range(frames):
+                for particle in particles:
+                    particle.update(0.01)
+            tl = (time.time() - ti) / frames
+        batch = PhysicsBatch()
+        batch.update(particles, 0.01)
+        ti = time.time()
+        for frame in range(frames):
+            batch.update(particles, 0.01)
+        tb = (time.time() - ti) / frames
+        line = "n={}: batch {:.4f}s per frame".format(n, tb)
+        if n <= 10 ** 4:
+            line += ", loop {:.4f}s per frame".format(tl)
+        print(line)
+
+    # Error of the schemes for a harmonic oscillator after one period.
+    from .motion import Motion
+    from .abstract import Vector
+    import math
+    for scheme in MotionBatch.schemes:
+        motion = Motion(Vector(1, 0), Vector(0, 0), Vector(0, 0))
+        batch = MotionBatch([motion], scheme, field=lambda positions, velocities: -positions)
+        steps = 100
+        for i in range(steps):
+            batch.update(2 * math.pi / steps)
+        print("{}: error {:.2e} after one period".format(scheme, math.hypot(motion.position.x - 1, motion.position.y)))
@@ -0,0 +1,208 @@
+from .abstract import Form
+from .anatomies import FormAnatomy, TrajectoryAnatomy
+
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import math
+import time
+import os
+
+
+CONVEX, POLYGON, TRAJECTORY = range(3)
+
+
+def crossSegments(points1, points2):
+    """Determine if any segment of the first polyline crosses any segment of
+    the second one, the polylines being (n, 2) arrays."""
+    if len(points1) < 2 or len(points2) < 2:
+        return False
+    a, b = points1[:-1, np.newaxis], points1[1:, np.newaxis]
+    c, d = points2[np.newaxis, :-1], points2[np.newaxis, 1:]
+
+    def orientation(p, q, r):
+        return np.sign((q[..., 0] - p[..., 0]) * (r[..., 1] - p[..., 1])
+                       - (q[..., 1] - p[..., 1]) * (r[..., 0] - p[..., 0]))
+
+    o1, o2 = orientation(a, b, c), orientation(a, b, d)
+    o3, o4 = orientation(c, d, a), orientation(c, d, b)
+    return bool(((o1 != o2) & (o3 != o4)).any())
+
+
+def collideChunk(vertices, offsets, pairs, kinds):
+    """Return the boolean mask (the polygons of the pair collide) of a chunk
+    of pairs and the time it took. The polygons are the slices of the (m, 2)
+    array of the vertices given by the offsets, and the pairs are the indices
+    of their polygons. This is the function run by the processes."""
+    start = time.perf_counter()
+    mask = np.zeros(len(pairs), dtype=bool)
+    for (k, ((i, j), kind)) in enumerate(zip(pairs, kinds)):
+        v1 = vertices[offsets[i]:offsets[i + 1]]
+        v2 = vertices[offsets[j]:offsets[j + 1]]
+        if kind == CONVEX:
+            mask[k] = Form.separation(v1, v2) is not None
+        elif kind == POLYGON:
+            mask[k] = Form.crossings(v2, v1).any() or Form.crossings(v1, v2).any()
+        else:
+            mask[k] = crossSegments(v1, v2)
+    return (mask, time.perf_counter() - start)
+
+
+class ParallelNarrowPhase:
+    """Narrow phase that tests the pairs of polygons given by a broad phase in
+    a persistent pool of processes. The pairs are split into chunks, and each
+    chunk only sends the vertices of its polygons packed in one array with
+    their offsets, rather than the forms themselves. The results are gathered
+    in the order of the pairs. The size of the chunks adapts to the number of
+    pairs tested per second, so that each chunk lasts about 'target' seconds.
+    The pairs are tested in the current process when there are too few of
+    them to pay for the processes: the threshold is measured from the rate
+    of the tests in the current process and from the time the processes cost
+    on top of their tests, and is 'min_pairs' until both are known."""
+
+    @staticmethod
+    def getKind(entity1, entity2):
+        """Return the kind of test of the anatomies of the entities, or None
+        if it can not be done in the processes."""
+        a1, a2 = entity1.anatomy, entity2.anatomy
+        if isinstance(a1, FormAnatomy) and isinstance(a2, FormAnatomy):
+            return POLYGON
+        if isinstance(a1, TrajectoryAnatomy) and isinstance(a2, TrajectoryAnatomy):
+            return TRAJECTORY
+        return None
+
+    @staticmethod
+    def pack(polygons, pairs):
+        """Return the array of the vertices of the polygons used by the pairs,
+        the offsets of the polygons in it and the pairs of indices of the
+        polygons in the offsets."""
+        used, pairs = np.unique(np.asarray(pairs, dtype=np.int64), return_inverse=True)
+        pairs = pairs.reshape(-1, 2)
+        arrays = [np.asarray(polygons[i], dtype=float).reshape(-1, 2) for i in used]
+        offsets = np.zeros(len(arrays) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(a) for a in arrays])
+        vertices = np.concatenate(arrays) if arrays else np.zeros((0, 2))
+        return (vertices, offsets, pairs)
+
+    def __init__(self, workers=None, target=20e-3, min_pairs=256, min_chunk=32, adaptive=True):
+        """Create a parallel narrow phase using the number of processes, the
+        duration of a chunk, the number of pairs under which they are tested
+        in the current process until the threshold is measured, the smallest
+        size of a chunk and whether the threshold is measured."""
+        self.workers = workers or os.cpu_count() or 1
+        self.target = target
+        self.min_pairs = min_pairs
+        self.min_chunk = min_chunk
+        self.adaptive = adaptive
+        self.executor = None
+        self.rate = None  # pairs tested per second by a process
+        self.serial_rate = None  # pairs tested per second in the current process
+        self.overhead = None  # seconds spent by the processes besides their tests
+        self.chunks = 0
+
+    def __del__(self):
+        """Stop the processes."""
+        self.close()
+
+    def getExecutor(self):
+        """Return the pool of processes, which is created once."""
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self.executor
+
+    def close(self):
+        """Stop the processes, which are created again if needed."""
+        if getattr(self, "executor", None) is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def getChunkSize(self, n):
+        """Return the number of pairs of a chunk for n pairs, which lasts the
+        target duration at the last rate, without leaving processes idle."""
+        most = math.ceil(n / self.workers)
+        if self.rate is None:
+            size = math.ceil(n / (4 * self.workers))
+        else:
+            size = int(self.rate * self.target)
+        return max(self.min_chunk, min(size, most))
+
+    def getThreshold(self):
+        """Return the number of pairs under which they are tested in the
+        current process, which is the number for which testing them there
+        lasts as long as the overhead of the processes plus the tests shared
+        between them."""
+        rate = self.serial_rate or self.rate
+        if not self.adaptive or rate is None or self.overhead is None or self.workers < 2:
+            return self.min_pairs
+        return self.overhead * rate * self.workers / (self.workers - 1)
+
+    def collide(self, polygons, pairs, kinds):
+        """Return the boolean mask (the polygons collide) of the pairs of
+        indices of the polygons, which are (n, 2) arrays of vertices, tested
+        according to their kinds."""
+        n = len(pairs)
+        if not n:
+            return np.zeros(0, dtype=bool)
+        kinds = np.asarray(kinds, dtype=np.int64)
+        if self.workers < 2 or n < self.getThreshold():
+            mask, duration = collideChunk(*ParallelNarrowPhase.pack(polygons, pairs), kinds)
+            if duration > 0:
+                self.serial_rate = n / duration
+            return mask
+        start = time.perf_counter()
+        size = self.getChunkSize(n)
+        chunks = [ParallelNarrowPhase.pack(polygons, pairs[i:i + size]) + (kinds[i:i + size],)
+                  for i in range(0, n, size)]
+        results = list(self.getExecutor().map(collideChunk, *zip(*chunks)))
+        self.chunks = len(chunks)
+        elapsed = sum(duration for (mask, duration) in results)
+        if elapsed > 0:
+            self.rate = n / elapsed
+        self.overhead = max(time.perf_counter() - start - elapsed / self.workers, 0)
+        return np.concatenate([mask for (mask, duration) in results])
+
+
+if __name__ == "__main__":
+    from .sweepandprune import SweepAndPrune
+    import random
+
+    def polygons(n, size=1, width=60):
+        """Return random convex and concave forms spread in a square."""
+        random.seed(0)
+        forms = []
+        for i in range(n):
+            x, y = random.uniform(0, width), random.uniform(0, width)
+            k = random.randint(5, 12)
+            angles = sorted(random.uniform(0, 2 * math.pi) for j in range(k))
+            radiuses = [size if i % 2 else random.uniform(size / 3, size) for j in range(k)]
+            points = [(x + r * math.cos(a), y + r * math.sin(a)) for (r, a) in zip(radiuses, angles)]
+            forms.append(FormAnatomy.createFromTuples(points))
+        return forms
+
+    for n in [1000, 4000]:
+        forms = polygons(n)
+        boxes = {i: form.bbox for (i, form) in enumerate(forms)}
+        pairs = SweepAndPrune().pairs(boxes)
+        print("{} forms, {} pairs of overlapping boxes, {} cores:".format(n, len(pairs), os.cpu_count()))
+
+        ti = time.time()
+        serial = np.array([forms[i].collide(forms[j]) for (i, j) in pairs])
+        ts = time.time() - ti
+        print("serial FormAnatomy.collide: {:.3f}s".format(ts))
+
+        vertices = [form.vertices for form in forms]
+        kinds = [CONVEX if forms[i].convex() and forms[j].convex() else POLYGON for (i, j) in pairs]
+        for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+            narrowphase = ParallelNarrowPhase(workers, min_pairs=0, adaptive=False)
+            narrowphase.collide(vertices, pairs, kinds)  # starts the processes and measures the rate
+            ti = time.time()
+            mask = narrowphase.collide(vertices, pairs, kinds)
+            tp = time.time() - ti
+            narrowphase.close()
+            assert (mask == serial).all()
+            where = "{} processes, {} chunks".format(workers, narrowphase.chunks) if workers > 1 else "packed, current process"
+            print("{}: {:.3f}s, speedup {:.2f}".format(where, tp, ts / tp))
+
+        narrowphase = ParallelNarrowPhase(max(2, os.cpu_count() or 1), min_pairs=0)
+        narrowphase.collide(vertices, pairs, kinds)
+        print("measured threshold: {:.0f} pairs".format(narrowphase.getThreshold()))
+        narrowphase.close()
@@ -70,11 +70,13 @@ class MaterialForm(Form):
         """Update the form by updating all its points."""
         for point in self.points:
             point.update(t)
+        self.touch()
 
     def rotate(self,angle=math.pi,center=Point(0,0)):
         """Rotate the form by rotating its points."""
         for point in self.points:
             point.rotate(angle,center)
+        self.touch()
 
 
     def getMass(self):
@@ -92,6 +94,7 @@ class MaterialForm(Form):
     def __setitem__(self,index,point):
         """Return the material point of number 'index'."""
         self.points[index]=point
+        self.touch()
 
     def getCenter(self):
         """Return the center of the material form."""
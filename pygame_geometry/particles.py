@@ -2,7 +2,9 @@ from .manager import Manager
 from .physics import Physics
 from .abstract import Point, Vector
 from .motion import Motion
+from .motionbatch import PhysicsBatch
 
+import numpy as np
 import math
 
 
@@ -67,9 +69,13 @@ class ParticleGroup:
         """Create n random particles."""
         return cls([Particle.random() for i in range(n)])
 
-    def __init__(self, particles):
-        """Create the particle group using the list of all particles."""
+    def __init__(self, particles, gravity=None):
+        """Create the particle group using the list of all particles and an
+        optional gravity engine, such as a Barnes Hut engine, which gives the
+        accelerations of the particles attracting each other."""
         self.particles = particles
+        self.gravity = gravity
+        self.batch = PhysicsBatch()
 
     def show(self, context):
         """Show all particles."""
@@ -82,11 +88,19 @@ class ParticleGroup:
 
     def update(self, dt):
         """Update the particle group."""
+        if self.gravity is not None:
+            self.attract()
         self.soloUpdate(dt)
 
     def soloUpdate(self, dt):
-        """Update all the particles independently of the others."""
+        """Update all the particles independently of the others, the motions
+        of the particles being integrated together in batches."""
+        batched = [particle for particle in self.particles if type(particle).update is Physics.update]
+        rest = self.batch.update(batched, dt)
         for particle in self.particles:
+            if type(particle).update is not Physics.update:
+                particle.update(dt)
+        for particle in rest:
             particle.update(dt)
 
     def updateFromSpin(self):
@@ -96,17 +110,34 @@ class ParticleGroup:
         raise NotImplementedError
 
     def attract(self):
-        """Attract a particle to another."""
-        # p=m1*v1=m2*v2
-        # a=m1*v1**2=m2*v2**2
+        """Make the particles attract each other, by giving the accelerations
+        of the gravity engine as the field of the batch of the particles. If
+        the particles do not all fit in a single batch, they get their
+        accelerations directly."""
+        batched = [particle for particle in self.particles if type(particle).update is Physics.update]
+        groups = self.batch.getGroups(batched)
+        if len(batched) == len(self.particles) and len(groups) == 1 and not self.batch.rest:
+            self.batch.field = self.gravity.getField([particle.mass for particle in batched])
+        else:
+            self.batch.field = None
+            for (particle, acceleration) in zip(self.particles, self.getAccelerations()):
+                particle.motion.acceleration = Vector(*acceleration)
+
+    def getAccelerations(self):
+        """Return the (n, 2) array of the accelerations of the particles
+        attracting each other."""
+        positions = np.array([list(particle.position)[:2] for particle in self.particles], dtype=float)
+        masses = np.array([particle.mass for particle in self.particles], dtype=float)
+        return self.gravity(positions, masses)
 
     def getDistance(self, p1, p2):
         """Return the distance between p1 and p2."""
         return math.sqrt((p1.x - p2.x)**2 + (p1.y - p2.y)**2)
 
     def getDistances(self, p1, ps):
-        """"Return the distances of the particles from p1."""
-        return [self.getDistance(p1, ps) for p in ps]
+        """"Return the array of the distances of the particles from p1."""
+        positions = np.array([list(p.position)[:2] for p in ps], dtype=float)
+        return np.hypot(positions[:, 0] - p1.x, positions[:, 1] - p1.y)
 
 
 class ParticlesManager(Manager):
@@ -2,17 +2,22 @@ from .window import Window
 from . import colors
 
 from pygame.locals import *
+import pygame
 
 import math
 import numpy as np
 
 class Plane:
-    def __init__(self,theme={},view=None, zoom_sensibility=0.1, move_sensibility=0.05):
+    def __init__(self,theme={},view=None, zoom_sensibility=0.1, move_sensibility=0.05, grid_cache=True):
         """Create a plane using optionals theme and view."""
         self.createTheme(theme)
         self.createView(view)
         self.zoom_sensibility = zoom_sensibility
         self.move_sensibility = move_sensibility
+        self.grid_cache = grid_cache
+        self.grid_layer = None #surface of the grids which is kept while the zoom is the same
+        self.grid_key = None   #units, window size and theme of the grid layer
+        self.grid_offset = None #screen position of the origin of the plane in the grid layer
 
     def createTheme(self,theme={}):
         """Initializes the position and the colors for the view of the plane using optional theme."""
@@ -37,6 +42,7 @@ class Plane:
             self.default_units=    [40,40]   #units of the conversion from window/plane
             self.position=         [ 0, 0]
             self.units=            [40,40]   #units can be handled [-10**-14,10**307] before bugging or crashing
+        self.view_key=None #position, units and window size of the cached conversion to the screen
 
     def __call__(self,window): #The main loop must be redefined by the client and not the functions called within it.
         """Main loop of the plane."""
@@ -139,10 +145,74 @@ class Plane:
 
     def showGrids(self,window,nscale=None):
         """Show the grid using the window and optional scales."""
+        if self.grid_cache:
+            self.updateGridLayer(window,nscale)
+            window.screen.blit(self.grid_layer,(0,0))
+            return
         ascale=self.getScale(window) #ascale like actual_scale
         for scale in self.getScales(window,nscale,ascale):
             self.showGrid(window,scale)
 
+    def updateGridLayer(self,window,nscale=None):
+        """Update the surface of the grids for the actual view. It is drawn
+        again only when the zoom, the size of the window or the theme changed.
+        When the plane only moved by a whole number of pixels, it is scrolled
+        and only the strips uncovered are drawn, otherwise the lines would not
+        fall on the same pixels, so it is drawn again."""
+        self.getView(window)
+        sx,sy,ox,oy=self.view_affine
+        wsx,wsy=window.size
+        theme=(self.theme["background"],tuple(self.theme["grid color"]),nscale or self.theme["grid nscale"])
+        key=(sx,sy,wsx,wsy,theme)
+        if self.grid_key!=key:
+            self.grid_key=key
+            self.grid_layer=pygame.Surface((wsx,wsy))
+            self.grid_layer.set_colorkey(self.theme["background"])
+            self.grid_offset=(ox,oy)
+            self.drawGridLayer(window,nscale,self.grid_layer.get_rect())
+            return
+        dx=round(ox-self.grid_offset[0])
+        dy=round(oy-self.grid_offset[1])
+        if abs(ox-self.grid_offset[0]-dx)>1e-9 or abs(oy-self.grid_offset[1]-dy)>1e-9:
+            self.grid_offset=(ox,oy)
+            self.drawGridLayer(window,nscale,self.grid_layer.get_rect())
+            return
+        if dx==0 and dy==0:
+            return
+        self.grid_offset=(ox,oy)
+        if abs(dx)>=wsx or abs(dy)>=wsy:
+            self.drawGridLayer(window,nscale,self.grid_layer.get_rect())
+            return
+        self.grid_layer.scroll(dx,dy)
+        if dx:
+            self.drawGridLayer(window,nscale,pygame.Rect(0 if dx>0 else wsx+dx,0,abs(dx),wsy))
+        if dy:
+            self.drawGridLayer(window,nscale,pygame.Rect(0,0 if dy>0 else wsy+dy,wsx,abs(dy)))
+
+    def drawGridLayer(self,window,nscale,rect):
+        """Draw the grids in the rectangle of the grid layer."""
+        layer=self.grid_layer
+        sx,sy,_,_=self.view_affine
+        ox,oy=self.grid_offset
+        wsx,wsy=window.size
+        layer.set_clip(rect)
+        layer.fill(self.theme["background"])
+        #Plane's coordonnates of the rectangle, a line being drawn at the floor of its screen position, which moves along with the scrolls even when it is negative.
+        xmin,xmax=(rect.left-ox)/sx,(rect.right+1-ox)/sx
+        ymin,ymax=(rect.bottom+1-oy)/sy,(rect.top-oy)/sy
+        ascale=self.getScale(window)
+        #The small epsilon keeps the lines which fall exactly on a pixel on it despite the rounding errors of the scrolls.
+        for scale in self.getScales(window,nscale,ascale):
+            color=self.getUnitsColor(scale,ascale)
+            step=10**scale
+            for x in np.arange(math.floor(xmin/step),math.ceil(xmax/step)+1)*step:
+                X=math.floor(x*sx+ox+1e-6)
+                window.draw.line(layer,color,(X,0),(X,wsy),1)
+            for y in np.arange(math.floor(ymin/step),math.ceil(ymax/step)+1)*step:
+                Y=math.floor(y*sy+oy+1e-6)
+                window.draw.line(layer,color,(0,Y),(wsx,Y),1)
+        layer.set_clip(None)
+
     def getScales(self,window,nscale=None,scale=None):
         """Return the scales ."""
         if not nscale: nscale=self.theme["grid nscale"]
@@ -195,39 +265,56 @@ class Plane:
         """Allow the user to zoom into the plane according to the y component."""
         self.units[1]*=zoom
 
-    def getToScreen(self,position,window):
-        """Return a screen position using a position in the plane."""
-        x,y=position
+    def getView(self,window):
+        """Return the scales and the offsets of the affine conversion from the
+        plane to the screen, which are computed again only when the position,
+        the units or the size of the window changed."""
         px,py=self.position
         ux,uy=self.units
         wsx,wsy=window.size
-        x=int((x-px)*ux+wsx/2)
-        y=int(wsy/2-(y-py)*uy)
-        return [x,y]
+        key=(px,py,ux,uy,wsx,wsy)
+        if self.view_key!=key:
+            self.view_key=key
+            self.view_affine=(float(ux),float(-uy),float(wsx/2-px*ux),float(wsy/2+py*uy))
+            self.view_scale=np.array(self.view_affine[:2])
+            self.view_offset=np.array(self.view_affine[2:])
+        return (self.view_scale,self.view_offset)
+
+    def getToScreen(self,position,window):
+        """Return a screen position using a position in the plane."""
+        x,y=position
+        self.getView(window)
+        sx,sy,ox,oy=self.view_affine
+        return [int(x*sx+ox),int(y*sy+oy)]
+
+    def getArrayToScreen(self,positions,window):
+        """Return the (n,2) array of the screen positions using the (n,2) array
+        of the plane positions, converted at once."""
+        scale,offset=self.getView(window)
+        positions=np.asarray(positions,dtype=float).reshape(-1,2)
+        return (positions*scale+offset).astype(np.int64)
 
     def getAllToScreen(self,positions,window):
         """Return the list of screen positions using the list of plane positions."""
-        screen_positions=[]
-        for position in positions:
-            screen_positions.append(self.getToScreen(position,window))
-        return screen_positions
+        return self.getArrayToScreen(positions,window).tolist()
 
     def getFromScreen(self,position,window):
         """Return a plane position using a position in the screen."""
         x,y=position
-        px,py=self.position
-        ux,uy=self.units
-        wsx,wsy=window.size
-        x=(x-wsx/2)/ux+px
-        y=(wsy/2-y)/uy+py
-        return [x,y]
-
-    def getAllFromScreen(self,position,window):
+        self.getView(window)
+        sx,sy,ox,oy=self.view_affine
+        return [(x-ox)/sx,(y-oy)/sy]
+
+    def getArrayFromScreen(self,positions,window):
+        """Return the (n,2) array of the plane positions using the (n,2) array
+        of the screen positions, converted at once."""
+        scale,offset=self.getView(window)
+        positions=np.asarray(positions,dtype=float).reshape(-1,2)
+        return (positions-offset)/scale
+
+    def getAllFromScreen(self,positions,window):
         """Return the list of plane positions using the list of screen positions."""
-        plane_positions=[]
-        for position in positions:
-            planes_positions.append(self.getFromScreen(position,window))
-        return plane_positions
+        return self.getArrayFromScreen(positions,window).tolist()
 
     def getCorners(self,window):
         """Return the corners of the present view."""
@@ -8,6 +8,7 @@ import numpy as np
 
 import operator
 import random
+import heapq
 import math
 import copy
 
@@ -349,11 +350,294 @@ class QuadTree:
         return points
 
 
+class QuadNode:
+    """Node of a dynamic quadtree, which is the square of center (x, y) and
+    of half side 'half'. A leaf holds the keys of its points, an internal
+    node holds its 4 children in the order top left, top right, bottom left
+    and bottom right."""
+
+    __slots__ = ("x", "y", "half", "parent", "children", "keys", "count")
+
+    def __init__(self):
+        """Create an empty node, which is set when taken from the pool."""
+        self.children = None
+        self.keys = []
+        self.count = 0
+
+    def set(self, x, y, half, parent):
+        """Set the square and the parent of the node."""
+        self.x, self.y, self.half, self.parent = x, y, half, parent
+        self.children = None
+        self.keys.clear()
+        self.count = 0
+
+    def contains(self, x, y):
+        """Determine if the position is in the square of the node."""
+        return abs(x - self.x) <= self.half and abs(y - self.y) <= self.half
+
+    def quadrant(self, x, y):
+        """Return the index of the child in which the position goes."""
+        return (x > self.x) + 2 * (y <= self.y)
+
+    def distance2(self, x, y):
+        """Return the squared distance between the position and the square."""
+        dx = max(abs(x - self.x) - self.half, 0)
+        dy = max(abs(y - self.y) - self.half, 0)
+        return dx * dx + dy * dy
+
+
+class DynamicQuadTree:
+    """Quadtree that is updated incrementally instead of being rebuilt. The
+    points are identified by keys, inserting, removing and moving one costs
+    O(log n), and a moving point is only relocated when it leaves the square
+    of its leaf. The nodes that are released by merges are kept in a pool to
+    be reused by the next splits, and the root grows when a point leaves it."""
+
+    @classmethod
+    def random(cls, n, **kwargs):
+        """Create a dynamic quadtree of 'n' random points."""
+        tree = cls(**kwargs)
+        for i in range(n):
+            tree.insert(i, (random.uniform(-1, 1), random.uniform(-1, 1)))
+        return tree
+
+    def __init__(self, position=(0, 0), half=1, capacity=8, min_size=1e-9, color=colors.WHITE):
+        """Create an empty dynamic quadtree using the center and the half side
+        of its root square, the number of points a leaf holds before it is
+        split and the half side under which the leaves are not split anymore."""
+        self.capacity = capacity
+        self.min_size = min_size
+        self.color = color
+        self.pool = []
+        self.positions = {}
+        self.leaves = {}
+        self.root = self.allocate(position[0], position[1], half, None)
+
+    def __len__(self):
+        """Return the number of points."""
+        return len(self.positions)
+
+    def __contains__(self, key):
+        """Determine if the key is in the quadtree."""
+        return key in self.positions
+
+    def __str__(self):
+        """Return the string representation of the quadtree."""
+        return type(self).__name__ + "(" + str(len(self)) + " points)"
+
+    def allocate(self, x, y, half, parent):
+        """Return a node of the pool or a new one."""
+        node = self.pool.pop() if self.pool else QuadNode()
+        node.set(x, y, half, parent)
+        return node
+
+    def release(self, node):
+        """Put the node and its descendants back in the pool."""
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.children:
+                stack.extend(node.children)
+            node.children = None
+            node.parent = None
+            node.keys.clear()
+            self.pool.append(node)
+
+    def getPosition(self, key):
+        """Return the position of the point of the key."""
+        return self.positions[key]
+
+    def grow(self, x, y):
+        """Double the root until it contains the position."""
+        while not self.root.contains(x, y):
+            old = self.root
+            h = old.half
+            cx = old.x + (h if x > old.x else -h)
+            cy = old.y + (h if y > old.y else -h)
+            root = self.allocate(cx, cy, 2 * h, None)
+            root.children = [self.allocate(cx + dx * h, cy + dy * h, h, root)
+                             for (dx, dy) in [(-1, 1), (1, 1), (-1, -1), (1, -1)]]
+            i = root.quadrant(old.x, old.y)
+            self.release(root.children[i])
+            root.children[i] = old
+            old.parent = root
+            root.count = old.count
+            self.root = root
+
+    def insert(self, key, position):
+        """Insert a point using its key and its position."""
+        if key in self.positions:
+            raise KeyError("The key " + str(key) + " is already in the quadtree.")
+        x, y = position[0], position[1]
+        self.positions[key] = (x, y)
+        self.grow(x, y)
+        self.place(self.root, key, x, y)
+
+    def place(self, node, key, x, y):
+        """Put the point in the leaf under the node that contains it."""
+        while node.children:
+            node.count += 1
+            node = node.children[node.quadrant(x, y)]
+        node.count += 1
+        node.keys.append(key)
+        self.leaves[key] = node
+        if len(node.keys) > self.capacity and node.half > self.min_size:
+            self.split(node)
+
+    def split(self, node):
+        """Split a leaf in 4 children and distribute its points."""
+        h = node.half / 2
+        node.children = [self.allocate(node.x + dx * h, node.y + dy * h, h, node)
+                         for (dx, dy) in [(-1, 1), (1, 1), (-1, -1), (1, -1)]]
+        keys, node.keys = node.keys, []
+        for key in keys:
+            x, y = self.positions[key]
+            child = node.children[node.quadrant(x, y)]
+            child.count += 1
+            child.keys.append(key)
+            self.leaves[key] = child
+        for child in node.children:
+            if len(child.keys) > self.capacity and child.half > self.min_size:
+                self.split(child)
+
+    def remove(self, key):
+        """Remove the point of the key and return its position."""
+        position = self.positions.pop(key)
+        node = self.leaves.pop(key)
+        node.keys.remove(key)
+        merge = None
+        while node:
+            node.count -= 1
+            if node.children and node.count <= self.capacity:
+                merge = node
+            node = node.parent
+        if merge:
+            self.merge(merge)
+        return position
+
+    def merge(self, node):
+        """Gather all the points under the node in it, which becomes a leaf."""
+        keys = []
+        stack = list(node.children)
+        while stack:
+            child = stack.pop()
+            if child.children:
+                stack.extend(child.children)
+            keys.extend(child.keys)
+        for child in node.children:
+            self.release(child)
+        node.children = None
+        node.keys = keys
+        for key in keys:
+            self.leaves[key] = node
+
+    def move(self, key, position):
+        """Move the point of the key to a new position. The point is only
+        relocated when it leaves the square of its leaf."""
+        x, y = position[0], position[1]
+        if self.leaves[key].contains(x, y):
+            self.positions[key] = (x, y)
+        else:
+            self.remove(key)
+            self.insert(key, (x, y))
+
+    def update(self, positions):
+        """Move the points using a dictionary of keys and positions."""
+        for (key, position) in positions.items():
+            self.move(key, position)
+
+    def clear(self):
+        """Remove all the points."""
+        self.release(self.root)
+        self.positions.clear()
+        self.leaves.clear()
+        self.root = self.allocate(self.root.x, self.root.y, self.root.half, None)
+
+    def nodes(self):
+        """Iterate the nodes of the quadtree."""
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            yield node
+            if node.children:
+                stack.extend(node.children)
+
+    def queryRange(self, xmin, ymin, xmax, ymax):
+        """Return the keys of the points in the rectangle."""
+        keys = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            h = node.half
+            if node.x + h < xmin or node.x - h > xmax or node.y + h < ymin or node.y - h > ymax:
+                continue
+            if node.children:
+                stack.extend(node.children)
+            else:
+                for key in node.keys:
+                    x, y = self.positions[key]
+                    if xmin <= x <= xmax and ymin <= y <= ymax:
+                        keys.append(key)
+        return keys
+
+    def queryCircle(self, x, y, radius):
+        """Return the keys of the points in the circle."""
+        keys = []
+        r2 = radius * radius
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node.distance2(x, y) > r2:
+                continue
+            if node.children:
+                stack.extend(node.children)
+            else:
+                for key in node.keys:
+                    px, py = self.positions[key]
+                    if (px - x) ** 2 + (py - y) ** 2 <= r2:
+                        keys.append(key)
+        return keys
+
+    def nearest(self, x, y, k=1):
+        """Return the keys of the 'k' nearest points of the position, from the
+        nearest to the farthest, using a best first search."""
+        heap = [(0, 0, self.root)]
+        counter = 1
+        keys = []
+        while heap and len(keys) < k:
+            d2, i, item = heapq.heappop(heap)
+            if isinstance(item, QuadNode):
+                if item.children:
+                    for child in item.children:
+                        if child.count:
+                            heapq.heappush(heap, (child.distance2(x, y), counter, child))
+                            counter += 1
+                else:
+                    for key in item.keys:
+                        px, py = self.positions[key]
+                        heapq.heappush(heap, ((px - x) ** 2 + (py - y) ** 2, counter, (key,)))
+                        counter += 1
+            else:
+                keys.append(item[0])
+        return keys
+
+    def show(self, context):
+        """Show the leaves of the quadtree and its points."""
+        for node in self.nodes():
+            if not node.children:
+                x, y, h = node.x, node.y, node.half
+                points = [(x - h, y + h), (x + h, y + h), (x + h, y - h), (x - h, y - h)]
+                context.draw.lines(context.screen, self.color, points, True)
+        for (x, y) in self.positions.values():
+            context.draw.circle(context.screen, self.color, (x, y), 0.01)
+
+
 if __name__ == "__main__":
     from .manager import Manager
     from .motion import Motion
 
     import time
+    import sys
 
     class QuadtreeManager(Manager):
         @classmethod
@@ -382,12 +666,16 @@ if __name__ == "__main__":
             """Create a quadtree manager using the quadtree."""
             super().__init__(name=name,**kwargs)
             self.motions=motions
+            self.quadtree=DynamicQuadTree(capacity=1)
+            for (i,point) in enumerate(self.points):
+                self.quadtree.insert(i,point)
 
         def update(self):
-            """Update the motions and in consequence the quadtree."""
+            """Update the motions and in consequence the quadtree, in which
+            only the points that change of leaf are relocated."""
             self.updateMotions()
-            self.quadtree=QuadTree(self.points)
-            self.quadtree.compute()
+            for (i,point) in enumerate(self.points):
+                self.quadtree.move(i,point)
 
         def updateMotions(self):
             """Update the motions."""
@@ -403,10 +691,42 @@ if __name__ == "__main__":
             """Return the points at the positions of the motions."""
             return [Point(*m.position) for m in self.motions]
 
-    t=time.time()
-    qm=QuadtreeTester.random(n=200,fullscreen=True)
-    qm()
-    print(time.time()-t)
+    def benchmark(frames=5):
+        """Compare the rebuilding of the quadtrees at each frame with the
+        incremental update of a dynamic quadtree, for moving points."""
+        for n in [10**4,10**5]:
+            positions=np.random.uniform(-1,1,(n,2))
+            velocities=np.random.uniform(-1,1,(n,2))*1e-3
+            tree=DynamicQuadTree()
+            for (i,p) in enumerate(positions.tolist()):
+                tree.insert(i,p)
+            times={"QuadTree rebuild":0,"DynamicQuadTree rebuild":0,"DynamicQuadTree update":0}
+            for frame in range(frames):
+                positions+=velocities
+                ps=positions.tolist()
+                t=time.time()
+                quadtree=QuadTree([Point(*p) for p in ps])
+                quadtree.compute()
+                times["QuadTree rebuild"]+=time.time()-t
+                t=time.time()
+                rebuilt=DynamicQuadTree()
+                for (i,p) in enumerate(ps):
+                    rebuilt.insert(i,p)
+                times["DynamicQuadTree rebuild"]+=time.time()-t
+                t=time.time()
+                for (i,p) in enumerate(ps):
+                    tree.move(i,p)
+                times["DynamicQuadTree update"]+=time.time()-t
+            assert sorted(tree.queryCircle(0,0,0.1))==sorted(rebuilt.queryCircle(0,0,0.1))
+            print("n={}: ".format(n)+", ".join("{} {:.3f}s".format(k,v/frames) for (k,v) in times.items())+" per frame")
+
+    if "--benchmark" in sys.argv:
+        benchmark()
+    else:
+        t=time.time()
+        qm=QuadtreeTester.random(n=200,fullscreen=True)
+        qm()
+        print(time.time()-t)
     # n=500
     # q=QuadTree.random(n=n)
     # q.compute()
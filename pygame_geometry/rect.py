@@ -121,8 +121,8 @@ class Rect:
         x1, y1, x2, y2 = corners
         self.w = x2 - x1
         self.h = y2 - y1
-        self.x = x1 - self.w / 2
-        self.y = y1 - self.w / 2
+        self.x = x1 + self.w / 2
+        self.y = y1 + self.h / 2
 
     # coordinates
     def getCoordinates(self):
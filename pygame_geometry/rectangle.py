@@ -92,7 +92,12 @@ class Rectangle(Rect, Form):
         ymax = max([p.y for p in points])
         self.corners = [xmin, ymin, xmax, ymax]
 
+    def getVersion(self):
+        """Return the components of the rectangle, which change with its points."""
+        return tuple(self.components)
+
     points = property(getPoints, setPoints, doc="Points of the rectangle.")
+    version = property(getVersion, doc="Version of the points of the rectangle.")
     center = property(Form.getCenter, Form.setCenter, doc="Point of the center.")
 
 
@@ -0,0 +1,92 @@
+import math
+
+
+class SpatialHash:
+    """Uniform grid hashed in a dictionary, used as a broad phase to find the
+    pairs of objects that may collide. Each object is given by its bounding
+    box and is stored in all the cells it overlaps, so only the objects that
+    share a cell are paired. With cells as large as the biggest object, each
+    object overlaps at most 4 cells."""
+
+    @classmethod
+    def createFromRadiuses(cls, radiuses):
+        """Create a spatial hash which cells are as large as the diameter of
+        the biggest circle."""
+        return cls(2 * max(radiuses, default=0) or 1)
+
+    def __init__(self, size=1):
+        """Create a spatial hash using the size of its cells."""
+        self.size = size
+        self.cells = {}
+        self.ranges = []
+
+    def __len__(self):
+        """Return the number of objects."""
+        return len(self.ranges)
+
+    def clear(self):
+        """Remove all the objects."""
+        self.cells.clear()
+        self.ranges.clear()
+
+    def range(self, bbox):
+        """Return the indices (imin, jmin, imax, jmax) of the cells that a
+        bounding box (xmin, ymin, xmax, ymax) overlaps."""
+        s = self.size
+        return (math.floor(bbox[0] / s), math.floor(bbox[1] / s), math.floor(bbox[2] / s), math.floor(bbox[3] / s))
+
+    def insert(self, bbox, group=0):
+        """Insert an object using its bounding box and an optional group, and
+        return its index."""
+        index = len(self.ranges)
+        imin, jmin, imax, jmax = r = self.range(bbox)
+        self.ranges.append((r, group))
+        for i in range(imin, imax + 1):
+            for j in range(jmin, jmax + 1):
+                self.cells.setdefault((i, j), []).append(index)
+        return index
+
+    def insertCircle(self, x, y, radius, group=0):
+        """Insert a circle and return its index."""
+        return self.insert((x - radius, y - radius, x + radius, y + radius), group)
+
+    def pairs(self, crossed=False):
+        """Yield the pairs of indices of the objects that share a cell, each
+        pair only once. If 'crossed' is true, only the pairs of objects of
+        different groups are yielded."""
+        ranges = self.ranges
+        for (cell, indices) in self.cells.items():
+            for (k, a) in enumerate(indices):
+                (ra, ga) = ranges[a]
+                for b in indices[k + 1:]:
+                    (rb, gb) = ranges[b]
+                    if crossed and ga == gb:
+                        continue
+                    # The pair is only yielded in the first cell both objects share.
+                    if cell == (max(ra[0], rb[0]), max(ra[1], rb[1])):
+                        yield (a, b)
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    for n in [100, 1000, 5000]:
+        circles = [(random.uniform(0, 100), random.uniform(0, 100), random.uniform(0.1, 0.5)) for i in range(n)]
+        ti = time.time()
+        brute = [(a, b) for a in range(n) for b in range(a + 1, n)
+                 if math.hypot(circles[a][0] - circles[b][0], circles[a][1] - circles[b][1])
+                 < circles[a][2] + circles[b][2]]
+        tb = time.time() - ti
+        ti = time.time()
+        grid = SpatialHash.createFromRadiuses([c[2] for c in circles])
+        for (x, y, r) in circles:
+            grid.insertCircle(x, y, r)
+        candidates = list(grid.pairs())
+        found = [(a, b) for (a, b) in candidates
+                 if math.hypot(circles[a][0] - circles[b][0], circles[a][1] - circles[b][1])
+                 < circles[a][2] + circles[b][2]]
+        tg = time.time() - ti
+        assert sorted(found) == sorted(brute)
+        print("n={}: {} collisions, brute force {} pairs in {:.3f}s, grid {} pairs in {:.3f}s".format(
+            n, len(brute), n * (n - 1) // 2, tb, len(candidates), tg))
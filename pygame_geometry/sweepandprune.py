@@ -0,0 +1,85 @@
+class SweepAndPrune:
+    """Broad phase that sorts the bounding boxes of the objects by their
+    minimum on the x axis and only pairs the objects which intervals on the x
+    axis overlap, and then which boxes overlap. The order of the objects is
+    kept from one call to the next, so that when the objects move a little it
+    is already nearly sorted and sorting it again costs nearly O(n)."""
+
+    def __init__(self):
+        """Create a sweep and prune with no objects."""
+        self.order = []
+
+    def __len__(self):
+        """Return the number of objects of the last call."""
+        return len(self.order)
+
+    def clear(self):
+        """Forget the order of the objects."""
+        self.order.clear()
+
+    def sort(self, boxes):
+        """Update the order of the ids using the dictionary of the bounding
+        boxes (xmin, ymin, xmax, ymax) of the objects of the ids. The ids that
+        are not in the dictionary anymore are removed and the new ones are
+        added at the end before sorting again. The sort of python is adaptive,
+        it only needs one pass over an order that is still nearly sorted."""
+        order = [id for id in self.order if id in boxes]
+        if len(order) != len(boxes):
+            known = set(order)
+            order.extend(id for id in boxes if id not in known)
+        order.sort(key=lambda id: boxes[id][0])
+        self.order = order
+        return order
+
+    def pairs(self, boxes, groups=None):
+        """Return the pairs of ids of the objects which boxes overlap, using
+        the dictionary of the bounding boxes of the ids. If the dictionary of
+        the groups of the ids is given, only the pairs of objects of different
+        groups are returned."""
+        order = self.sort(boxes)
+        pairs = []
+        n = len(order)
+        for i in range(n):
+            id1 = order[i]
+            xmin1, ymin1, xmax1, ymax1 = boxes[id1]
+            for j in range(i + 1, n):
+                id2 = order[j]
+                xmin2, ymin2, xmax2, ymax2 = boxes[id2]
+                if xmin2 > xmax1:
+                    # The next objects start even farther on the x axis.
+                    break
+                if ymin2 > ymax1 or ymin1 > ymax2:
+                    continue
+                if groups is None or groups[id1] != groups[id2]:
+                    pairs.append((id1, id2))
+        return pairs
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    for n in [100, 1000, 5000]:
+        positions = {i: [random.uniform(0, 100), random.uniform(0, 100)] for i in range(n)}
+        sweep = SweepAndPrune()
+        frames = 10
+        ts = tb = 0
+        for frame in range(frames):
+            for p in positions.values():
+                p[0] += random.uniform(-0.1, 0.1)
+                p[1] += random.uniform(-0.1, 0.1)
+            boxes = {i: (x - 0.5, y - 0.5, x + 0.5, y + 0.5) for (i, (x, y)) in positions.items()}
+            ti = time.time()
+            pairs = sweep.pairs(boxes)
+            ts += time.time() - ti
+            if n <= 1000:
+                ti = time.time()
+                brute = [(i, j) for i in range(n) for j in range(i + 1, n)
+                         if not (boxes[j][0] > boxes[i][2] or boxes[i][0] > boxes[j][2]
+                                 or boxes[j][1] > boxes[i][3] or boxes[i][1] > boxes[j][3])]
+                tb += time.time() - ti
+                assert sorted(tuple(sorted(p)) for p in pairs) == brute
+        line = "n={}: {} pairs, sweep and prune {:.4f}s per frame".format(n, len(pairs), ts / frames)
+        if n <= 1000:
+            line += ", all the pairs {:.4f}s per frame".format(tb / frames)
+        print(line)
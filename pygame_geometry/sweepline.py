@@ -0,0 +1,197 @@
+import heapq
+
+
+class SweepLine:
+    """Bentley-Ottmann sweep line that reports all the intersections of a set
+    of segments, n being the number of segments and k the number of
+    intersections. A vertical line sweeps the plane from left to right,
+    keeping the segments it crosses sorted by height, so that only neighbours
+    are tested. The events are taken from a heap and found in the status by
+    binary search in O(log(n)), but the status is a list, whose insertions
+    and deletions move the segments after them in O(s), s being the number of
+    segments crossing the line. The sweep takes O((n+k)(log(n)+s)), which is
+    O((n+k)n) in the worst case, and the moves are a single copy of memory.
+    The segments can be given as abstract segments, as pairs of points or as
+    4-tuples (x1, y1, x2, y2)."""
+
+    @staticmethod
+    def coordinates(segment):
+        """Return the 4-tuple (x1, y1, x2, y2) of a segment given in any of the
+        supported formats."""
+        if hasattr(segment, "p1"):
+            p1, p2 = segment.p1, segment.p2
+            return (p1[0], p1[1], p2[0], p2[1])
+        if len(segment) == 2:
+            p1, p2 = segment
+            return (p1[0], p1[1], p2[0], p2[1])
+        return tuple(segment[:4])
+
+    @staticmethod
+    def intersection(a, b, e=1e-9):
+        """Return the point of intersection of 2 segments given as 4-tuples, or
+        None if they are parallel or do not cross. The points close to the end
+        points are snapped to them so that the sweep line finds them again."""
+        x1, y1, x2, y2 = a
+        x3, y3, x4, y4 = b
+        dx1, dy1 = x2 - x1, y2 - y1
+        dx2, dy2 = x4 - x3, y4 - y3
+        d = dx1 * dy2 - dy1 * dx2
+        if d == 0:
+            return None
+        t = ((x3 - x1) * dy2 - (y3 - y1) * dx2) / d
+        u = ((x3 - x1) * dy1 - (y3 - y1) * dx1) / d
+        if not (-e <= t <= 1 + e and -e <= u <= 1 + e):
+            return None
+        if t <= e:
+            return (x1, y1)
+        if t >= 1 - e:
+            return (x2, y2)
+        if u <= e:
+            return (x3, y3)
+        if u >= 1 - e:
+            return (x4, y4)
+        return (x1 + t * dx1, y1 + t * dy1)
+
+    def __init__(self, segments, e=1e-9):
+        """Create the sweep line using the segments and a precision 'e'."""
+        self.e = e
+        self.segments = []
+        for segment in segments:
+            x1, y1, x2, y2 = map(float, SweepLine.coordinates(segment))
+            if (x2, y2) < (x1, y1):
+                x1, y1, x2, y2 = x2, y2, x1, y1
+            self.segments.append((x1, y1, x2, y2))
+
+    def __len__(self):
+        """Return the number of segments."""
+        return len(self.segments)
+
+    def height(self, i, x, y):
+        """Return the height of the segment of index 'i' at the abscissa 'x'.
+        A vertical segment is at the height 'y' of the event point."""
+        x1, y1, x2, y2 = self.segments[i]
+        if x1 == x2:
+            return y
+        return y1 + (x - x1) * (y2 - y1) / (x2 - x1)
+
+    def slope(self, i):
+        """Return the slope of the segment of index 'i', which is infinite for
+        vertical segments so that they come last."""
+        x1, y1, x2, y2 = self.segments[i]
+        if x1 == x2:
+            return float("inf")
+        return (y2 - y1) / (x2 - x1)
+
+    def lower(self, status, x, y):
+        """Return the index of the first segment of the status that is not
+        strictly under the point (x, y)."""
+        lo, hi = 0, len(status)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.height(status[mid], x, y) < y - self.e:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def intersections(self):
+        """Yield the points of intersection in the order of the sweep, along
+        with the sorted tuple of the indices of the segments passing by them."""
+        e = self.e
+        starts = {}
+        points = {}
+        events = set()
+        for i, (x1, y1, x2, y2) in enumerate(self.segments):
+            if (x1, y1) == (x2, y2):
+                points.setdefault((x1, y1), []).append(i)
+            else:
+                starts.setdefault((x1, y1), []).append(i)
+            events.add((x1, y1))
+            events.add((x2, y2))
+        events = list(events)
+        heapq.heapify(events)
+        queued = set(events)
+        status = []
+        last = None
+
+        def schedule(i, j, p):
+            point = SweepLine.intersection(self.segments[i], self.segments[j], e)
+            if point is None or point <= p or point in queued:
+                return
+            if abs(point[0] - p[0]) <= e and abs(point[1] - p[1]) <= e:
+                return
+            queued.add(point)
+            heapq.heappush(events, point)
+
+        while events:
+            p = heapq.heappop(events)
+            queued.discard(p)
+            if last and abs(p[0] - last[0]) <= e and abs(p[1] - last[1]) <= e:
+                if p not in starts and p not in points:
+                    continue
+            last = p
+            x, y = p
+            upper = starts.get(p, [])
+            # The segments containing p are contiguous in the status.
+            i = j = self.lower(status, x, y)
+            while j < len(status) and self.height(status[j], x, y) <= y + e:
+                j += 1
+            containing = status[i:j]
+            crossing = upper + containing + points.get(p, [])
+            if len(crossing) > 1:
+                yield p, tuple(sorted(crossing))
+            # Reinsert the segments that continue after p in their new order.
+            continuing = [s for s in containing if (self.segments[s][2], self.segments[s][3]) != p
+                          and not (abs(self.segments[s][2] - x) <= e and abs(self.segments[s][3] - y) <= e)]
+            inserted = sorted(continuing + upper, key=self.slope)
+            status[i:j] = inserted
+            if inserted:
+                if i > 0:
+                    schedule(status[i - 1], status[i], p)
+                k = i + len(inserted)
+                if k < len(status):
+                    schedule(status[k - 1], status[k], p)
+            elif 0 < i < len(status):
+                schedule(status[i - 1], status[i], p)
+
+    def pairs(self):
+        """Yield the pairs of indices of the crossing segments, along with
+        their point of intersection."""
+        for p, indices in self.intersections():
+            for a in range(len(indices)):
+                for b in range(a + 1, len(indices)):
+                    yield indices[a], indices[b], p
+
+    def any(self):
+        """Determine if any of the segments are crossing."""
+        for p, indices in self.intersections():
+            return True
+        return False
+
+
+if __name__ == "__main__":
+    from .abstract import Segment
+    import random
+    import time
+
+    def quadratic(segments):
+        """Test every pair with the abstract segments."""
+        return sum(1 for i in range(len(segments)) for j in range(i + 1, len(segments))
+                   if segments[i].crossSegment(segments[j]))
+
+    for n in [10 ** 2, 10 ** 3, 10 ** 4, 10 ** 5]:
+        # Random short segments in a square of side 100.
+        tuples = []
+        for i in range(n):
+            x, y = random.uniform(0, 100), random.uniform(0, 100)
+            tuples.append((x, y, x + random.uniform(-1, 1), y + random.uniform(-1, 1)))
+        ti = time.time()
+        k = sum(1 for pair in SweepLine(tuples).pairs())
+        ts = time.time() - ti
+        line = "n={}: k={} sweep line {:.3f}s".format(n, k, ts)
+        if n <= 10 ** 3:
+            segments = [Segment.createFromTuples(t[:2], t[2:]) for t in tuples]
+            ti = time.time()
+            kq = quadratic(segments)
+            line += ", quadratic loops {:.3f}s (k={})".format(time.time() - ti, kq)
+        print(line)
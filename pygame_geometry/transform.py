@@ -0,0 +1,100 @@
+import numpy as np
+import math
+
+
+class AffineTransform:
+    """Affine transformation of the plane stored as a 2x3 matrix [A|t] which
+    maps a position p to A.p + t. Successive transformations are composed by
+    multiplying their matrices, and a transformation is applied to a whole
+    array of positions in a single pass."""
+
+    @classmethod
+    def identity(cls):
+        """Create the transformation that does nothing."""
+        return cls()
+
+    @classmethod
+    def createFromTranslation(cls, step):
+        """Create the translation of the given step."""
+        return cls([[1, 0, step[0]], [0, 1, step[1]]])
+
+    @classmethod
+    def createFromRotation(cls, angle, center=(0, 0)):
+        """Create the rotation of the given angle around the center."""
+        cos, sin = math.cos(angle), math.sin(angle)
+        x, y = center[0], center[1]
+        return cls([[cos, -sin, x - cos * x + sin * y], [sin, cos, y - sin * x - cos * y]])
+
+    @classmethod
+    def createFromScale(cls, factor, center=(0, 0)):
+        """Create the homothety of the given factor from the center."""
+        x, y = center[0], center[1]
+        return cls([[factor, 0, x - factor * x], [0, factor, y - factor * y]])
+
+    def __init__(self, matrix=None):
+        """Create an affine transformation using its 2x3 matrix, which is the
+        identity by default."""
+        if matrix is None:
+            matrix = [[1, 0, 0], [0, 1, 0]]
+        self.matrix = np.array(matrix, dtype=float)
+
+    def __str__(self):
+        """Return the string representation of the transformation."""
+        return "AffineTransform(" + str(self.matrix.round(3).tolist()) + ")"
+
+    def __eq__(self, other):
+        """Determine if both transformations have the same matrix."""
+        return np.array_equal(self.matrix, other.matrix)
+
+    def __matmul__(self, other):
+        """Return the transformation that applies the other one and then this one."""
+        a, t = self.matrix[:, :2], self.matrix[:, 2]
+        matrix = np.empty((2, 3))
+        matrix[:, :2] = a @ other.matrix[:, :2]
+        matrix[:, 2] = a @ other.matrix[:, 2] + t
+        return AffineTransform(matrix)
+
+    def then(self, other):
+        """Return the transformation that applies this one and then the other one."""
+        return other @ self
+
+    def __call__(self, positions):
+        """Return the transformed (n, 2) array of positions, or the transformed
+        position if a single one is given."""
+        positions = np.asarray(positions, dtype=float)
+        result = positions @ self.matrix[:, :2].T + self.matrix[:, 2]
+        if result.ndim == 1:
+            return tuple(result.tolist())
+        return result
+
+    def getInverse(self):
+        """Return the transformation that cancels this one."""
+        a = np.linalg.inv(self.matrix[:, :2])
+        return AffineTransform(np.column_stack((a, -a @ self.matrix[:, 2])))
+
+    def isIdentity(self):
+        """Determine if the transformation does nothing."""
+        return np.array_equal(self.matrix, [[1, 0, 0], [0, 1, 0]])
+
+    inverse = property(getInverse, doc="Transformation that cancels this one.")
+
+
+if __name__ == "__main__":
+    from .abstract import Form, Point
+    import time
+
+    for n in [10, 100, 1000]:
+        form = Form.random(n=n)
+        points = [Point(*p) for p in form.points]
+        ti = time.time()
+        for i in range(100):
+            for point in points:
+                point.rotate(0.01, Point(0, 0))
+                point.move(0.01, 0)
+        tp = time.time() - ti
+        ti = time.time()
+        for i in range(100):
+            form.rotate(0.01, Point(0, 0))
+            form.move((0.01, 0))
+        tf = time.time() - ti
+        print("n={}: 100 rotations and moves, point by point {:.4f}s, at once {:.4f}s".format(n, tp, tf))
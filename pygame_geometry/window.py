@@ -26,10 +26,23 @@ class Window:
                  text_color=WHITE,
                  background_color=BLACK,
                  fullscreen=False,
-                 build=True):
+                 build=True,
+                 dirty=False,
+                 dirty_threshold=0.5):
         """Create a window object using name, size text_font, text_size,
-        text_color, background and set."""
+        text_color, background and set.
+        In dirty mode, the window only updates the rectangles that were drawn
+        in the last two frames, restoring the ones of the last frame from the
+        background when it is cleared, unless they cover more than the
+        threshold of its area."""
         Window.made += 1
+        self.dirty = dirty
+        self.dirty_threshold = dirty_threshold
+        self.rects = []  # rectangles drawn during this frame
+        self.last_rects = []  # rectangles drawn during the last frame
+        self.background = None  # screen restored in the rectangles of the last frame
+        self.background_fill = None  # color of the background, None if it was set
+        self.full = True  # the whole screen must be cleared and updated
         self.number = Window.made
         self.name = name
         self.text_font = text_font
@@ -83,15 +96,72 @@ class Window:
         """Clear to background color."""
         if color is None:
             color = self.background_color
-        self.screen.fill(color)
+        if not self.dirty:
+            self.screen.fill(color)
+        elif self.background is None or self.background.get_size() != self.screen.get_size() \
+                or (self.background_fill is not None and self.background_fill != tuple(color)):
+            self.screen.fill(color)
+            self.background = self.screen.copy()
+            self.background_fill = tuple(color)
+            self.full = True
+        elif self.full:
+            self.screen.blit(self.background, (0, 0))
+        else:
+            for rect in self.last_rects:
+                self.screen.blit(self.background, rect, rect)
+
+    def setBackground(self):
+        """Keep the current screen as the background restored by the clears
+        of the dirty mode, such as a screen with a static decor."""
+        self.background = self.screen.copy()
+        self.background_fill = None
+        self.full = True
+
+    def invalidate(self):
+        """Clear and update the whole screen at the next frame, which is needed
+        when everything moves."""
+        self.full = True
+
+    def mark(self, rect):
+        """Record the rectangle of the screen that was drawn, and return it."""
+        if self.dirty and rect is not None:
+            self.rects.append(rect)
+        return rect
+
+    @staticmethod
+    def mergeRects(rects):
+        """Return the rectangles merged with the ones they collide with."""
+        merged = []
+        for rect in sorted(rects, key=lambda rect: rect.x):
+            i = rect.collidelist(merged)
+            while i >= 0:
+                rect = rect.union(merged.pop(i))
+                i = rect.collidelist(merged)
+            merged.append(rect)
+        return merged
 
     def flip(self):
         """Display on the screen the image considered."""
-        pygame.display.flip()
-
-    def update(self):
-        """Update the screen."""
-        pygame.display.update()
+        if not self.dirty:
+            pygame.display.flip()
+            return
+        screen = self.screen.get_rect()
+        rects = [rect.clip(screen) for rect in Window.mergeRects(self.last_rects + self.rects)]
+        area = sum(rect.w * rect.h for rect in rects)
+        if self.full or area > self.dirty_threshold * screen.w * screen.h:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+        self.last_rects = self.rects
+        self.rects = []
+        self.full = False
+
+    def update(self, rects=None):
+        """Update the screen, or only the rectangles if they are given."""
+        if rects is None:
+            pygame.display.update()
+        else:
+            pygame.display.update(rects)
 
     def screenshot(self, image=None, name=None):
         """Save an image using the image and the name.
@@ -293,7 +363,7 @@ class Window:
             a = color[3]
             surface.set_alpha(a)
             raise NotImplementedError("Transparency does not work properly in pygame")
-        self.screen.blit(surface, position)
+        return self.mark(self.screen.blit(surface, position))
 
     def setScreenMode(self, size=None):
         """Set the display for the screen to the right mode using its optional size."""
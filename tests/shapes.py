@@ -0,0 +1,62 @@
+"""Random shapes and brute force references shared by the tests."""
+
+import random
+import math
+
+
+def polygon(n, x=0, y=0, r=1, convex=False, rng=random):
+    """Return the positions of a random polygon of n points around (x, y),
+    which is star shaped, or convex if asked."""
+    angles = sorted(rng.uniform(0, 2 * math.pi) for i in range(n))
+    radiuses = [r if convex else rng.uniform(r / 3, r) for i in range(n)]
+    return [(x + d * math.cos(a), y + d * math.sin(a)) for (d, a) in zip(radiuses, angles)]
+
+
+def contains(positions, x, y):
+    """Determine if (x, y) is inside the polygon with the even odd rule."""
+    inside = False
+    n = len(positions)
+    for i in range(n):
+        (xi, yi), (xj, yj) = positions[i], positions[(i + 1) % n]
+        if (yi > y) != (yj > y) and x < (xj - xi) * (y - yi) / (yj - yi) + xi:
+            inside = not inside
+    return inside
+
+
+def cross(s1, s2):
+    """Determine if the segments ((x1, y1), (x2, y2)) properly cross."""
+    def orientation(p, q, r):
+        v = (q[0] - p[0]) * (r[1] - p[1]) - (q[1] - p[1]) * (r[0] - p[0])
+        return (v > 0) - (v < 0)
+    (a, b), (c, d) = s1, s2
+    return orientation(a, b, c) * orientation(a, b, d) < 0 and orientation(c, d, a) * orientation(c, d, b) < 0
+
+
+def sides(positions):
+    """Return the sides of the polygon as pairs of positions."""
+    return [(positions[i], positions[(i + 1) % len(positions)]) for i in range(len(positions))]
+
+
+def touch(s1, s2):
+    """Determine if the closed segments ((x1, y1), (x2, y2)) have a point in
+    common, including the collinear overlaps, exactly for integers."""
+    def orientation(p, q, r):
+        v = (q[0] - p[0]) * (r[1] - p[1]) - (q[1] - p[1]) * (r[0] - p[0])
+        return (v > 0) - (v < 0)
+
+    def on(p, q, r):
+        return min(p[0], q[0]) <= r[0] <= max(p[0], q[0]) and min(p[1], q[1]) <= r[1] <= max(p[1], q[1])
+    (a, b), (c, d) = s1, s2
+    o1, o2, o3, o4 = orientation(a, b, c), orientation(a, b, d), orientation(c, d, a), orientation(c, d, b)
+    if o1 * o2 < 0 and o3 * o4 < 0:
+        return True
+    return (o1 == 0 and on(a, b, c)) or (o2 == 0 and on(a, b, d)) or \
+        (o3 == 0 and on(c, d, a)) or (o4 == 0 and on(c, d, b))
+
+
+def intersection(s1, s2):
+    """Return the point of intersection of the lines of two segments."""
+    ((x1, y1), (x2, y2)), ((x3, y3), (x4, y4)) = s1, s2
+    d = (x2 - x1) * (y4 - y3) - (y2 - y1) * (x4 - x3)
+    t = ((x3 - x1) * (y4 - y3) - (y3 - y1) * (x4 - x3)) / d
+    return (x1 + t * (x2 - x1), y1 + t * (y2 - y1))
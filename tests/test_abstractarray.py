@@ -0,0 +1,65 @@
+from pygame_geometry.abstractarray import PointArray, VectorArray, PointView, VectorView
+from pygame_geometry.abstract import Point, Vector
+
+import numpy as np
+import math
+
+
+def close(a, b, e=1e-9):
+    """Determine if the sequences of numbers are equal up to e."""
+    return len(a) == len(b) and all(abs(x - y) <= e for (x, y) in zip(a, b))
+
+
+def test_views_share_the_buffer_of_the_array():
+    array = PointArray([[0, 0], [1, 2], [3, 4]])
+    view = array[1]
+    assert isinstance(view, PointView) and isinstance(view, Point)
+    assert close(list(view), [1, 2])
+    # Writing in the view writes in the array and reciprocally.
+    view.x = 5
+    view.components = [6, 7]
+    assert array.buffer[1].tolist() == [6, 7]
+    array.buffer[1] += 1
+    assert close([view.x, view.y], [7, 8])
+    array[-1] = Point(9, 9)
+    assert array[-1].index == 2 and array.buffer[2].tolist() == [9, 9]
+    # A slice is an array that shares the buffer, unlike the points.
+    part = array[1:]
+    part.move(1, 0)
+    assert array.buffer[1:, 0].tolist() == [8, 10]
+    points = array.points
+    points[0].x = 100
+    assert array.buffer[0, 0] == 0
+
+
+def test_views_share_the_style_of_the_array():
+    array = PointArray.random(4, color=(255, 0, 0), radius=0.5)
+    assert all(p.color == (255, 0, 0) and p.radius == 0.5 for p in array)
+    array.color = (0, 255, 0)
+    assert array[0].color == (0, 255, 0)
+    assert [p.color for p in array.points] == [(0, 255, 0)] * 4
+    vectors = VectorArray.random(3, width=2)
+    assert isinstance(vectors[0], VectorView) and vectors[0].width == 2
+
+
+def test_arrays_match_the_abstract_objects():
+    points = [Point(x, y) for (x, y) in np.random.uniform(-5, 5, (20, 2)).tolist()]
+    array = PointArray.createFromPoints(points)
+    array.rotate(0.7, Point(1, -1))
+    for point in points:
+        point.rotate(0.7, Point(1, -1))
+    assert all(close(list(p), list(v)) for (p, v) in zip(points, array))
+    assert close((array + Vector(1, 2)).buffer[3].tolist(), [points[3].x + 1, points[3].y + 2])
+    assert close(array.distance(Point(0, 0)).tolist(), [math.hypot(p.x, p.y) for p in points])
+
+    vectors = [Vector(x, y) for (x, y) in np.random.uniform(-5, 5, (20, 2)).tolist()]
+    array = VectorArray.createFromVectors(vectors)
+    assert close(array.norm.tolist(), [v.norm for v in vectors])
+    assert close(array.angle.tolist(), [v.angle for v in vectors])
+    assert close(array.scalar(Vector(1, 2)).tolist(), [v.x + 2 * v.y for v in vectors])
+    assert close(array.unit.norm.tolist(), [1] * 20)
+    array.norm = 3
+    assert close(array.norm.tolist(), [3] * 20)
+    rotated = array % (math.pi / 2)
+    assert close(rotated.scalar(array).tolist(), [0] * 20)
+    assert close((array * 2).buffer.ravel().tolist(), (array.buffer * 2).ravel().tolist())
@@ -0,0 +1,74 @@
+from pygame_geometry.abstract import BoundingBox, Segment, HalfLine, Form, Circle, Point
+from pygame_geometry.anatomies import FormAnatomy
+from pygame_geometry.curves import Trajectory
+
+import random
+import math
+import shapes
+
+
+def disjoint(b1, b2):
+    """Determine if the boxes are disjoint by comparing their intervals."""
+    return not (max(b1[0], b2[0]) <= min(b1[2], b2[2]) and max(b1[1], b2[1]) <= min(b1[3], b2[3]))
+
+
+def segments(rng, n):
+    """Return n random short segments."""
+    result = []
+    for i in range(n):
+        x, y = rng.uniform(-5, 5), rng.uniform(-5, 5)
+        result.append(Segment.createFromTuples((x, y), (x + rng.uniform(-1, 1), y + rng.uniform(-1, 1))))
+    return result
+
+
+def test_boxes_are_tight():
+    rng = random.Random(0)
+    positions = shapes.polygon(7, 1, 2, rng=rng)
+    expected = (min(x for (x, y) in positions), min(y for (x, y) in positions),
+                max(x for (x, y) in positions), max(y for (x, y) in positions))
+    assert tuple(Form.createFromTuples(positions).bbox) == expected
+    assert tuple(Trajectory.createFromTuples(positions).bbox) == expected
+    assert tuple(Segment.createFromTuples((3, -1), (1, 2)).bbox) == (1, -1, 3, 2)
+    assert tuple(Circle(1, 2, radius=3).bbox) == (-2, -1, 4, 5)
+
+
+def test_half_line_box_contains_the_half_line():
+    rng = random.Random(1)
+    for k in range(50):
+        x, y, angle = rng.uniform(-1, 1), rng.uniform(-1, 1), rng.uniform(-math.pi, math.pi)
+        xmin, ymin, xmax, ymax = HalfLine(Point(x, y), angle).bbox
+        for t in [0, 1, 10, 1e6]:
+            px, py = x + t * math.cos(angle), y + t * math.sin(angle)
+            assert xmin <= px <= xmax and ymin <= py <= ymax
+
+
+def test_pre_test_only_skips_disjoint_pairs(monkeypatch):
+    rng = random.Random(2)
+    items = segments(rng, 60)
+    pairs = [(s1, s2) for i, s1 in enumerate(items) for s2 in items[i + 1:]]
+    BoundingBox.reset()
+    crossings = [s1.crossSegment(s2) for (s1, s2) in pairs]
+    tested, skipped = BoundingBox.reset()
+    assert tested == len(pairs)
+    assert skipped == sum(disjoint(s1.bbox, s2.bbox) for (s1, s2) in pairs)
+    assert skipped > len(pairs) / 2
+    # The results are the same without the pre-test.
+    monkeypatch.setattr(BoundingBox, "overlap", staticmethod(lambda b1, b2: True))
+    exact = [s1.crossSegment(s2) for (s1, s2) in pairs]
+    assert [None if p is None else tuple(p) for p in crossings] == [None if p is None else tuple(p) for p in exact]
+
+
+def test_forms_and_anatomies(monkeypatch):
+    rng = random.Random(3)
+    forms = [Form.createFromTuples(shapes.polygon(5, rng.uniform(-5, 5), rng.uniform(-5, 5), rng=rng))
+             for i in range(25)]
+    anatomies = [FormAnatomy([Point(*p) for p in form.vertices.tolist()]) for form in forms]
+    pairs = [(i, j) for i in range(len(forms)) for j in range(i + 1, len(forms))]
+    BoundingBox.reset()
+    crossings = [len(forms[i].crossForm(forms[j])) for (i, j) in pairs]
+    collisions = [anatomies[i].collide(anatomies[j]) for (i, j) in pairs]
+    tested, skipped = BoundingBox.reset()
+    assert skipped == 2 * sum(disjoint(forms[i].bbox, forms[j].bbox) for (i, j) in pairs)
+    monkeypatch.setattr(BoundingBox, "overlap", staticmethod(lambda b1, b2: True))
+    assert crossings == [len(forms[i].crossForm(forms[j])) for (i, j) in pairs]
+    assert collisions == [anatomies[i].collide(anatomies[j]) for (i, j) in pairs]
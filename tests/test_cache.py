@@ -0,0 +1,89 @@
+from pygame_geometry.abstract import Form, Point
+
+import numpy as np
+import random
+import shapes
+
+
+def fresh(positions):
+    """Return a new form, which has an empty cache."""
+    return Form.createFromTuples(positions)
+
+
+def check(form):
+    """Check the cached geometry of the form against a new form."""
+    other = fresh([(p[0], p[1]) for p in form.points])
+    assert np.array_equal(form.vertices, other.vertices)
+    assert tuple(form.bbox) == tuple(other.bbox)
+    assert form.edges == other.edges
+    assert abs(form.area - other.area) < 1e-12
+    assert abs(form.perimeter - other.perimeter) < 1e-12
+    assert form.center.components == other.center.components
+    assert form.convex_hull == other.convex_hull
+
+
+def test_points_modified_in_place():
+    form = fresh([(0, 0), (1, 0), (1, 1), (0, 1)])
+    check(form)
+    assert Point(3, 0.5) not in form
+    form.points[1].x = 5
+    form.points[2][0] = 5
+    # The points modified from outside the form need a call to touch.
+    form.touch()
+    assert form.vertices.tolist() == [[0, 0], [5, 0], [5, 1], [0, 1]]
+    assert abs(form.area - 5) < 1e-12
+    assert Point(3, 0.5) in form
+    check(form)
+
+
+def test_random_edits_match_fresh_forms():
+    rng = random.Random(0)
+    form = fresh(shapes.polygon(8, rng=rng))
+    for k in range(100):
+        check(form)
+        point = rng.choice(form.points)
+        if k % 3 == 0:
+            form.move((rng.uniform(-1, 1), rng.uniform(-1, 1)))
+        elif k % 3 == 1:
+            form.rotate(rng.uniform(0, 6))
+        else:
+            point[0] += rng.uniform(-1, 1)
+            form.touch()
+
+
+def test_cache_hits():
+    form = fresh([(0, 0), (1, 0), (1, 1)])
+    Form.resetCacheStatistics()
+    form.area
+    misses = Form.getCacheStatistics()["misses"]
+    Form.resetCacheStatistics()
+    form.area
+    form.area
+    assert Form.getCacheStatistics() == {"hits": 2, "misses": 0}
+    form.points[0].y = -1
+    form.touch()
+    form.area
+    assert Form.getCacheStatistics() == {"hits": 2, "misses": misses}
+
+
+def test_version_changes_with_the_methods_of_the_form():
+    form = fresh(shapes.polygon(6, rng=random.Random(1)))
+    versions = [form.version]
+    for change in [lambda: form.move((1, 0)), lambda: form.rotate(1), lambda: form.enlarge(2),
+                   lambda: form.spread(0.5), lambda: form.makeSparse(), lambda: form.addPoint(Point(0, 0)),
+                   lambda: form.removePoint(form.points[-1]), lambda: form.__setitem__(0, Point(1, 1)),
+                   lambda: setattr(form, "points", list(form.points))]:
+        change()
+        assert form.version != versions[-1]
+        versions.append(form.version)
+        check(form)
+
+
+def test_cached_lists_can_not_be_modified():
+    form = fresh([(0, 0), (1, 0), (1, 1), (0, 1)])
+    for name in ["segments", "vectors", "edges", "loop", "angles"]:
+        values = getattr(form, name)
+        length = len(values)
+        values.clear()
+        assert len(getattr(form, name)) == length
+    assert not form.vertices.flags.writeable
@@ -0,0 +1,112 @@
+from pygame_geometry.clipping import Clipper
+from pygame_geometry.abstract import Form
+
+import random
+import shapes
+
+
+operations = {
+    "union": lambda a, b: a or b,
+    "intersection": lambda a, b: a and b,
+    "difference": lambda a, b: a and not b,
+    "xor": lambda a, b: a != b,
+}
+
+
+def inside(region, x, y):
+    """Determine if (x, y) is in the region, with the even odd rule over all
+    its loops."""
+    return sum(shapes.contains(loop, x, y) for loop in region) % 2 == 1
+
+
+def samples(rng, n=400):
+    """Return random positions, which are almost surely on no side."""
+    return [(rng.uniform(-2, 2), rng.uniform(-2, 2)) for i in range(n)]
+
+
+def test_operations_match_sampling():
+    rng = random.Random(0)
+    clipper = Clipper()
+    for k in range(40):
+        subject = [Clipper.orient(shapes.polygon(rng.randint(3, 9), rng.uniform(-.5, .5), rng.uniform(-.5, .5), rng=rng))]
+        clip = [Clipper.orient(shapes.polygon(rng.randint(3, 9), rng.uniform(-.5, .5), rng.uniform(-.5, .5), rng=rng))]
+        positions = samples(rng)
+        for (operation, rule) in operations.items():
+            region = clipper.compute(subject, clip, operation)
+            for (x, y) in positions:
+                assert inside(region, x, y) == rule(inside(subject, x, y), inside(clip, x, y))
+
+
+def test_areas_are_consistent():
+    rng = random.Random(1)
+    clipper = Clipper()
+    area = lambda region: sum(Clipper.area(loop) for loop in region)
+    for k in range(40):
+        subject = [Clipper.orient(shapes.polygon(6, rng=rng))]
+        clip = [Clipper.orient(shapes.polygon(6, rng.uniform(-1, 1), rng=rng))]
+        a, b = area(subject), area(clip)
+        i = area(clipper.intersection(subject, clip))
+        assert abs(area(clipper.union(subject, clip)) - (a + b - i)) < 1e-9
+        assert abs(area(clipper.difference(subject, clip)) - (a - i)) < 1e-9
+        assert abs(area(clipper.xor(subject, clip)) - (a + b - 2 * i)) < 1e-9
+
+
+def test_shared_sides():
+    clipper = Clipper()
+    left = [[(0, 0), (1, 0), (1, 1), (0, 1)]]
+    right = [[(1, 0), (2, 0), (2, 1), (1, 1)]]
+    union = clipper.union(left, right)
+    assert len(union) == 1 and sorted(union[0]) == [(0, 0), (0, 1), (2, 0), (2, 1)]
+    assert clipper.intersection(left, right) == []
+    assert clipper.difference(left, left) == []
+
+
+def test_union_all_matches_sampling():
+    rng = random.Random(2)
+    regions = [[Clipper.orient(shapes.polygon(8, rng.uniform(-1, 1), rng.uniform(-1, 1), r=.5, rng=rng))]
+               for i in range(30)]
+    union = Clipper().unionAll(regions)
+    for (x, y) in samples(rng, 2000):
+        assert inside(union, x, y) == any(inside(region, x, y) for region in regions)
+
+
+def test_overlapping_squares():
+    # The old intersectionTwoForms raised an AttributeError here, because
+    # 'form1 == None' went through Form.__eq__, and the old unionTwoForms
+    # raised a TypeError while hashing the points.
+    f1 = Form.createFromTuples([(0, 0), (2, 0), (2, 2), (0, 2)])
+    f2 = Form.createFromTuples([(1, 1), (3, 1), (3, 3), (1, 3)])
+    intersection = Form.intersectionTwoForms(f1, f2)
+    assert abs(intersection.area - 1) < 1e-12
+    assert abs((f1 & f2).area - 1) < 1e-12
+    intersections = Form.intersectionsTwoForms(f1, f2)
+    assert len(intersections) == 1 and abs(intersections[0].area - 1) < 1e-12
+    union = Form.unionTwoForms(f1, f2)
+    assert len(union) == 1 and abs(union[0].area - 7) < 1e-12
+    difference = Form.difference(f1, [f2])
+    assert len(difference) == 1 and abs(difference[0].area - 3) < 1e-12
+    assert sum(form.area for form in Form.xor([f1, f2])) == 6
+
+
+def test_contracts_of_the_form_operations():
+    f1 = Form.createFromTuples([(0, 0), (2, 0), (2, 2), (0, 2)])
+    f2 = Form.createFromTuples([(1, 1), (3, 1), (3, 3), (1, 3)])
+    far = Form.createFromTuples([(10, 10), (11, 10), (11, 11)])
+    # The intersections of forms are single forms or None, as they were.
+    assert Form.intersectionTwoForms(f1, far) is None
+    assert (f1 & far) is None
+    assert Form.intersectionTwoForms(None, f1) is f1
+    assert Form.intersectionTwoForms(f1, None) is f1
+    assert abs(Form.intersection([f1, f2, f1]).area - 1) < 1e-12
+    assert Form.intersection([f1, f2, far]) is None
+    assert Form.intersections([f1, f2, far]) == []
+    # A comb and a bar meet in several pieces, the largest one is returned.
+    comb = Form.createFromTuples([(0, 0), (5, 0), (5, 3), (4, 3), (4, 1), (3, 1), (3, 3),
+                                  (1, 3), (1, 1), (0.5, 1), (0.5, 3), (0, 3)])
+    bar = Form.createFromTuples([(-1, 2), (6, 2), (6, 2.5), (-1, 2.5)])
+    pieces = Form.intersectionsTwoForms(comb, bar)
+    assert sorted(round(form.area, 9) for form in pieces) == [0.25, 0.5, 1]
+    assert abs(Form.intersectionTwoForms(comb, bar).area - 1) < 1e-12
+    # The symmetric difference is '^', like the method 'xor'.
+    assert abs(sum(form.area for form in f1 ^ f2) - 6) < 1e-12
+    assert abs(sum(form.area for form in f1 - f2) - 3) < 1e-12
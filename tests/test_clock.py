@@ -0,0 +1,42 @@
+from pygame_geometry.clock import FixedClock
+from pygame_geometry.abstract import Vector
+
+
+def test_the_accumulated_time_is_spent_by_steps():
+    clock = FixedClock(dt=0.25, max_steps=10)
+    assert clock.tick(1) == 0
+    # Frames of 0.1s give a step every 2 or 3 frames.
+    steps = [clock.tick(1 + 0.1 * i) for i in range(1, 11)]
+    assert steps == [0, 0, 1, 0, 1, 0, 0, 1, 0, 1]
+    assert abs(clock.accumulator) < 1e-9 and clock.alpha < 1e-9
+    # The time simulated follows the time elapsed.
+    assert clock.tick(2.6) == 2 and abs(clock.alpha - 0.4) < 1e-9
+    assert clock.dropped == 0
+
+
+def test_alpha_interpolates_between_the_last_steps():
+    clock = FixedClock(dt=0.1)
+    clock.tick(0)
+    assert clock.tick(0.175) == 1
+    assert abs(clock.alpha - 0.75) < 1e-9
+    assert abs(clock.interpolate(2, 4) - 3.5) < 1e-9
+    position = clock.interpolate(Vector(0, 0), Vector(4, -8))
+    assert abs(position.x - 3) < 1e-9 and abs(position.y + 6) < 1e-9
+
+
+def test_the_late_steps_are_dropped():
+    clock = FixedClock(dt=0.1, max_steps=3)
+    clock.tick(0)
+    assert clock.tick(1.05) == 3
+    assert abs(clock.dropped - 0.7) < 1e-9
+    assert 0 <= clock.alpha < 1 and abs(clock.alpha - 0.5) < 1e-6
+    # After a pause the time is not simulated at once.
+    clock.reset()
+    assert clock.tick(50) == 0 and clock.accumulator == 0
+    assert clock.tick(50.1 + 1e-9) == 1
+
+
+def test_speed_scales_the_time_simulated():
+    clock = FixedClock(dt=0.1, speed=2)
+    clock.tick(0)
+    assert clock.tick(0.2 + 1e-9) == 4
@@ -0,0 +1,104 @@
+from pygame_geometry.contactsolver import ContactSolver
+from pygame_geometry.anatomies import CircleAnatomy, FormAnatomy
+from pygame_geometry.entity import Entity
+from pygame_geometry.motion import Motion
+from pygame_geometry.abstract import Vector
+
+import weakref
+import math
+import gc
+
+
+def circle(x, y, vx=0, vy=0, g=0, radius=0.5, mass=1):
+    """Return a circle entity."""
+    entity = Entity(CircleAnatomy(0, 0, radius=radius), [Motion(Vector(x, y), Vector(vx, vy), Vector(0, g))],
+                    friction=0)
+    entity.mass = mass
+    return entity
+
+
+def wall(x, y, w, h):
+    """Return a static rectangle of center (x, y) and of half sizes w and h."""
+    anatomy = FormAnatomy.createFromTuples([(-w, -h), (w, -h), (w, h), (-w, h)])
+    entity = Entity(anatomy, [Motion(Vector(x, y), Vector(0, 0), Vector(0, 0))], friction=0)
+    entity.mass = math.inf
+    return entity
+
+
+def momentum(entities):
+    """Return the total momentum of the entities."""
+    return [sum(e.mass * float(e.velocity.components[i]) for e in entities) for i in range(2)]
+
+
+def test_collision_conserves_momentum():
+    for restitution in [0, 0.5, 1]:
+        e1, e2 = circle(0, 0, 3, 1, mass=1), circle(0.9, 0.1, -2, 0, mass=3)
+        before = momentum([e1, e2])
+        solver = ContactSolver(restitution=restitution, friction=0.3)
+        assert solver.solve([(e1, e2)], 1 / 60) == 1
+        after = momentum([e1, e2])
+        assert all(abs(a - b) < 1e-9 for (a, b) in zip(before, after))
+        # The circles stop getting closer along the normal.
+        (x1, y1), (x2, y2) = e1.position.components[:2], e2.position.components[:2]
+        d = math.hypot(x2 - x1, y2 - y1)
+        vn = ((e2.vx - e1.vx) * (x2 - x1) + (e2.vy - e1.vy) * (y2 - y1)) / d
+        assert vn >= -1e-9
+
+
+def test_resting_stack_does_not_sink():
+    floor = wall(0, -1, 5, 1)
+    stack = [circle(0, 0.5 + i, g=-10) for i in range(4)]
+    solver = ContactSolver(iterations=20)
+    dt = 1 / 60
+    for frame in range(240):
+        for e in stack:
+            e.update(dt)
+        pairs = [(stack[0], floor)] + [(stack[i], stack[i + 1]) for i in range(3)]
+        solver.solve(pairs, dt)
+    depths = [c.depth for (e1, e2) in pairs for c in solver.getManifold(e1, e2)]
+    assert max(depths) < 0.05
+    # The velocities solved are the ones of the next step, once the gravity
+    # is added to them.
+    assert all(abs(e.vy - 10 * dt) < 0.05 and abs(e.x) < 1e-6 for e in stack)
+    assert all(abs(e.y - (0.5 + i)) < 0.05 for (i, e) in enumerate(stack))
+
+
+def test_cache_keeps_the_touching_pairs_of_the_last_solve():
+    e1, e2, e3 = circle(0, 0), circle(0.9, 0), circle(5, 0)
+    solver = ContactSolver()
+    solver.solve([(e1, e2), (e1, e3)], 1 / 60)
+    assert list(solver.cache) == [solver.getKey(e1, e2)]
+    solver.solve([(e2, e3)], 1 / 60)
+    assert solver.cache == {}
+
+
+def test_removed_entities_do_not_give_their_impulses():
+    e1, e2 = circle(0, 0, 1), circle(0.9, 0)
+    solver = ContactSolver()
+    solver.solve([(e1, e2)], 1 / 60)
+    assert all(c.pn > 0 for manifold in solver.cache.values() for c in manifold)
+    # The cache holds the entities, so their ids can not be given to new ones.
+    reference = weakref.ref(e1)
+    del e1
+    gc.collect()
+    assert reference() is not None
+    e3, e4 = circle(0, 0, 1), circle(0.9, 0)
+    manifold = solver.getManifold(e3, e4)
+    solver.warmStart(solver.getKey(e3, e4), manifold, e3, e4)
+    assert all(c.pn == 0 for c in manifold)
+    solver.solve([], 1 / 60)
+    gc.collect()
+    assert reference() is None
+
+
+def test_colliders_bounce_both_entities_with_the_solver():
+    from pygame_geometry.collider import Collider
+    from pygame_geometry.entitygroup import EntityGroup
+    e1, e2 = circle(0, 0, 2, 0, mass=1), circle(0.9, 0, -1, 0, mass=2)
+    before = momentum([e1, e2])
+    collider = Collider(solver=ContactSolver(restitution=1, friction=0))
+    collider.soloChocs(EntityGroup(e1, e2), dt=1 / 60, bouncing=True)
+    after = momentum([e1, e2])
+    assert all(abs(a - b) < 1e-9 for (a, b) in zip(before, after))
+    # Both entities are pushed back, the second one included.
+    assert e1.vx < 0 < e2.vx
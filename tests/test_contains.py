@@ -0,0 +1,47 @@
+from pygame_geometry.abstract import Form, Point
+from pygame_geometry.anatomies import FormAnatomy
+from pygame_geometry.abstractarray import PointArray
+
+import numpy as np
+import random
+import shapes
+
+
+def test_contains_many_matches_ray_casting():
+    rng = random.Random(0)
+    for i in range(50):
+        positions = shapes.polygon(rng.randint(3, 12), rng=rng)
+        form = Form.createFromTuples(positions)
+        queries = [(rng.uniform(-1.2, 1.2), rng.uniform(-1.2, 1.2)) for j in range(100)]
+        expected = [shapes.contains(positions, x, y) for (x, y) in queries]
+        assert form.containsMany(queries).tolist() == expected
+        assert form.containsMany(np.array(queries)).tolist() == expected
+        assert [Point(x, y) in form for (x, y) in queries] == expected
+
+
+def test_contains_self_crossing_form_uses_even_odd_rule():
+    rng = random.Random(1)
+    positions = [(rng.uniform(-1, 1), rng.uniform(-1, 1)) for i in range(9)]
+    form = Form.createFromTuples(positions)
+    queries = [(rng.uniform(-1, 1), rng.uniform(-1, 1)) for j in range(500)]
+    assert form.containsMany(queries).tolist() == [shapes.contains(positions, x, y) for (x, y) in queries]
+
+
+def test_contains_many_accepts_point_arrays():
+    form = Form.createFromTuples([(0, 0), (2, 0), (2, 2), (0, 2)])
+    points = PointArray([(1, 1), (3, 1), (0.5, 1.5)])
+    assert form.containsMany(points).tolist() == [True, False, True]
+
+
+def test_degenerate_forms_contain_nothing():
+    assert not Form.createFromTuples([(0, 0), (1, 1)]).containsMany([(0.5, 0.5)]).any()
+    assert len(Form.createFromTuples([(0, 0), (1, 0), (0, 1)]).containsMany([])) == 0
+
+
+def test_form_anatomy_collide_matches_vertices_inside():
+    rng = random.Random(2)
+    for i in range(50):
+        p1 = shapes.polygon(rng.randint(3, 8), rng.uniform(-1, 1), rng.uniform(-1, 1), rng=rng)
+        p2 = shapes.polygon(rng.randint(3, 8), rng.uniform(-1, 1), rng.uniform(-1, 1), rng=rng)
+        expected = any(shapes.contains(p2, x, y) for (x, y) in p1) or any(shapes.contains(p1, x, y) for (x, y) in p2)
+        assert FormAnatomy.createFromTuples(p1).collide(FormAnatomy.createFromTuples(p2)) == expected
@@ -0,0 +1,117 @@
+from pygame_geometry.continuouscollision import ContinuousCollider
+from pygame_geometry.materialpoint import MaterialPoint
+from pygame_geometry.materialform import MaterialForm
+from pygame_geometry.motion import Motion
+from pygame_geometry.abstract import Vector
+
+import random
+import math
+
+
+def point(x, y, vx=0, vy=0, mass=1):
+    """Return a material point with a constant velocity."""
+    return MaterialPoint(Motion(Vector(x, y), Vector(vx, vy), Vector(0, 0)), mass=mass)
+
+
+def at(p, v, t):
+    """Return the position of the moving point at the instant t."""
+    return (p[0] + v[0] * t, p[1] + v[1] * t)
+
+
+def random_state(rng):
+    """Return a random position and velocity."""
+    return (rng.uniform(-2, 2), rng.uniform(-2, 2)), (rng.uniform(-3, 3), rng.uniform(-3, 3))
+
+
+def test_point_point_instant_matches_sampling():
+    rng = random.Random(0)
+    steps = 4000
+    for k in range(200):
+        (p, vp), (q, vq) = random_state(rng), random_state(rng)
+        r = rng.uniform(0.1, 0.5)
+        distance = lambda t: math.dist(at(p, vp, t), at(q, vq, t))
+        if distance(0) <= r:
+            continue
+        first = next((i / steps for i in range(steps + 1) if distance(i / steps) <= r), None)
+        t = ContinuousCollider.pointPointInstant(p, vp, q, vq, r)
+        if first is None:
+            assert t is None or t > 1
+        else:
+            assert abs(t - first) <= 1 / steps and abs(distance(t) - r) < 1e-9
+
+
+def test_point_segment_instant_matches_sampling():
+    rng = random.Random(1)
+    steps = 4000
+    found = 0
+    for k in range(200):
+        (p, vp), (a, va), (b, vb) = random_state(rng), random_state(rng), random_state(rng)
+
+        def side(t):
+            (px, py), (ax, ay), (bx, by) = at(p, vp, t), at(a, va, t), at(b, vb, t)
+            return (bx - ax) * (py - ay) - (by - ay) * (px - ax)
+
+        def inside(t):
+            (px, py), (ax, ay), (bx, by) = at(p, vp, t), at(a, va, t), at(b, vb, t)
+            return 0 <= (px - ax) * (bx - ax) + (py - ay) * (by - ay) <= (bx - ax) ** 2 + (by - ay) ** 2
+
+        # The first step during which the point goes through the segment.
+        first = next((i / steps for i in range(steps) if side(i / steps) * side((i + 1) / steps) <= 0
+                      and (inside(i / steps) or inside((i + 1) / steps))), None)
+        result = ContinuousCollider.pointSegmentInstant(p, vp, a, va, b, vb)
+        if first is None:
+            assert result is None or result[0] > 1 - 1 / steps
+        else:
+            found += 1
+            t, s = result
+            assert abs(t - first) <= 2 / steps
+            ax, ay = at(a, va, t)
+            bx, by = at(b, vb, t)
+            assert math.dist(at(p, vp, t), (ax + s * (bx - ax), ay + s * (by - ay))) < 1e-6
+    assert found > 10
+
+
+def test_collision_instant_is_the_first_of_all_pairs():
+    rng = random.Random(2)
+    radius = 0.3
+    points = [point(rng.uniform(0, 10), rng.uniform(0, 10), rng.uniform(-2, 2), rng.uniform(-2, 2))
+              for i in range(40)]
+    states = [(p.motion.position.components[:2], p.motion.velocity.components[:2]) for p in points]
+    instants = [ContinuousCollider.pointPointInstant(*states[i], *states[j], 2 * radius)
+                for i in range(40) for j in range(i + 1, 40)]
+    expected = min([t for t in instants if t is not None and t <= 1] + [1])
+    assert expected < 1
+    assert ContinuousCollider(radius=radius).getCollisionInstant(points, 1) == expected
+
+
+def test_points_bounce_without_overlapping():
+    rng = random.Random(3)
+    radius = 0.5
+    positions = []
+    while len(positions) < 40:
+        x, y = rng.uniform(0, 12), rng.uniform(0, 12)
+        if all(math.hypot(x - p[0], y - p[1]) > 2 * radius for p in positions):
+            positions.append((x, y))
+    points = [point(x, y, rng.uniform(-5, 5), rng.uniform(-5, 5), rng.uniform(1, 3)) for (x, y) in positions]
+    momentum = lambda: [sum(p.mass * p.motion.velocity.components[i] for p in points) for i in range(2)]
+    energy = lambda: sum(p.mass * (p.motion.velocity.components[0] ** 2 + p.motion.velocity.components[1] ** 2)
+                         for p in points)
+    m0, e0 = momentum(), energy()
+    collider = ContinuousCollider(radius=radius)
+    collisions = 0
+    for frame in range(5):
+        collisions += len(collider.advance(points, 0.5))
+        xy = [p.motion.position.components[:2] for p in points]
+        assert all(math.dist(xy[i], xy[j]) >= 2 * radius - 1e-6 for i in range(40) for j in range(i + 1, 40))
+    assert collisions > 0
+    assert all(abs(a - b) < 1e-9 for (a, b) in zip(momentum(), m0))
+    assert abs(energy() - e0) < 1e-9 * e0
+
+
+def test_fast_point_does_not_go_through_a_thin_wall():
+    wall = MaterialForm([point(5, -1), point(5.01, -1), point(5.01, 1), point(5, 1)])
+    bullet = point(0, 0, 100, 0)
+    collisions = ContinuousCollider().advance([bullet, wall], 1)
+    assert len(collisions) == 1 and abs(collisions[0][0] - 0.05) < 1e-9
+    assert bullet.motion.position.components[0] < 5
+    assert bullet.motion.velocity.components[0] < 0
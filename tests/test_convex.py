@@ -0,0 +1,95 @@
+from pygame_geometry.abstract import Form
+
+import numpy as np
+import random
+import math
+import shapes
+
+
+def side(a, b, p):
+    """Return the cross product of (b - a) and (p - a)."""
+    return (b[0] - a[0]) * (p[1] - a[1]) - (b[1] - a[1]) * (p[0] - a[0])
+
+
+def brute_hull(positions):
+    """Return the set of the positions which begin an edge of the hull, every
+    other position being strictly on its left."""
+    return {a for a in positions for b in positions if a != b
+            and all(side(a, b, p) > 0 for p in positions if p != a and p != b)}
+
+
+def overlap(p1, p2):
+    """Determine if the polygons overlap, by crossing sides or inclusion."""
+    return any(shapes.cross(s1, s2) for s1 in shapes.sides(p1) for s2 in shapes.sides(p2)) \
+        or any(shapes.contains(p2, x, y) for (x, y) in p1) or any(shapes.contains(p1, x, y) for (x, y) in p2)
+
+
+def test_convex_hull_matches_brute_force():
+    rng = random.Random(0)
+    for k in range(50):
+        positions = [(rng.uniform(-1, 1), rng.uniform(-1, 1)) for i in range(rng.randint(3, 30))]
+        hull = Form.convexHull(positions)
+        assert set(hull) == brute_hull(positions)
+        # Counter clockwise, and every position is in the hull or on it.
+        assert all(side(hull[i - 1], hull[i], hull[(i + 1) % len(hull)]) > 0 for i in range(len(hull)))
+        assert all(side(hull[i], hull[(i + 1) % len(hull)], p) >= -1e-12 for p in positions for i in range(len(hull)))
+
+
+def test_convex_hull_drops_collinear_and_repeated_positions():
+    square = [(0, 0), (1, 0), (2, 0), (2, 2), (0, 2), (0, 0), (1, 1)]
+    assert Form.convexHull(square) == [(0, 0), (2, 0), (2, 2), (0, 2)]
+    assert Form.convexHull([(0, 0), (1, 1)]) == [(0, 0), (1, 1)]
+
+
+def test_convex_matches_turns_and_simplicity():
+    rng = random.Random(1)
+    for k in range(100):
+        if k % 2:
+            positions = shapes.polygon(rng.randint(4, 9), convex=True, rng=rng)
+        else:
+            positions = [(rng.uniform(-1, 1), rng.uniform(-1, 1)) for i in range(rng.randint(4, 7))]
+        n = len(positions)
+        turns = [side(positions[i - 1], positions[i], positions[(i + 1) % n]) for i in range(n)]
+        sides = shapes.sides(positions)
+        simple = not any(shapes.cross(sides[i], sides[j]) for i in range(n) for j in range(i + 2, n))
+        expected = simple and (all(t > 0 for t in turns) or all(t < 0 for t in turns))
+        assert Form.createFromTuples(positions).convex() == expected
+
+
+def test_separation_matches_overlap_and_separates():
+    rng = random.Random(2)
+    directions = [(math.cos(a), math.sin(a)) for a in np.linspace(0, 2 * math.pi, 120, endpoint=False)]
+    step = 2 * math.pi / 120
+    for k in range(60):
+        p1 = shapes.polygon(rng.randint(3, 8), rng.uniform(-1, 1), rng.uniform(-1, 1), convex=True, rng=rng)
+        p2 = shapes.polygon(rng.randint(3, 8), rng.uniform(-1, 1), rng.uniform(-1, 1), convex=True, rng=rng)
+        mtv = Form.separation(np.array(p1), np.array(p2))
+        assert (mtv is not None) == overlap(p1, p2)
+        if mtv is None:
+            continue
+        mtv = [float(c) for c in mtv]
+        moved = lambda t: [(x + t * mtv[0], y + t * mtv[1]) for (x, y) in p1]
+        assert not overlap(moved(1 + 1e-6), p2)
+        assert overlap(moved(0.99), p2)
+        # No sampled direction separates the polygons with a shorter move.
+        lengths = []
+        for (dx, dy) in directions:
+            lo, hi = 0, 10
+            for i in range(30):
+                mid = (lo + hi) / 2
+                if overlap([(x + mid * dx, y + mid * dy) for (x, y) in p1], p2):
+                    lo = mid
+                else:
+                    hi = mid
+            lengths.append(hi)
+        length = math.hypot(*mtv)
+        assert length <= min(lengths) + 1e-6
+        assert min(lengths) <= length / math.cos(step) + 1e-6
+
+
+def test_minimum_translation_vector_of_forms():
+    f1 = Form.createFromTuples([(0, 0), (2, 0), (2, 2), (0, 2)])
+    f2 = Form.createFromTuples([(1.5, 0), (3.5, 0), (3.5, 2), (1.5, 2)])
+    mtv = f1.getMinimumTranslationVector(f2)
+    assert abs(mtv.x + 0.5) < 1e-12 and abs(mtv.y) < 1e-12
+    assert f1.getMinimumTranslationVector(Form.createFromTuples([(5, 5), (6, 5), (6, 6)])) is None
@@ -0,0 +1,114 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from pygame_geometry.draw import Draw
+from pygame_geometry.plane import Plane
+from pygame_geometry.window import Window
+
+import numpy as np
+import pygame
+import random
+
+
+def draw(batching=False, size=(200, 150)):
+    """Return a draw of a window without display that draws on a surface."""
+    window = Window(build=False)
+    window.screen = pygame.Surface(size)
+    return Draw(Plane(view=[[0, 0], [20, 20]]), window, batching=batching)
+
+
+def scene(d, seed=0):
+    """Draw random polygons with their points, some of them out of the
+    screen, and return the pixels."""
+    rng = random.Random(seed)
+    screen = d.window.screen
+    polygons = []
+    for i in range(40):
+        x, y = rng.uniform(-7, 7), rng.uniform(-5, 5)
+        polygons.append([(x + rng.uniform(-2, 2), y + rng.uniform(-2, 2)) for j in range(rng.randint(3, 6))])
+    for polygon in polygons:
+        for (p1, p2) in zip(polygon, polygon[1:] + polygon[:1]):
+            d.line(screen, (200, 200, 200), p1, p2)
+    starts = np.random.RandomState(seed).uniform(-8, 8, (30, 2))
+    d.line(screen, (0, 0, 255), starts, starts[::-1] * 0.5, 2)
+    for polygon in polygons:
+        for p in polygon:
+            d.circle(screen, (255, 0, 0), p, 0.02)
+    d.circle(screen, (0, 255, 0), np.array([p for polygon in polygons for p in polygon]), 0.2, fill=True)
+    # Circles of a pixel on the borders of the screen.
+    d.circle(screen, (255, 255, 0), [[-5, 0], [4.99, 0], [0, 3.75], [0, -3.74]], 0.01)
+    d.flush()
+    return pygame.surfarray.array2d(screen)
+
+
+def test_batching_draws_the_same_pixels():
+    for seed in range(3):
+        immediate, batched = draw(), draw(batching=True)
+        assert (scene(immediate, seed) == scene(batched, seed)).all()
+        assert batched.draw_calls < immediate.draw_calls
+        assert batched.primitives == immediate.primitives
+        assert batched.culled == immediate.culled > 0
+
+
+def same(clipped, line, e=1e-9):
+    """Determine if the clipped line is the line up to e."""
+    return clipped is not None and np.allclose(clipped, line, rtol=0, atol=e)
+
+
+def test_clip_keeps_the_visible_part_of_the_lines():
+    d = draw()
+    xmin, ymin, xmax, ymax = d.getCorners()
+    assert (xmin, ymin, xmax, ymax) == (-5.1, -3.85, 5.1, 3.85)
+    # Inside, crossing the rectangle and leaving it.
+    assert same(d.clip([0, 0], [1, 1]), ([0, 0], [1, 1]))
+    assert same(d.clip([-10, 0], [10, 0]), ([xmin, 0], [xmax, 0]))
+    assert same(d.clip([0, 0], [0, 10]), ([0, 0], [0, ymax]))
+    assert same(d.clip([-10, -10], [10, 10]), ([ymin, ymin], [ymax, ymax]))
+    # Parallel to the sides, outside or inside.
+    assert d.clip([-10, 5], [10, 5]) is None
+    assert d.clip([6, -10], [6, 10]) is None
+    assert same(d.clip([3, -10], [3, 10]), ([3, ymin], [3, ymax]))
+    # Outside without being parallel, beside a corner.
+    assert d.clip([4, 5], [7, 3]) is None
+    assert d.clip([10, 0], [12, 1]) is None
+    # End points on the border, and lines along the border.
+    assert same(d.clip([xmin, 0], [xmax, 1]), ([xmin, 0], [xmax, 1]))
+    assert same(d.clip([xmin, ymin], [xmin, ymax]), ([xmin, ymin], [xmin, ymax]))
+    assert same(d.clip([xmax, 0], [7, 0]), ([xmax, 0], [xmax, 0]))
+    # Lines of a single point.
+    assert same(d.clip([1, 1], [1, 1]), ([1, 1], [1, 1]))
+    assert d.clip([9, 9], [9, 9]) is None
+
+
+def test_clip_arrays_match_clip_and_count_the_culled_lines():
+    d = draw()
+    rng = np.random.RandomState(0)
+    starts, ends = rng.uniform(-12, 12, (200, 2)), rng.uniform(-12, 12, (200, 2))
+    starts[:10, 1] = ends[:10, 1] = 6  # parallel and outside
+    starts[10:20, 0] = ends[10:20, 0] = 2  # parallel and inside
+    clipped = [d.clip(s, e) for (s, e) in zip(starts.tolist(), ends.tolist())]
+    kept = [c for c in clipped if c is not None]
+    s, e = d.clipArrays(starts, ends)
+    assert d.culled == len(clipped) - len(kept) > 10
+    assert np.allclose(s, [c[0] for c in kept]) and np.allclose(e, [c[1] for c in kept])
+
+
+def test_culling_counts_the_shapes_out_of_the_screen():
+    d = draw()
+    screen = d.window.screen
+    d.circle(screen, (255, 0, 0), [0, 0], 1)
+    d.circle(screen, (255, 0, 0), [6, 0], 0.5)
+    d.circle(screen, (255, 0, 0), [5.5, 0], 0.5)  # touches the rectangle
+    d.line(screen, (255, 0, 0), [-10, 5], [10, 5])
+    d.circle(screen, (255, 0, 0), [[0, 0], [0, 9], [-9, 0], [5, 3]], 0.1)
+    d.polygon(screen, (255, 0, 0), [[7, 7], [8, 7], [8, 8]])
+    d.rect(screen, (255, 0, 0), [-9, 0, 1, 1])
+    assert d.culled == 6
+    assert d.primitives == 4
+    # Without culling nothing is counted and everything is drawn.
+    d = draw()
+    d.culling = False
+    d.circle(d.window.screen, (255, 0, 0), [6, 0], 0.5)
+    d.line(d.window.screen, (255, 0, 0), [-10, 5], [10, 5])
+    assert d.culled == 0 and d.primitives == 2
@@ -0,0 +1,59 @@
+from pygame_geometry.abstract import Form
+
+import itertools
+import random
+import math
+
+
+def brute(positions):
+    """Return the radius of the smallest circle containing the positions,
+    among the circles of the pairs and triples of positions."""
+    def contains(x, y, r):
+        return all(math.hypot(px - x, py - y) <= r + 1e-9 for (px, py) in positions)
+
+    candidates = []
+    for (a, b) in itertools.combinations(positions, 2):
+        x, y = (a[0] + b[0]) / 2, (a[1] + b[1]) / 2
+        candidates.append((x, y, math.hypot(a[0] - x, a[1] - y)))
+    for (a, b, c) in itertools.combinations(positions, 3):
+        bx, by, cx, cy = b[0] - a[0], b[1] - a[1], c[0] - a[0], c[1] - a[1]
+        d = 2 * (bx * cy - by * cx)
+        if abs(d) > 1e-12:
+            x = (cy * (bx * bx + by * by) - by * (cx * cx + cy * cy)) / d
+            y = (bx * (cx * cx + cy * cy) - cx * (bx * bx + by * by)) / d
+            candidates.append((x + a[0], y + a[1], math.hypot(x, y)))
+    return min(r for (x, y, r) in candidates if contains(x, y, r))
+
+
+def test_enclosing_circle_matches_brute_force():
+    rng = random.Random(0)
+    for k in range(100):
+        positions = [(rng.uniform(-5, 5), rng.uniform(-5, 5)) for i in range(rng.randint(2, 12))]
+        x, y, r = Form.enclosingCircle(positions)
+        assert all(math.hypot(px - x, py - y) <= r + 1e-9 for (px, py) in positions)
+        assert abs(r - brute(positions)) < 1e-9
+
+
+def test_enclosing_circle_of_degenerate_positions():
+    assert Form.enclosingCircle([]) is None
+    assert Form.enclosingCircle([(1, 2)]) == (1, 2, 0)
+    x, y, r = Form.enclosingCircle([(0, 0), (1, 0), (2, 0), (3, 0)])
+    assert (x, y, r) == (1.5, 0, 1.5)
+    x, y, r = Form.enclosingCircle([(0, 0)] * 5 + [(2, 0)])
+    assert abs(r - 1) < 1e-12
+
+
+def test_born_circle_of_a_form():
+    rng = random.Random(1)
+    positions = [(rng.uniform(-1, 1), rng.uniform(-1, 1)) for i in range(10)]
+    circle = Form.createFromTuples(positions).getBornCircle()
+    assert abs(circle.radius - brute(positions)) < 1e-9
+
+
+def test_empty_form_has_no_enclosing_circle():
+    form = Form([])
+    assert form.getMinimumEnclosingCircle() is None
+    assert form.getBornCircle() is None
+    form.addPoint(Form.createFromTuples([(1, 2)]).points[0])
+    circle = form.getMinimumEnclosingCircle()
+    assert (circle.x, circle.y, circle.radius) == (1, 2, 0)
@@ -0,0 +1,82 @@
+from pygame_geometry.gravity import BarnesHut
+from pygame_geometry.particles import Particle, ParticleGroup
+from pygame_geometry.motion import Motion
+from pygame_geometry.abstract import Vector
+
+import numpy as np
+import math
+
+
+def naive(positions, masses, constant=1, softening=0):
+    """Return the accelerations by summing the attractions of every pair of bodies."""
+    accelerations = []
+    for (i, (xi, yi)) in enumerate(positions):
+        ax = ay = 0
+        for (j, (xj, yj)) in enumerate(positions):
+            r2 = (xj - xi) ** 2 + (yj - yi) ** 2 + softening ** 2
+            if i != j and r2 > 0:
+                f = constant * masses[j] / (r2 * math.sqrt(r2))
+                ax += f * (xj - xi)
+                ay += f * (yj - yi)
+        accelerations.append((ax, ay))
+    return np.array(accelerations)
+
+
+def bodies(n, seed=0):
+    """Return the positions and masses of a random clustered set of bodies."""
+    rng = np.random.default_rng(seed)
+    centers = rng.uniform(-5, 5, (4, 2))
+    positions = centers[rng.integers(0, 4, n)] + rng.normal(0, 0.5, (n, 2))
+    return (positions, rng.uniform(0.5, 1.5, n))
+
+
+def test_direct_sum_matches_the_pairs():
+    positions, masses = bodies(150)
+    for softening in [0, 0.1]:
+        exact = naive(positions.tolist(), masses.tolist(), 2, softening)
+        assert np.allclose(BarnesHut.direct(positions, masses, 2, softening, chunk=16), exact, rtol=1e-10, atol=0)
+
+
+def test_null_theta_is_exact():
+    positions, masses = bodies(300, 1)
+    exact = naive(positions.tolist(), masses.tolist(), softening=1e-3)
+    engine = BarnesHut(0, softening=1e-3)
+    assert np.allclose(engine(positions, masses), exact, rtol=1e-9, atol=1e-12)
+    assert engine.interactions >= 300 * 299
+
+
+def test_small_theta_is_close():
+    positions, masses = bodies(400, 2)
+    exact = naive(positions.tolist(), masses.tolist(), softening=1e-3)
+    errors = {}
+    for theta in [0.2, 0.5, 1]:
+        engine = BarnesHut(theta, softening=1e-3)
+        errors[theta] = np.linalg.norm(engine(positions, masses) - exact, axis=1) / np.linalg.norm(exact, axis=1)
+    assert np.median(errors[0.2]) < 1e-3 and np.median(errors[0.5]) < 1e-2
+    assert np.median(errors[0.2]) < np.median(errors[0.5]) < np.median(errors[1])
+
+
+def test_degenerate_bodies():
+    assert BarnesHut()(np.zeros((1, 2)), np.ones(1)).tolist() == [[0, 0]]
+    # Coincident bodies do not attract each other, whatever the depth.
+    positions = np.array([[1, 1], [1, 1], [3, 1]], dtype=float)
+    masses = np.array([1, 2, 4], dtype=float)
+    assert np.allclose(BarnesHut(0)(positions, masses), naive(positions.tolist(), masses.tolist()))
+    # The total force is null.
+    positions, masses = bodies(200, 3)
+    accelerations = BarnesHut(0, softening=1e-2)(positions, masses)
+    assert np.abs((masses[:, np.newaxis] * accelerations).sum(axis=0)).max() < 1e-9
+
+
+def test_particle_group_uses_the_engine():
+    positions, masses = bodies(30, 4)
+    particles = [Particle([Motion(Vector(x, y), Vector(0, 0), Vector(0, 0))], mass=m)
+                 for ((x, y), m) in zip(positions.tolist(), masses.tolist())]
+    group = ParticleGroup(particles, BarnesHut(0))
+    dt = 1e-3
+    group.update(dt)
+    exact = naive(positions.tolist(), masses.tolist())
+    velocities = np.array([list(p.motions[0].velocity.components) for p in particles])
+    assert np.allclose(velocities, exact * dt, rtol=1e-9, atol=1e-12)
+    assert np.allclose([list(p.motions[0].position.components) for p in particles], positions + exact * dt * dt,
+                       rtol=1e-9, atol=1e-12)
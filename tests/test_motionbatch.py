@@ -0,0 +1,173 @@
+from pygame_geometry.motionbatch import MotionBatch, PhysicsBatch
+from pygame_geometry.motion import Motion, Moment
+from pygame_geometry.abstract import Vector
+from pygame_geometry.particles import Particle, ParticleGroup
+from pygame_geometry.body import Body, FrictionBody
+from pygame_geometry.anatomies import FormAnatomy
+from pygame_geometry.manager import BodyManager
+from pygame_geometry.entity import Entity
+from pygame_geometry.entitygroup import EntityGroup
+
+import numpy as np
+import random
+import math
+
+
+def motions(rng, n):
+    """Return the lists of the components of n random motions."""
+    return [[[rng.uniform(-1, 1), rng.uniform(-1, 1)] for j in range(3)] for i in range(n)]
+
+
+def create(components):
+    """Return the motions of the lists of components."""
+    return [Motion(*[Vector(*c) for c in vectors]) for vectors in components]
+
+
+def state(motions):
+    """Return the array of the components of the motions."""
+    return np.array([[list(vector.components) for vector in motion.vectors] for motion in motions], dtype=float)
+
+
+def test_semi_implicit_matches_the_loop():
+    rng = random.Random(0)
+    components = motions(rng, 50)
+    looped, batched = create(components), create(components)
+    batch = MotionBatch(batched)
+    for i in range(20):
+        for motion in looped:
+            motion.update(0.1)
+        batch.update(0.1)
+    assert np.allclose(state(looped), state(batched), rtol=0, atol=1e-12)
+
+
+def test_schemes_against_the_exact_motions():
+    rng = random.Random(1)
+    components = motions(rng, 20)
+    t, steps = 2, 50
+    p, v, a = (np.array([c[i] for c in components]) for i in range(3))
+    exact = p + v * t + a * t * t / 2
+    for scheme in ["verlet", "rk4"]:
+        batched = create(components)
+        batch = MotionBatch(batched, scheme)
+        for i in range(steps):
+            batch.update(t / steps)
+        assert np.allclose(batch.positions, exact, atol=1e-9)
+        assert np.allclose(batch.velocities, v + a * t, atol=1e-9)
+    batch = MotionBatch(create(components), "euler")
+    batch.update(t)
+    assert np.allclose(batch.positions, p + v * t, atol=1e-12)
+    # The harmonic oscillator comes back after one period.
+    errors = {}
+    for scheme in MotionBatch.schemes:
+        motion = Motion(Vector(1, 0), Vector(0, 0), Vector(0, 0))
+        batch = MotionBatch([motion], scheme, field=lambda positions, velocities: -positions)
+        for i in range(100):
+            batch.update(2 * math.pi / 100)
+        errors[scheme] = math.hypot(motion.position.x - 1, motion.position.y)
+    assert errors["rk4"] < 1e-6 and errors["verlet"] < 1e-2 < errors["euler"]
+
+
+def test_replaced_vectors_and_motions_are_used():
+    rng = random.Random(2)
+    particles = [Particle(create(motions(rng, 1))) for i in range(5)]
+    batch = PhysicsBatch()
+    batch.update(particles, 1)
+    particles[0].motions[0].velocity = Vector(1, 0)
+    particles[1].motions[0] = Motion(Vector(0, 0), Vector(0, 1), Vector(0, 0))
+    batch.update(particles, 1)
+    assert list(particles[0].motions[0].velocity.components) != [1, 0]
+    assert list(particles[1].motions[0].position.components) == [0, 1]
+    assert list(particles[1].motions[0].velocity.components) == [0, 1]
+
+
+class CountingParticle(Particle):
+    """Particle that counts its updates."""
+
+    def update(self, dt=1):
+        self.updates = getattr(self, "updates", 0) + 1
+        super().update(dt)
+
+
+def test_custom_updates_are_called():
+    rng = random.Random(3)
+    particles = [Particle(create(motions(rng, 1))) for i in range(3)] + [CountingParticle(create(motions(rng, 1)))]
+    expected = create(state([particle.motions[0] for particle in particles]).tolist())
+    for motion in expected:
+        motion.update(0.5)
+    ParticleGroup(particles).update(0.5)
+    assert particles[-1].updates == 1
+    assert np.allclose(state([particle.motions[0] for particle in particles]), state(expected))
+
+
+def test_body_manager_batches_only_plain_bodies():
+    rng = random.Random(4)
+    bodies = [Body(FormAnatomy.random(), create(motions(rng, 2))),
+              FrictionBody(FormAnatomy.random(), create(motions(rng, 2)), friction=0.5)]
+    expected = [create(state(body.motions).tolist()) for body in bodies]
+    for body_motions in expected:
+        for motion in body_motions:
+            motion.update(0.1)
+    manager = BodyManager.__new__(BodyManager)
+    manager.bodies, manager.batch, manager.dt = bodies, PhysicsBatch(), 0.1
+    manager.updateBodies()
+    assert np.allclose(state(bodies[0].motions), state(expected[0]))
+    # The friction body was updated by its own update, which slows it down.
+    assert np.allclose(state(bodies[1].motions)[0, 0], state(expected[1])[0, 0])
+    assert np.allclose(state(bodies[1].motions)[0, 1], state(expected[1])[0, 1] * 0.5)
+
+
+def moment(rng, n):
+    """Return a random moment of n vectors of dimension 1."""
+    return Moment(*[Vector(rng.uniform(-1, 1)) for i in range(n)])
+
+
+def copy(body):
+    """Return the motions of a body copied into new motions."""
+    return [type(motion)(*[Vector(*vector.components) for vector in motion.vectors]) for motion in body.motions]
+
+
+def test_mixed_motion_shapes_match_the_individual_updates():
+    rng = random.Random(5)
+    entities = []
+    for i in range(12):
+        motion = Motion(*[Vector(rng.uniform(-1, 1), rng.uniform(-1, 1)) for j in range(2 + i % 3)])
+        entities.append(Entity(FormAnatomy.random(), [motion, moment(rng, 2 + i % 2)], friction=0.1))
+    # Some entities have a moment whose vectors have different dimensions,
+    # which can not be batched, and some have a single motion.
+    entities[0].motions[1].vectors[0] = Vector(0.5, 0.5)
+    entities[1].motions = entities[1].motions[:1]
+    expected = []
+    for entity in entities:
+        twin = Entity(entity.anatomy, copy(entity), friction=entity.friction)
+        expected.append(twin)
+    group = EntityGroup(*entities)
+    for i in range(10):
+        group.update(0.1)
+        for twin in expected:
+            twin.update(0.1)
+    for (entity, twin) in zip(entities, expected):
+        for (motion, other) in zip(entity.motions, twin.motions):
+            for (vector, reference) in zip(motion.vectors, other.vectors):
+                assert type(vector.components) is list
+                assert np.allclose(vector.components, reference.components, rtol=0, atol=1e-12)
+
+
+def test_a_moment_keeps_turning():
+    entity = Entity(FormAnatomy.random(), [Motion(Vector(0, 0), Vector(1, 0)), Moment(Vector(0), Vector(2))])
+    group = EntityGroup(entity)
+    for i in range(5):
+        group.update(0.1)
+    assert math.isclose(entity.motions[1].position.components[0], 1, rel_tol=1e-12)
+    assert math.isclose(entity.motions[0].position.components[0], 0.5, rel_tol=0.1)
+
+
+def test_particles_of_different_shapes_attract_each_other():
+    from pygame_geometry.gravity import BarnesHut
+    rng = random.Random(6)
+    particles = [Particle([Motion(*[Vector(rng.uniform(-1, 1), rng.uniform(-1, 1)) for j in range(3)]),
+                           moment(rng, 2 + i % 2)]) for i in range(6)]
+    group = ParticleGroup(particles, gravity=BarnesHut(theta=0))
+    accelerations = group.getAccelerations()
+    group.update(0.01)
+    for (particle, acceleration) in zip(particles, accelerations):
+        assert np.allclose(particle.motion.acceleration.components, acceleration)
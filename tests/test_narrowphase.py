@@ -0,0 +1,80 @@
+from pygame_geometry.narrowphase import ParallelNarrowPhase, CONVEX, POLYGON
+from pygame_geometry.collider import Collider
+from pygame_geometry.entitygroup import EntityGroup
+from pygame_geometry.anatomies import FormAnatomy
+from pygame_geometry.entity import Entity
+from pygame_geometry.motion import Motion
+from pygame_geometry.abstract import Vector
+
+from shapes import polygon
+
+import random
+
+
+def forms(n, width=6, seed=0):
+    """Return random convex and concave forms crowded in a square."""
+    rng = random.Random(seed)
+    return [FormAnatomy.createFromTuples(polygon(rng.randint(5, 10), rng.uniform(0, width), rng.uniform(0, width),
+                                                 convex=i % 3 == 0, rng=rng))
+            for i in range(n)]
+
+
+def jobs(anatomies):
+    """Return the polygons, every pair of them and the kinds of their tests."""
+    polygons = [anatomy.vertices for anatomy in anatomies]
+    pairs = [(i, j) for i in range(len(anatomies)) for j in range(i + 1, len(anatomies))]
+    kinds = [CONVEX if anatomies[i].convex() and anatomies[j].convex() else POLYGON for (i, j) in pairs]
+    return (polygons, pairs, kinds)
+
+
+def test_parallel_results_equal_the_serial_ones():
+    anatomies = forms(40)
+    polygons, pairs, kinds = jobs(anatomies)
+    serial = [anatomies[i].collide(anatomies[j]) for (i, j) in pairs]
+    assert any(serial) and not all(serial)
+    packed = ParallelNarrowPhase(1).collide(polygons, pairs, kinds)
+    narrowphase = ParallelNarrowPhase(2, min_pairs=0, min_chunk=16, adaptive=False)
+    try:
+        parallel = narrowphase.collide(polygons, pairs, kinds)
+        assert narrowphase.chunks > 1
+    finally:
+        narrowphase.close()
+    assert packed.tolist() == serial
+    assert parallel.tolist() == serial
+
+
+def test_colliders_find_the_same_collisions_in_parallel():
+    entities = [Entity(anatomy, [Motion(Vector(0, 0), Vector(0, 0), Vector(0, 0))]) for anatomy in forms(30)]
+    group = EntityGroup(*entities)
+    narrowphase = ParallelNarrowPhase(2, min_pairs=0, adaptive=False)
+    try:
+        parallel = Collider(narrowphase=narrowphase).getCollisions(Collider().getSoloPairs(group))
+    finally:
+        narrowphase.close()
+    serial = Collider().getCollisions(Collider().getSoloPairs(group))
+    assert serial
+    assert [(id(e1), id(e2)) for (e1, e2) in parallel] == [(id(e1), id(e2)) for (e1, e2) in serial]
+
+
+def test_few_pairs_are_tested_in_the_current_process():
+    anatomies = forms(40)
+    polygons, pairs, kinds = jobs(anatomies)
+    narrowphase = ParallelNarrowPhase(2, min_pairs=len(pairs))
+    assert narrowphase.getThreshold() == len(pairs)
+    narrowphase.collide(polygons, pairs[:100], kinds[:100])
+    assert narrowphase.executor is None and narrowphase.serial_rate > 0
+    # The threshold is measured once the processes were used.
+    narrowphase.min_pairs = 0
+    try:
+        narrowphase.collide(polygons, pairs, kinds)
+        assert narrowphase.executor is not None and narrowphase.overhead >= 0
+        threshold = narrowphase.getThreshold()
+        assert threshold == narrowphase.overhead * narrowphase.serial_rate * 2
+        # Below the threshold the pairs stay in the current process.
+        narrowphase.overhead = 1
+        chunks = narrowphase.chunks
+        mask = narrowphase.collide(polygons, pairs[:50], kinds[:50])
+        assert narrowphase.chunks == chunks
+        assert mask.tolist() == [anatomies[i].collide(anatomies[j]) for (i, j) in pairs[:50]]
+    finally:
+        narrowphase.close()
@@ -0,0 +1,53 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from pygame_geometry.plane import Plane
+from pygame_geometry.window import Window
+
+import pygame
+import numpy as np
+
+
+def window(size=(200, 150)):
+    """Return a window without display that draws on a surface."""
+    window = Window(build=False)
+    window.screen = pygame.Surface(size)
+    return window
+
+
+def layer(plane, w):
+    """Return the pixels of the grid layer of the plane."""
+    plane.updateGridLayer(w)
+    return pygame.surfarray.array2d(plane.grid_layer)
+
+
+def test_scrolled_grid_layer_matches_a_fresh_draw():
+    w = window()
+    theme = {"grid color": (60, 60, 60)}
+    plane = Plane(dict(theme), view=[[0, 0], [40, 40]])
+    layer(plane, w)
+    # Moves of whole pixels are scrolled, the others are drawn again.
+    for (dx, dy) in [(0.5, 0), (0, -0.25), (0.0125, 0.3), (-2.5, 1.75), (0.01, 0), (0.025, -0.05), (-0.1, 0.025), (30, 0)]:
+        plane.position = [plane.position[0] + dx, plane.position[1] + dy]
+        scrolled = layer(plane, w)
+        fresh = Plane(dict(theme), view=[plane.position[:], plane.units[:]])
+        assert (scrolled == layer(fresh, w)).all()
+
+
+def test_arrays_of_positions_convert_like_the_positions():
+    w = window()
+    plane = Plane(view=[[1.5, -2], [37, 23]])
+    positions = np.random.uniform(-20, 20, (100, 2))
+    for move in [(0, 0), (3.25, -1), (-0.1, 7)]:
+        plane.position = [plane.position[0] + move[0], plane.position[1] + move[1]]
+        screen = plane.getArrayToScreen(positions, w)
+        assert screen.shape == (100, 2)
+        assert screen.tolist() == [plane.getToScreen(p, w) for p in positions.tolist()]
+        assert plane.getAllToScreen(positions.tolist(), w) == screen.tolist()
+        # Going to the plane and back gives the pixels.
+        pixels = np.random.randint(0, 150, (100, 2))
+        assert (plane.getArrayToScreen(plane.getArrayFromScreen(pixels + 0.5, w), w) == pixels).all()
+        assert np.allclose(plane.getArrayFromScreen(screen, w), [plane.getFromScreen(p, w) for p in screen.tolist()])
+    plane.units = [80, 80]
+    assert plane.getArrayToScreen([[0, 0], [1, 1]], w).tolist() == [plane.getToScreen([0, 0], w), plane.getToScreen([1, 1], w)]
@@ -0,0 +1,83 @@
+from pygame_geometry.quadtree import DynamicQuadTree
+
+import pytest
+import random
+
+
+def check(tree):
+    """Check that each point is in the leaf that holds it and that the counts
+    of the nodes are the numbers of points under them."""
+    keys = []
+    for node in tree.nodes():
+        if node.children:
+            assert not node.keys
+            assert node.count == sum(child.count for child in node.children)
+        else:
+            assert node.count == len(node.keys)
+            for key in node.keys:
+                assert tree.leaves[key] is node
+                assert node.contains(*tree.positions[key])
+            keys.extend(node.keys)
+    assert sorted(keys) == sorted(tree.positions)
+
+
+def queries(tree, positions, rng):
+    """Compare the queries of the tree to the brute force over the positions."""
+    for k in range(10):
+        x1, x2 = sorted(rng.uniform(-3, 3) for i in range(2))
+        y1, y2 = sorted(rng.uniform(-3, 3) for i in range(2))
+        assert sorted(tree.queryRange(x1, y1, x2, y2)) == \
+            sorted(key for (key, (x, y)) in positions.items() if x1 <= x <= x2 and y1 <= y <= y2)
+        x, y, r = rng.uniform(-3, 3), rng.uniform(-3, 3), rng.uniform(0, 2)
+        assert sorted(tree.queryCircle(x, y, r)) == \
+            sorted(key for (key, (px, py)) in positions.items() if (px - x) ** 2 + (py - y) ** 2 <= r * r)
+        distances = sorted(((px - x) ** 2 + (py - y) ** 2, key) for (key, (px, py)) in positions.items())
+        assert tree.nearest(x, y, 5) == [key for (d, key) in distances[:5]]
+
+
+def test_queries_while_points_move():
+    rng = random.Random(0)
+    tree = DynamicQuadTree(capacity=4)
+    positions = {}
+    for key in range(300):
+        positions[key] = (rng.uniform(-1, 1), rng.uniform(-1, 1))
+        tree.insert(key, positions[key])
+    check(tree)
+    queries(tree, positions, rng)
+    for frame in range(20):
+        for key in positions:
+            x, y = positions[key]
+            positions[key] = (x + rng.uniform(-0.2, 0.2), y + rng.uniform(-0.2, 0.2))
+        tree.update(positions)
+        for key in rng.sample(sorted(positions), 10):
+            assert tree.remove(key) == positions.pop(key)
+        for key in range(1000 + 10 * frame, 1010 + 10 * frame):
+            positions[key] = (rng.uniform(-2, 2), rng.uniform(-2, 2))
+            tree.insert(key, positions[key])
+        check(tree)
+        queries(tree, positions, rng)
+    assert len(tree) == len(positions)
+
+
+def test_merges_reuse_the_nodes():
+    rng = random.Random(1)
+    tree = DynamicQuadTree(capacity=2)
+    for key in range(200):
+        tree.insert(key, (rng.uniform(-1, 1), rng.uniform(-1, 1)))
+    nodes = len(list(tree.nodes()))
+    for key in range(200):
+        tree.remove(key)
+    assert len(list(tree.nodes())) == 1 and len(tree.pool) >= nodes - 1
+    check(tree)
+    for key in range(200):
+        tree.insert(key, (rng.uniform(-1, 1), rng.uniform(-1, 1)))
+    check(tree)
+    tree.clear()
+    assert len(tree) == 0 and tree.queryRange(-1, -1, 1, 1) == []
+
+
+def test_keys_are_unique():
+    tree = DynamicQuadTree()
+    tree.insert("a", (0, 0))
+    with pytest.raises(KeyError):
+        tree.insert("a", (1, 1))
@@ -0,0 +1,91 @@
+from pygame_geometry.collider import Collider
+from pygame_geometry.entitygroup import EntityGroup
+from pygame_geometry.entity import Entity
+from pygame_geometry.anatomies import CircleAnatomy
+from pygame_geometry.motion import Motion
+from pygame_geometry.abstract import Vector
+
+import math
+
+
+def circle(x, y, vx=0, vy=0, g=0, radius=0.5):
+    """Return a circle entity."""
+    entity = Entity(CircleAnatomy(0, 0, radius=radius), [Motion(Vector(x, y), Vector(vx, vy), Vector(0, g))],
+                    friction=0)
+    entity.mass = 1
+    return entity
+
+
+def ground(radius=100):
+    """Return a static circle whose top is the origin."""
+    entity = circle(0, -radius, radius=radius)
+    entity.mass = math.inf
+    return entity
+
+
+def run(group, collider, frames, dt=1 / 60):
+    """Update the group and resolve its collisions during some frames."""
+    for frame in range(frames):
+        group.update(dt)
+        collider.soloSolve(group, dt)
+
+
+def stack():
+    """Return a group of a stack of circles resting on a floor, and its collider."""
+    floor = ground()
+    circles = [circle(0, 0.48 + 0.98 * i, g=-10) for i in range(3)]
+    group = EntityGroup(floor, *circles, sleeping=True, sleep_time=0.25)
+    return (group, Collider(), floor, circles)
+
+
+def test_resting_stack_falls_asleep():
+    group, collider, floor, circles = stack()
+    run(group, collider, 120)
+    assert group.sleep_counts == (0, 4)
+    positions = [tuple(e.position.components[:2]) for e in circles]
+    collider.reset()
+    run(group, collider, 60)
+    # The sleeping entities are neither moved nor tested.
+    assert [tuple(e.position.components[:2]) for e in circles] == positions
+    assert collider.reset() == (0, 0)
+    assert all(e.island is floor.island for e in circles)
+
+
+def test_touched_body_wakes_its_island():
+    group, collider, floor, circles = stack()
+    run(group, collider, 120)
+    assert group.sleep_counts == (0, 4)
+    ball = circle(0, 3.4, vy=-2, g=-10)
+    group.append(ball)
+    run(group, collider, 30)
+    assert all(not e.asleep for e in circles)
+    assert not floor.asleep
+    # An isolated body does not wake the others.
+    group, collider, floor, circles = stack()
+    run(group, collider, 120)
+    group.append(circle(20, 0, vy=1))
+    run(group, collider, 10)
+    assert all(e.asleep for e in circles)
+
+
+def test_islands_group_the_entities_in_contact():
+    entities = [circle(i, 0) for i in range(6)]
+    entities[0].touch(entities[1])
+    entities[1].touch(entities[2])
+    entities[3].touch(entities[4])
+    islands = EntityGroup.getIslands(entities)
+    assert sorted(sorted(map(entities.index, island)) for island in islands) == [[0, 1, 2], [3, 4], [5]]
+    # The entities touched but not given belong to the islands too.
+    outside = circle(10, 0)
+    entities[5].touch(outside)
+    islands = EntityGroup.getIslands(entities)
+    assert any(outside in island and entities[5] in island for island in islands)
+
+
+def test_contacts_are_cleared_at_each_update():
+    for sleeping in [False, True]:
+        e1, e2 = circle(0, 0), circle(0.9, 0)
+        group = EntityGroup(e1, e2, sleeping=sleeping)
+        collider = Collider()
+        run(group, collider, 100)
+        assert len(e1.contacts) <= 1 and len(e2.contacts) <= 1
@@ -0,0 +1,71 @@
+from pygame_geometry.spatialhash import SpatialHash
+
+import random
+
+
+def overlap(b1, b2):
+    """Determine if the closed boxes overlap."""
+    return b1[0] <= b2[2] and b2[0] <= b1[2] and b1[1] <= b2[3] and b2[1] <= b1[3]
+
+
+def boxes(rng, n, size):
+    """Return n random boxes smaller than size."""
+    result = []
+    for i in range(n):
+        x, y = rng.uniform(-20, 20), rng.uniform(-20, 20)
+        result.append((x, y, x + rng.uniform(0, size), y + rng.uniform(0, size)))
+    return result
+
+
+def test_pairs_contain_all_overlaps_once():
+    rng = random.Random(0)
+    for size in [0.5, 1, 3]:
+        items = boxes(rng, 300, size)
+        grid = SpatialHash(size)
+        for box in items:
+            grid.insert(box)
+        pairs = list(grid.pairs())
+        assert len(pairs) == len(set(pairs))
+        assert all(a < b for (a, b) in pairs)
+        brute = {(a, b) for a in range(len(items)) for b in range(a + 1, len(items)) if overlap(items[a], items[b])}
+        assert brute <= set(pairs)
+
+
+def test_circles_and_crossed_pairs():
+    rng = random.Random(1)
+    circles = [(rng.uniform(0, 10), rng.uniform(0, 10), rng.uniform(0.1, 0.5), rng.randint(0, 1)) for i in range(200)]
+    grid = SpatialHash.createFromRadiuses([r for (x, y, r, g) in circles])
+    assert grid.size == 2 * max(r for (x, y, r, g) in circles)
+    for (x, y, r, g) in circles:
+        grid.insertCircle(x, y, r, g)
+    assert len(grid) == len(circles)
+    touch = lambda a, b: (circles[a][0] - circles[b][0]) ** 2 + (circles[a][1] - circles[b][1]) ** 2 \
+        < (circles[a][2] + circles[b][2]) ** 2
+    n = len(circles)
+    found = {(a, b) for (a, b) in grid.pairs(crossed=True) if touch(a, b)}
+    assert all(circles[a][3] != circles[b][3] for (a, b) in found)
+    assert found == {(a, b) for a in range(n) for b in range(a + 1, n) if circles[a][3] != circles[b][3] and touch(a, b)}
+    grid.clear()
+    assert len(grid) == 0 and list(grid.pairs()) == []
+
+
+def test_collider_grid_finds_the_same_collisions():
+    from pygame_geometry.collider import Collider
+    from pygame_geometry.anatomies import CircleAnatomy
+    from pygame_geometry.entity import Entity
+    from pygame_geometry.motion import Motion
+    from pygame_geometry.abstract import Vector
+    from pygame_geometry.group import Group
+
+    rng = random.Random(2)
+    group = Group(*[Entity(CircleAnatomy(0, 0, radius=rng.uniform(0.1, 0.4)),
+                           [Motion(Vector(rng.uniform(0, 8), rng.uniform(0, 8)), Vector(0, 0))])
+                    for i in range(150)])
+    result = {}
+    for broadphase in Collider.broadphases:
+        collider = Collider(broadphase=broadphase)
+        pairs = collider.getCollisions(collider.getSoloPairs(group))
+        result[broadphase] = {frozenset((id(e1), id(e2))) for (e1, e2) in pairs}
+        result[broadphase, "counts"] = collider.reset()
+    assert result[None] == result["grid"] and result[None]
+    assert result["grid", "counts"][0] < result[None, "counts"][0] == 150 * 149 // 2
@@ -0,0 +1,62 @@
+from pygame_geometry.abstract import Point, Vector, Segment, Style
+from pygame_geometry.materialpoint import MaterialPoint
+from pygame_geometry.motion import Motion
+from pygame_geometry import colors
+
+import copy
+import pickle
+
+
+def test_points_and_segments_keep_their_style():
+    point = Point(1, 2, mode=1, size=[0.2, 0.3], radius=0.5, fill=True, color=colors.RED)
+    assert (point.mode, point.size, point.radius, point.fill, point.color) == (1, [0.2, 0.3], 0.5, True, colors.RED)
+    point.color = colors.BLUE
+    assert point.color == colors.BLUE and point.radius == 0.5
+    segment = Segment(Point(0, 0), Point(1, 1), color=colors.GREEN, width=3)
+    assert (segment.color, segment.width) == (colors.GREEN, 3)
+    segment.width = 2
+    assert (segment.color, segment.width) == (colors.GREEN, 2)
+    vector = Vector(1, 0, arrow=[0.2, 0.4])
+    assert vector.arrow == [0.2, 0.4]
+    for other in [copy.copy(point), copy.deepcopy(point), pickle.loads(pickle.dumps(point))]:
+        assert other.style == point.style
+        assert other.size == [0.2, 0.3]
+
+
+def test_the_lists_of_the_styles_are_given_back_as_lists():
+    point = Point(0, 0, size=[0.1, 0.1])
+    assert type(point.size) is list
+    point.size[0] = 5
+    assert Point(0, 0).size == [0.1, 0.1]
+    # A list and a tuple of the same values give different styles.
+    assert Point(0, 0, size=(0.1, 0.1)).size == (0.1, 0.1)
+    assert type(Point(0, 0, size=[0.1, 0.1]).size) is list
+
+
+def test_equal_styles_are_shared():
+    p1, p2 = Point(0, 0, color=colors.RED), Point(5, 5, color=colors.RED)
+    assert p1.style is p2.style
+    p2.color = colors.WHITE
+    assert p2.style is Point(0, 0).style
+    assert Segment(Point(0, 0), Point(1, 1)).style is Segment(Point(2, 2), Point(3, 3)).style
+
+
+def test_the_shared_styles_are_bounded():
+    limit = Style.limit
+    try:
+        Style.limit = 100
+        for i in range(1000):
+            Point(0, 0, radius=i)
+        assert len(Style.styles) <= 100
+        # The styles used recently are still shared.
+        assert Point(0, 0, radius=999).style is Point(1, 1, radius=999).style
+    finally:
+        Style.limit = limit
+
+
+def test_material_points_are_created():
+    MaterialPoint(0, 0)
+    point = MaterialPoint(Motion(Vector(1, 2), Vector(0, 0)), color=colors.RED)
+    assert point.color == colors.RED
+    assert point.radius == Point(0, 0).radius
+    assert MaterialPoint(Motion.null(), color=colors.RED).style is point.style
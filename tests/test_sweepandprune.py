@@ -0,0 +1,80 @@
+from pygame_geometry.sweepandprune import SweepAndPrune
+from pygame_geometry.entitygroup import EntityGroup
+
+import random
+
+
+def overlap(b1, b2):
+    """Determine if the closed boxes overlap."""
+    return b1[0] <= b2[2] and b2[0] <= b1[2] and b1[1] <= b2[3] and b2[1] <= b1[3]
+
+
+def brute(boxes, groups=None):
+    """Return the set of the pairs of ids of the overlapping boxes."""
+    ids = list(boxes)
+    return {frozenset((a, b)) for (i, a) in enumerate(ids) for b in ids[i + 1:]
+            if overlap(boxes[a], boxes[b]) and (groups is None or groups[a] != groups[b])}
+
+
+def test_pairs_match_all_pairs_over_frames():
+    rng = random.Random(0)
+    positions = {i: (rng.uniform(0, 30), rng.uniform(0, 30)) for i in range(300)}
+    groups = {i: rng.randint(0, 2) for i in range(1000)}
+    sweep = SweepAndPrune()
+    for frame in range(15):
+        positions = {i: (x + rng.uniform(-0.3, 0.3), y + rng.uniform(-0.3, 0.3)) for (i, (x, y)) in positions.items()}
+        # Some objects leave and others come.
+        for i in rng.sample(sorted(positions), 5):
+            del positions[i]
+        for i in range(300 + 5 * frame, 305 + 5 * frame):
+            positions[i] = (rng.uniform(0, 30), rng.uniform(0, 30))
+        boxes = {i: (x - 0.5, y - 0.5, x + 0.5, y + 0.5) for (i, (x, y)) in positions.items()}
+        pairs = sweep.pairs(boxes)
+        assert len(pairs) == len(set(map(frozenset, pairs)))
+        assert set(map(frozenset, pairs)) == brute(boxes)
+        assert len(sweep) == len(boxes)
+        assert set(map(frozenset, sweep.pairs(boxes, groups))) == brute(boxes, groups)
+
+
+def test_touching_and_nested_boxes():
+    boxes = {"a": (0, 0, 1, 1), "b": (1, 1, 2, 2), "c": (0.2, 0.2, 0.3, 0.3), "d": (2.1, 0, 3, 1)}
+    assert set(map(frozenset, SweepAndPrune().pairs(boxes))) == brute(boxes) == \
+        {frozenset("ab"), frozenset("ac")}
+
+
+class Dummy:
+    """Object with a position and a born, like the entities."""
+
+    def __init__(self, x, y, born):
+        self.x, self.y, self.born = x, y, born
+
+
+def test_entity_group_candidates():
+    rng = random.Random(1)
+    group1 = [Dummy(rng.uniform(0, 10), rng.uniform(0, 10), rng.uniform(0.1, 0.5)) for i in range(100)]
+    group2 = [Dummy(rng.uniform(0, 10), rng.uniform(0, 10), rng.uniform(0.1, 0.5)) for i in range(100)]
+    box = lambda e: (e.x - e.born, e.y - e.born, e.x + e.born, e.y + e.born)
+    candidates = EntityGroup.getCandidates(group1, group2)
+    assert all(e1 in group1 and e2 in group2 for (e1, e2) in candidates)
+    assert {(id(e1), id(e2)) for (e1, e2) in candidates} == \
+        {(id(e1), id(e2)) for e1 in group1 for e2 in group2 if overlap(box(e1), box(e2))}
+
+
+def test_entity_group_keeps_its_sweep_and_prune():
+    rng = random.Random(2)
+    group1 = EntityGroup(*[Dummy(rng.uniform(0, 10), rng.uniform(0, 10), 0.3) for i in range(50)])
+    group2 = EntityGroup(*[Dummy(rng.uniform(0, 10), rng.uniform(0, 10), 0.3) for i in range(50)])
+    box = lambda e: (e.x - e.born, e.y - e.born, e.x + e.born, e.y + e.born)
+    sweep = group1.sweep
+    for frame in range(10):
+        for e in group1 + group2:
+            e.x += rng.uniform(-0.2, 0.2)
+            e.y += rng.uniform(-0.2, 0.2)
+        candidates = EntityGroup.getCandidates(group1, group2)
+        assert {(id(e1), id(e2)) for (e1, e2) in candidates} == \
+            {(id(e1), id(e2)) for e1 in group1 for e2 in group2 if overlap(box(e1), box(e2))}
+        # The order of the last frame is kept by the group to be sorted again.
+        entities = {(side, id(e)): e for (side, group) in enumerate((group1, group2)) for e in group}
+        assert group1.sweep is sweep
+        assert sorted(sweep.order) == sorted(entities)
+        assert [box(entities[key])[0] for key in sweep.order] == sorted(box(e)[0] for e in entities.values())
@@ -0,0 +1,76 @@
+from pygame_geometry.sweepline import SweepLine
+from pygame_geometry.abstract import Form, Point, Segment
+
+import random
+import shapes
+
+
+def brute(tuples):
+    """Return the set of the pairs of indices of the segments which touch."""
+    segments = [(t[:2], t[2:]) for t in tuples]
+    return {(i, j) for i in range(len(segments)) for j in range(i + 1, len(segments))
+            if shapes.touch(segments[i], segments[j])}
+
+
+def test_pairs_match_all_pairs_on_random_segments():
+    rng = random.Random(0)
+    for n in [2, 10, 50, 200]:
+        tuples = []
+        for i in range(n):
+            x, y = rng.uniform(0, 10), rng.uniform(0, 10)
+            tuples.append((x, y, x + rng.uniform(-3, 3), y + rng.uniform(-3, 3)))
+        assert {(i, j) for (i, j, p) in SweepLine(tuples).pairs()} == brute(tuples)
+
+
+def test_pairs_match_all_pairs_on_degenerate_segments():
+    rng = random.Random(1)
+    for k in range(30):
+        # Segments on a small integer grid: shared end points, vertical,
+        # collinear and zero length segments, several segments through a point.
+        tuples = [tuple(rng.randint(0, 4) for c in range(4)) for i in range(15)]
+        assert {(i, j) for (i, j, p) in SweepLine(tuples).pairs()} == brute(tuples)
+
+
+def test_intersection_points_are_the_crossings_of_the_lines():
+    rng = random.Random(2)
+    tuples = [(rng.uniform(0, 1), rng.uniform(0, 1), rng.uniform(0, 1), rng.uniform(0, 1)) for i in range(100)]
+    for (i, j, (x, y)) in SweepLine(tuples).pairs():
+        ex, ey = shapes.intersection((tuples[i][:2], tuples[i][2:]), (tuples[j][:2], tuples[j][2:]))
+        assert abs(ex - x) < 1e-6 and abs(ey - y) < 1e-6
+
+
+def test_segment_formats_are_equivalent():
+    segments = [Segment(Point(0, 0), Point(2, 2)), ((0, 2), (2, 0)), (1, -1, 1, 3)]
+    assert sorted((i, j) for (i, j, p) in SweepLine(segments).pairs()) == [(0, 1), (0, 2), (1, 2)]
+    assert SweepLine(segments).any()
+    assert not SweepLine([(0, 0, 1, 0), (0, 1, 1, 1)]).any()
+
+
+def test_cross_form_matches_all_pairs_of_sides():
+    rng = random.Random(3)
+    for k in range(50):
+        p1 = shapes.polygon(rng.randint(3, 10), rng.uniform(-1, 1), rng.uniform(-1, 1), rng=rng)
+        p2 = shapes.polygon(rng.randint(3, 10), rng.uniform(-1, 1), rng.uniform(-1, 1), rng=rng)
+        f1, f2 = Form.createFromTuples(p1), Form.createFromTuples(p2)
+        expected = sorted(shapes.intersection(s1, s2) for s1 in shapes.sides(p1) for s2 in shapes.sides(p2)
+                          if shapes.cross(s1, s2))
+        points = sorted((p.x, p.y) for p in f1.crossForm(f2))
+        assert len(points) == len(expected)
+        for ((x, y), (ex, ey)) in zip(points, expected):
+            assert abs(x - ex) < 1e-9 and abs(y - ey) < 1e-9
+
+
+def test_cross_self_and_any_crossing():
+    rng = random.Random(4)
+    for k in range(30):
+        positions = [(rng.uniform(-1, 1), rng.uniform(-1, 1)) for i in range(rng.randint(3, 9))]
+        form = Form.createFromTuples(positions)
+        sides = shapes.sides(positions)
+        expected = sum(shapes.cross(sides[i], sides[j]) for i in range(len(sides)) for j in range(i + 1, len(sides)))
+        assert len(form.crossSelf()) == expected
+    square = Form.createFromTuples([(0, 0), (1, 0), (1, 1), (0, 1)])
+    assert square.crossSelf() == []
+    moved = Form.createFromTuples([(0.5, 0.5), (1.5, 0.5), (1.5, 1.5), (0.5, 1.5)])
+    far = Form.createFromTuples([(5, 5), (6, 5), (6, 6)])
+    assert Form.anyCrossing([square, moved, far])
+    assert not Form.anyCrossing([square, far])
@@ -0,0 +1,111 @@
+from pygame_geometry.transform import AffineTransform
+from pygame_geometry.abstract import Form, Point
+from pygame_geometry.rectangle import Rectangle, Square
+
+import random
+import math
+import shapes
+
+
+def close(p, q, e=1e-9):
+    """Determine if the positions are equal up to e."""
+    return all(abs(a - b) < e for (a, b) in zip(p, q))
+
+
+def rotate(position, angle, center):
+    """Return the position rotated around the center."""
+    x, y = position[0] - center[0], position[1] - center[1]
+    c, s = math.cos(angle), math.sin(angle)
+    return (center[0] + c * x - s * y, center[1] + s * x + c * y)
+
+
+def scale(position, factor, center):
+    """Return the position scaled from the center."""
+    return tuple(c + factor * (p - c) for (p, c) in zip(position, center))
+
+
+def test_transforms_match_their_formulas():
+    rng = random.Random(0)
+    for k in range(50):
+        p = (rng.uniform(-5, 5), rng.uniform(-5, 5))
+        c = (rng.uniform(-5, 5), rng.uniform(-5, 5))
+        a, f = rng.uniform(-4, 4), rng.uniform(0.1, 3)
+        assert close(AffineTransform.createFromTranslation(c)(p), (p[0] + c[0], p[1] + c[1]))
+        assert close(AffineTransform.createFromRotation(a, c)(p), rotate(p, a, c))
+        assert close(AffineTransform.createFromScale(f, c)(p), scale(p, f, c))
+
+
+def test_composition_and_inverse():
+    rng = random.Random(1)
+    positions = [(rng.uniform(-5, 5), rng.uniform(-5, 5)) for i in range(20)]
+    t1 = AffineTransform.createFromRotation(0.7, (1, 2))
+    t2 = AffineTransform.createFromScale(1.5, (-1, 0))
+    t3 = AffineTransform.createFromTranslation((3, -2))
+    composed = t3 @ t2 @ t1
+    assert composed == t1.then(t2).then(t3)
+    for (p, q) in zip(positions, composed(positions).tolist()):
+        assert close(q, t3(t2(t1(p))))
+        assert close(composed.inverse(q), p)
+    assert close((composed @ composed.inverse).matrix.ravel(), [1, 0, 0, 0, 1, 0])
+    assert AffineTransform.identity().isIdentity()
+
+
+def test_form_transforms_match_the_formulas():
+    rng = random.Random(2)
+    positions = shapes.polygon(9, rng=rng)
+    form = Form.createFromTuples(positions)
+    for k in range(60):
+        center = (sum(x for (x, y) in positions) / 9, sum(y for (x, y) in positions) / 9)
+        operation = k % 4
+        if operation == 0:
+            step = (rng.uniform(-1, 1), rng.uniform(-1, 1))
+            form.move(step)
+            positions = [(x + step[0], y + step[1]) for (x, y) in positions]
+        elif operation == 1:
+            angle = rng.uniform(-3, 3)
+            form.rotate(angle)
+            positions = [rotate(p, angle, center) for p in positions]
+        elif operation == 2:
+            form.enlarge(1.1)
+            positions = [scale(p, 1.1, center) for p in positions]
+        else:
+            form.center = Point(1, 2)
+            positions = [(x - center[0] + 1, y - center[1] + 2) for (x, y) in positions]
+        assert close(form.center, (sum(x for (x, y) in positions) / 9, sum(y for (x, y) in positions) / 9))
+        if k % 5 == 0:
+            assert all(close(p, q) for (p, q) in zip(form.vertices.tolist(), positions))
+    assert all(close(p, q) for (p, q) in zip(form.vertices.tolist(), positions))
+
+
+def test_held_points_and_segments_follow_the_form():
+    form = Form.createFromTuples([(0, 0), (1, 0), (1, 1), (0, 1)])
+    point = form.points[0]
+    segment = form.segments[0]
+    form.move((5, 5))
+    assert close(point, (5, 5))
+    assert close(segment.p1, (5, 5)) and close(segment.p2, (6, 5))
+    form.rotate(math.pi / 2, Point(5, 5))
+    assert close(point, (5, 5))
+    assert close(segment.p2, (5, 6))
+    form.enlarge(2)
+    assert close(point, (5.5, 4.5))
+    assert form.points[0] is point
+
+
+def test_rectangles_and_squares():
+    # Their points are computed from their corners, so the transformations
+    # give the bounding box of the transformed corners.
+    for rectangle in [Rectangle(0, 0, 4, 2), Square(0, 0, 2)]:
+        w, h = rectangle.width, rectangle.height
+        rectangle.rotate(1)
+        half = (w * math.cos(1) + h * math.sin(1)) / 2, (w * math.sin(1) + h * math.cos(1)) / 2
+        assert close(rectangle.corners, [-half[0], -half[1], half[0], half[1]])
+        rectangle.corners = [-w / 2, -h / 2, w / 2, h / 2]
+        rectangle.move((1, 1))
+        assert close(rectangle.corners, [1 - w / 2, 1 - h / 2, 1 + w / 2, 1 + h / 2])
+        rectangle.enlarge(2)
+        assert close(rectangle.corners, [1 - w, 1 - h, 1 + w, 1 + h])
+        rectangle.center = Point(5, 5)
+        assert close(rectangle.center, (5, 5))
+        assert close(rectangle.corners, [5 - w, 5 - h, 5 + w, 5 + h])
+        assert close(rectangle.position, (5, 5))
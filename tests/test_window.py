@@ -0,0 +1,78 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from pygame_geometry.window import Window
+
+import pygame
+import pytest
+
+
+def test_merge_rects_unites_the_colliding_rectangles():
+    assert Window.mergeRects([]) == []
+    a, b, c = pygame.Rect(0, 0, 10, 10), pygame.Rect(5, 5, 10, 10), pygame.Rect(50, 50, 5, 5)
+    assert sorted(map(tuple, Window.mergeRects([c, b, a]))) == [(0, 0, 15, 15), (50, 50, 5, 5)]
+    # Rectangles which only share a side are not merged.
+    assert len(Window.mergeRects([pygame.Rect(0, 0, 10, 10), pygame.Rect(10, 0, 10, 10)])) == 2
+    # A union can collide with a rectangle kept before, which is merged too.
+    rects = [pygame.Rect(0, 0, 4, 4), pygame.Rect(0, 20, 4, 4), pygame.Rect(2, 2, 2, 20)]
+    assert [tuple(rect) for rect in Window.mergeRects(rects)] == [(0, 0, 4, 24)]
+    # The merged rectangles do not collide and cover all the rectangles.
+    rects = [pygame.Rect(x, y, 7, 5) for (x, y) in [(0, 0), (30, 3), (6, 4), (12, 8), (60, 60), (29, 0)]]
+    merged = Window.mergeRects(rects)
+    assert all(m.collidelist(merged[:i] + merged[i + 1:]) < 0 for (i, m) in enumerate(merged))
+    assert all(rect.collidelist(merged) >= 0 and merged[rect.collidelist(merged)].contains(rect) for rect in rects)
+
+
+@pytest.fixture
+def display(monkeypatch):
+    """Record the calls of the window to the display."""
+    calls = []
+    monkeypatch.setattr(pygame.display, "flip", lambda: calls.append("flip"))
+    monkeypatch.setattr(pygame.display, "update", lambda rects=None: calls.append([tuple(r) for r in rects]))
+    return calls
+
+
+def test_flip_updates_the_rectangles_drawn_in_the_last_two_frames(display):
+    window = Window(size=(200, 100), dirty=True, dirty_threshold=0.25)
+    # The first frame is drawn entirely.
+    assert display == ["flip"] and window.full is False
+    del display[:]
+    window.clear()
+    window.mark(pygame.Rect(10, 10, 20, 20))
+    window.mark(pygame.Rect(20, 20, 20, 20))
+    window.flip()
+    assert display[-1] == [(10, 10, 30, 30)]
+    # The rectangles of the last frame are updated too, clipped to the screen.
+    window.clear()
+    window.mark(pygame.Rect(190, 90, 20, 20))
+    window.flip()
+    assert sorted(display[-1]) == [(10, 10, 30, 30), (190, 90, 10, 10)]
+    window.clear()
+    window.flip()
+    assert display[-1] == [(190, 90, 10, 10)]
+    # Above the threshold of the area the whole screen is flipped.
+    window.clear()
+    window.mark(pygame.Rect(0, 0, 100, 60))
+    window.flip()
+    assert display[-1] == "flip"
+    window.invalidate()
+    window.flip()
+    assert display[-1] == "flip"
+    # Without the dirty mode every frame is flipped.
+    window = Window(size=(200, 100))
+    window.mark(pygame.Rect(0, 0, 5, 5))
+    window.flip()
+    assert display[-1] == "flip" and window.rects == []
+
+
+def test_clear_restores_the_background_in_the_last_rectangles(display):
+    window = Window(size=(200, 100), dirty=True, background_color=(0, 0, 50))
+    rect = window.mark(window.draw.rect(window.screen, (255, 0, 0), pygame.Rect(10, 10, 5, 5)))
+    window.screen.fill((0, 255, 0), pygame.Rect(100, 50, 5, 5))
+    window.flip()
+    window.clear()
+    assert window.screen.get_at(rect.center)[:3] == (0, 0, 50)
+    # What was not marked is not cleared in the dirty mode.
+    assert window.screen.get_at((102, 52))[:3] == (0, 255, 0)